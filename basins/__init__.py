@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Hằng số thủy văn theo lưu vực - mỗi hằng số nằm trong submodule riêng
+và chỉ được import khi có người truy cập (PEP 562)
+"""
+import importlib
+from typing import Any
+
+_SUBMODULES = {
+    "HONG_RIVER_BASIN": "hong",
+    "MEKONG_RIVER_BASIN": "mekong",
+    "CENTRAL_VIETNAM_RIVERS": "central",
+    "DATA_SOURCES": "sources",
+    "HYDROLOGICAL_FORMULAS": "formulas",
+}
+
+__all__ = list(_SUBMODULES)
+
+
+def __getattr__(name: str) -> Any:
+    submodule = _SUBMODULES.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{submodule}"), name)
+    globals()[name] = value
+    return value
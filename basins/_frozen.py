@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Đóng băng hằng số thành cấu trúc chỉ đọc
+"""
+import sys
+from types import MappingProxyType
+from typing import Any, Dict
+
+# Pool tuple dùng chung giữa các module lưu vực (tuple bằng nhau chỉ giữ một bản).
+# Tuple không hỗ trợ weakref nên dùng dict thường; các tuple này vốn sống suốt
+# vòng đời process cùng hằng số nên pool không giữ thêm gì.
+_TUPLE_POOL: Dict[tuple, tuple] = {}
+
+
+def freeze(obj: Any, pool: Dict[tuple, tuple] = _TUPLE_POOL) -> Any:
+    """
+    Chuyển đệ quy dict -> MappingProxyType, list -> tuple và intern mọi chuỗi
+    (tên tỉnh, tên sông lặp lại nhiều lần chỉ giữ một bản). Tuple bằng nhau
+    dùng chung một đối tượng qua `pool`. Tuple chỉ chứa giá trị bất biến
+    không bị GC theo dõi.
+    """
+    if isinstance(obj, dict):
+        return MappingProxyType({sys.intern(k): freeze(v, pool) for k, v in obj.items()})
+    if isinstance(obj, (list, tuple)):
+        frozen = tuple(freeze(v, pool) for v in obj)
+        # Khóa kèm kiểu phần tử để (0, 12) không gộp nhầm với (0.0, 12.0)
+        key = (frozen, tuple(type(v) for v in frozen))
+        try:
+            return pool.setdefault(key, frozen)
+        except TypeError:  # chứa MappingProxyType - không hash được
+            return frozen
+    if isinstance(obj, str):
+        return sys.intern(obj)
+    return obj
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Các sông Miền Trung
+"""
+from basins._frozen import freeze
+
+CENTRAL_VIETNAM_RIVERS = {
+    "vu_gia_thu_bon": {
+        "name": "Hệ thống Vũ Gia - Thu Bồn",
+        "provinces": ["Quảng Nam", "Đà Nẵng"],
+        "total_length_km": 205,
+        "basin_area_km2": 10350,
+        "population_at_risk": 1500000,
+        "characteristics": [
+            "Lũ lên cực nhanh (6-12 giờ)",
+            "Mưa lớn tập trung (có thể 500-800mm/24h)",
+            "Lũ quét miền núi nghiêm trọng",
+        ],
+        "flood_peak_time_hours": [6, 12],
+        "historical_floods": [
+            {"year": 1999, "peak_discharge_m3_s": 15000, "casualties": 572},
+            {"year": 2009, "peak_discharge_m3_s": 13500, "casualties": 163},
+            {"year": 2017, "peak_discharge_m3_s": 12000, "casualties": 123},
+            {"year": 2020, "peak_discharge_m3_s": 14500, "casualties": 136},
+        ],
+        "gauging_stations": {
+            "nong_son": {
+                "river": "Thu Bồn",
+                "coordinates": (15.65, 107.91),
+                "alert_level_1_m": 3.0,
+                "alert_level_2_m": 4.0,
+                "alert_level_3_m": 5.0,
+                "historical_max_m": 7.68,
+                "historical_max_year": 2009,
+            },
+            "thanh_my": {
+                "river": "Vũ Gia",
+                "coordinates": (15.87, 108.13),
+                "alert_level_1_m": 2.5,
+                "alert_level_2_m": 3.5,
+                "alert_level_3_m": 4.5,
+                "historical_max_m": 6.12,
+                "historical_max_year": 2009,
+            },
+        },
+    },
+
+    "song_huong": {
+        "name": "Sông Hương",
+        "provinces": ["Thừa Thiên Huế"],
+        "length_km": 104,
+        "basin_area_km2": 2830,
+        "population_at_risk": 800000,
+        "characteristics": [
+            "Lũ kép: sông + đầm phá (lagoon)",
+            "Đô thị di sản Huế",
+            "Mưa lớn tập trung",
+        ],
+        "flood_peak_time_hours": [8, 15],
+        "dams": [
+            {"name": "Tả Trạch", "capacity_million_m3": 31.9, "power_mw": 6.6},
+            {"name": "Hương Điền", "capacity_million_m3": 33.4, "power_mw": 12},
+            {"name": "Bình Điền", "capacity_million_m3": 221, "power_mw": 27},
+        ],
+        "gauging_stations": {
+            "kim_long": {
+                "river": "Hương",
+                "coordinates": (16.46, 107.58),
+                "alert_level_1_m": 2.0,
+                "alert_level_2_m": 2.5,
+                "alert_level_3_m": 3.0,
+                "historical_max_m": 4.28,
+                "historical_max_year": 1999,
+            },
+        },
+    },
+
+    "song_ca": {
+        "name": "Sông Cả",
+        "provinces": ["Nghệ An", "Hà Tĩnh"],
+        "length_km": 531,
+        "basin_area_km2": 27200,
+        "population_at_risk": 2200000,
+        "characteristics": [
+            "Lưu vực lớn nhất Miền Trung",
+            "Lũ kéo dài",
+            "Thiệt hại nông nghiệp lớn",
+        ],
+        "flood_peak_time_hours": [18, 36],
+        "gauging_stations": {
+            "dua": {
+                "river": "Cả",
+                "coordinates": (18.67, 105.44),
+                "alert_level_1_m": 10.0,
+                "alert_level_2_m": 11.0,
+                "alert_level_3_m": 12.0,
+                "historical_max_m": 15.27,
+                "historical_max_year": 2010,
+            },
+        },
+    },
+
+    "song_tra_khuc": {
+        "name": "Sông Trà Khúc",
+        "provinces": ["Quảng Ngãi"],
+        "length_km": 135,
+        "basin_area_km2": 3240,
+        "population_at_risk": 600000,
+        "characteristics": [
+            "Lũ cực nhanh",
+            "Sạt lở nghiêm trọng",
+            "Thiệt hại cơ sở hạ tầng",
+        ],
+        "flood_peak_time_hours": [4, 8],
+        "gauging_stations": {
+            "tra_khuc": {
+                "river": "Trà Khúc",
+                "coordinates": (15.12, 108.78),
+                "alert_level_1_m": 2.5,
+                "alert_level_2_m": 3.5,
+                "alert_level_3_m": 4.5,
+                "historical_max_m": 6.8,
+                "historical_max_year": 2009,
+            },
+        },
+    },
+}
+
+CENTRAL_VIETNAM_RIVERS = freeze(CENTRAL_VIETNAM_RIVERS)
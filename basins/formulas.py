@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Công thức tính toán thủy văn chuẩn
+"""
+from basins._frozen import freeze
+
+HYDROLOGICAL_FORMULAS = {
+    "thiessen_polygon": {
+        "description": "Tính lượng mưa trung bình lưu vực theo Thiessen",
+        "formula": "P_basin = Σ(Pi × Ai) / Σ(Ai)",
+        "variables": {
+            "P_basin": "Lượng mưa trung bình lưu vực (mm)",
+            "Pi": "Lượng mưa tại trạm i (mm)",
+            "Ai": "Diện tích ảnh hưởng của trạm i (km²)",
+        },
+        "application": "Phù hợp cho lưu vực lớn, phân bố trạm không đều",
+    },
+
+    "scs_cn_method": {
+        "description": "Phương pháp SCS Curve Number",
+        "formula": "Q = ((P - Ia)²) / (P - Ia + S)",
+        "variables": {
+            "Q": "Lượng dòng chảy (mm)",
+            "P": "Lượng mưa (mm)",
+            "Ia": "Initial abstraction = 0.2S (mm)",
+            "S": "Potential maximum retention = (1000/CN) - 10 (mm)",
+            "CN": "Curve Number (40-100)",
+        },
+        "cn_values": {
+            "forest_good": 30,
+            "forest_fair": 55,
+            "pasture_good": 61,
+            "residential_low": 77,
+            "residential_medium": 85,
+            "residential_high": 92,
+            "paved_roads": 98,
+            "water_bodies": 100,
+        },
+        "application": "Ước tính dòng chảy từ mưa",
+    },
+
+    "manning_equation": {
+        "description": "Công thức Manning cho dòng chảy kênh hở",
+        "formula": "V = (1/n) × R^(2/3) × S^(1/2)",
+        "variables": {
+            "V": "Vận tốc dòng chảy (m/s)",
+            "n": "Hệ số nhám Manning",
+            "R": "Bán kính thủy lực (m)",
+            "S": "Độ dốc đáy sông",
+        },
+        "manning_n_values": {
+            "natural_clean": 0.030,
+            "natural_weeds": 0.035,
+            "natural_dense_weeds": 0.050,
+            "mountain_stream": 0.040,
+            "flood_plain": 0.060,
+            "concrete_channel": 0.013,
+        },
+        "application": "Tính vận tốc và lưu lượng dòng chảy",
+    },
+
+    "rational_method": {
+        "description": "Phương pháp Hữu tỷ (Rational Method)",
+        "formula": "Q = 0.278 × C × i × A",
+        "variables": {
+            "Q": "Lưu lượng đỉnh (m³/s)",
+            "C": "Hệ số dòng chảy (0-1)",
+            "i": "Cường độ mưa (mm/h)",
+            "A": "Diện tích lưu vực (km²)",
+        },
+        "runoff_coefficients": {
+            "forest": 0.15,
+            "pasture": 0.25,
+            "residential_low": 0.40,
+            "residential_medium": 0.60,
+            "residential_high": 0.75,
+            "industrial": 0.80,
+            "asphalt": 0.90,
+        },
+        "limitations": "Chỉ áp dụng cho lưu vực < 20 km²",
+    },
+
+    "muskingum_routing": {
+        "description": "Phương pháp Muskingum truyền lũ",
+        "formula": "O[t+1] = C0×I[t+1] + C1×I[t] + C2×O[t]",
+        "variables": {
+            "O": "Lưu lượng ra (m³/s)",
+            "I": "Lưu lượng vào (m³/s)",
+            "K": "Thời gian truyền (giờ)",
+            "X": "Hệ số trọng lượng (0-0.5)",
+            "dt": "Bước thời gian (giờ)",
+        },
+        "typical_X_values": {
+            "natural_stream": 0.25,
+            "reservoir": 0.0,
+        },
+        "application": "Dự báo lưu lượng hạ lưu từ thượng nguồn",
+    },
+
+    "gumbel_distribution": {
+        "description": "Phân phối Gumbel cho tần suất lũ",
+        "formula": "T = 1 / (1 - F(x))",
+        "variables": {
+            "T": "Chu kỳ lặp lại (năm)",
+            "F(x)": "Hàm phân phối tích lũy",
+            "x": "Lưu lượng/mực nước",
+        },
+        "application": "Tính tần suất xuất hiện lũ",
+    },
+}
+
+HYDROLOGICAL_FORMULAS = freeze(HYDROLOGICAL_FORMULAS)
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Lưu vực sông Hồng - Thái Bình
+"""
+from basins._frozen import freeze
+
+HONG_RIVER_BASIN = {
+    "overview": {
+        "total_area_km2": 169000,  # Toàn bộ lưu vực (bao gồm TQ)
+        "vn_area_km2": 87800,
+        "annual_rainfall_mm": 1800,
+        "population": 22000000,
+        "main_tributaries": ["Sông Hồng", "Sông Đà", "Sông Lô", "Sông Thao"],
+    },
+
+    # Các đập thủy điện Việt Nam (Sông Đà)
+    "dams": {
+        "son_la": {
+            "river": "Đà",
+            "capacity_million_m3": 9260,
+            "normal_level_m": 215.0,
+            "flood_level_m": 217.8,
+            "dead_level_m": 175.0,
+            "max_discharge_m3_s": 35420,
+            "turbine_capacity_m3_s": 2400,
+            "power_mw": 2400,
+            "commissioned_year": 2012,
+            "coordinates": (21.3261, 103.9008),
+            "catchment_area_km2": 61300,
+        },
+        "hoa_binh": {
+            "river": "Đà",
+            "capacity_million_m3": 9450,
+            "normal_level_m": 117.0,
+            "flood_level_m": 120.0,
+            "dead_level_m": 80.0,
+            "max_discharge_m3_s": 22700,
+            "turbine_capacity_m3_s": 2400,
+            "power_mw": 1920,
+            "commissioned_year": 1994,
+            "coordinates": (20.8167, 105.3167),
+            "catchment_area_km2": 75500,
+        },
+        "lai_chau": {
+            "river": "Đà",
+            "capacity_million_m3": 1224,
+            "normal_level_m": 295.0,
+            "flood_level_m": 297.5,
+            "dead_level_m": 265.0,
+            "max_discharge_m3_s": 15300,
+            "turbine_capacity_m3_s": 1200,
+            "power_mw": 1200,
+            "commissioned_year": 2016,
+            "coordinates": (22.3864, 103.4701),
+            "catchment_area_km2": 20000,
+        },
+        "ban_chat": {
+            "river": "Đà",
+            "capacity_million_m3": 2142,
+            "normal_level_m": 475.0,
+            "flood_level_m": 477.3,
+            "dead_level_m": 445.0,
+            "max_discharge_m3_s": 9520,
+            "turbine_capacity_m3_s": 800,
+            "power_mw": 220,
+            "commissioned_year": 2009,
+            "coordinates": (21.8, 103.7),
+            "catchment_area_km2": 8500,
+        },
+    },
+
+    # Trạm khí tượng thủy văn chính
+    "gauging_stations": {
+        "lao_cai": {
+            "river": "Hồng (Thao)",
+            "coordinates": (22.4856, 103.9707),
+            "alert_level_1_m": 79.0,
+            "alert_level_2_m": 80.0,
+            "alert_level_3_m": 81.0,
+            "historical_max_m": 82.14,
+            "historical_max_year": 1971,
+            "zero_datum_m": 57.0,  # Mốc không
+            "catchment_area_km2": 52600,
+        },
+        "yen_bai": {
+            "river": "Hồng (Thao)",
+            "coordinates": (21.7168, 104.8987),
+            "alert_level_1_m": 29.0,
+            "alert_level_2_m": 30.0,
+            "alert_level_3_m": 31.0,
+            "historical_max_m": 35.0,
+            "historical_max_year": 1971,
+            "zero_datum_m": 13.0,
+            "catchment_area_km2": 61000,
+        },
+        "viet_tri": {
+            "river": "Hồng (Hợp lưu Lô, Đà, Thao)",
+            "coordinates": (21.31, 105.4019),
+            "alert_level_1_m": 15.0,
+            "alert_level_2_m": 16.5,
+            "alert_level_3_m": 17.5,
+            "historical_max_m": 20.79,
+            "historical_max_year": 1971,
+            "zero_datum_m": 2.0,
+            "catchment_area_km2": 87800,
+            "importance": "KEY_STATION",  # Trạm khóa - hợp lưu 3 sông
+        },
+        "son_tay": {
+            "river": "Hồng",
+            "coordinates": (21.1333, 105.5),
+            "alert_level_1_m": 11.5,
+            "alert_level_2_m": 12.5,
+            "alert_level_3_m": 13.5,
+            "historical_max_m": 14.13,
+            "historical_max_year": 1971,
+            "design_flood_level_m": 14.22,  # Mực nước thiết kế (lũ 500 năm)
+            "zero_datum_m": -1.0,
+            "importance": "CRITICAL",  # Quyết định vận hành đê Hà Nội
+        },
+        "hanoi_long_bien": {
+            "river": "Hồng",
+            "coordinates": (21.0285, 105.8542),
+            "alert_level_1_m": 9.5,
+            "alert_level_2_m": 10.5,
+            "alert_level_3_m": 11.5,
+            "historical_max_m": 14.13,
+            "historical_max_year": 1971,
+            "design_flood_level_m": 13.40,
+            "zero_datum_m": -1.77,
+            "importance": "CAPITAL",
+        },
+    },
+
+    # Phân vùng ngập lụt chi tiết
+    "flood_zones": {
+        "zone_1_upper_basin": {
+            "name": "Thượng nguồn (Lào Cai - Yên Bái)",
+            "provinces": ["Lào Cai", "Yên Bái", "Hà Giang phần Tây"],
+            "area_km2": 12500,
+            "population": 1800000,
+            "elevation_range_m": [100, 3143],  # Đến đỉnh Fansipan
+            "flood_types": ["Lũ quét", "Sạt lở đất", "Ngập thung lũng"],
+            "lead_time_hours": {
+                "from_china_border": [0, 12],
+                "flash_flood": [2, 6],
+            },
+            "flood_depth_return_periods": {
+                "2_year": 0.5,
+                "5_year": 1.0,
+                "10_year": 1.5,
+                "20_year": 2.0,
+                "50_year": 2.8,
+                "100_year": 3.5,
+            },
+            "critical_infrastructure": [
+                "QL 70 (Yên Bái - Lào Cai)",
+                "Đường sắt Hà Nội - Lào Cai",
+                "Sa Pa tourism area",
+                "Thủy điện Lai Châu, Bản Chát",
+            ],
+        },
+
+        "zone_2_midstream": {
+            "name": "Trung lưu (Việt Trì - Vĩnh Phúc)",
+            "provinces": ["Phú Thọ", "Vĩnh Phúc", "Tuyên Quang"],
+            "area_km2": 15000,
+            "population": 2500000,
+            "elevation_range_m": [5, 200],
+            "flood_types": ["Lũ sông chính", "Ngập vùng trũng"],
+            "lead_time_hours": {
+                "from_china_border": [24, 48],
+                "from_yen_bai": [12, 18],
+            },
+            "flood_depth_return_periods": {
+                "2_year": 0.3,
+                "5_year": 0.8,
+                "10_year": 1.2,
+                "20_year": 1.5,
+                "50_year": 2.0,
+                "100_year": 2.5,
+            },
+            "critical_infrastructure": [
+                "TP Việt Trì",
+                "Khu công nghiệp Phú Thọ",
+                "Cầu Việt Trì",
+                "Cảng Việt Trì",
+            ],
+        },
+
+        "zone_3_hanoi": {
+            "name": "Hà Nội",
+            "area_km2": 3360,
+            "population_total": 8000000,
+            "population_at_flood_risk": 3500000,
+            "elevation_range_m": [2, 20],
+            "districts_high_risk": [
+                "Ba Vì", "Sơn Tây", "Phúc Thọ", "Đan Phượng",
+                "Hoài Đức", "Thanh Trì", "Gia Lâm", "Đông Anh",
+                "Long Biên", "Hoàng Mai", "Tây Hồ", "Hà Đông",
+            ],
+            "flood_types": ["Ngập lụt nội đô", "Vỡ đê", "Úng ngập"],
+            "lead_time_hours": {
+                "from_son_tay": [6, 12],
+                "from_viet_tri": [18, 24],
+                "from_china_border": [48, 72],
+            },
+            "flood_depth_return_periods": {
+                "2_year": 0.2,
+                "5_year": 0.5,
+                "10_year": 0.8,
+                "20_year": 1.0,
+                "50_year": 1.5,
+                "100_year": 2.0,
+                "dike_breach_scenario": 4.0,
+            },
+            "dike_system": {
+                "huu_hong_right_bank": {
+                    "length_km": 143,
+                    "grade": "SPECIAL",  # Cấp đặc biệt
+                    "design_flood_return_period": 500,
+                    "design_level_m": 14.22,
+                },
+                "ta_hong_left_bank": {
+                    "length_km": 128,
+                    "grade": "SPECIAL",
+                    "design_flood_return_period": 500,
+                    "design_level_m": 14.22,
+                },
+            },
+            "flood_diversion_areas": [
+                {"name": "Vân Cốc", "capacity_million_m3": 40},
+                {"name": "Tam Thanh", "capacity_million_m3": 35},
+                {"name": "Lương Phú", "capacity_million_m3": 30},
+            ],
+            "pumping_stations": [
+                {"name": "Yên Sở", "capacity_m3_s": 150},
+                {"name": "Yên Xá", "capacity_m3_s": 120},
+                {"name": "Thanh Liệt", "capacity_m3_s": 100},
+            ],
+        },
+
+        "zone_4_delta": {
+            "name": "Đồng bằng sông Hồng",
+            "provinces": [
+                "Hưng Yên", "Hà Nam", "Nam Định", "Thái Bình",
+                "Hải Dương", "Hải Phòng", "Ninh Bình", "Quảng Ninh phần Tây",
+            ],
+            "area_km2": 10500,
+            "population": 8500000,
+            "elevation_avg_m": 1.5,  # Rất thấp!
+            "elevation_range_m": [0, 10],
+            "flood_types": [
+                "Ngập diện rộng",
+                "Xâm nhập mặn",
+                "Thiệt hại nông nghiệp",
+                "Kết hợp lũ + triều",
+            ],
+            "lead_time_hours": {
+                "from_hanoi": [24, 48],
+                "from_china_border": [72, 120],
+            },
+            "agricultural_area_km2": 7500,
+            "rice_area_km2": 5000,
+            "aquaculture_area_km2": 1200,
+        },
+    },
+
+    # Thời gian truyền lũ
+    "flood_routing_time": {
+        "china_border_to_yen_bai": {"distance_km": 150, "time_hours": [18, 24]},
+        "yen_bai_to_viet_tri": {"distance_km": 120, "time_hours": [15, 20]},
+        "viet_tri_to_son_tay": {"distance_km": 50, "time_hours": [8, 12]},
+        "son_tay_to_hanoi": {"distance_km": 40, "time_hours": [6, 10]},
+        "hanoi_to_sea": {"distance_km": 120, "time_hours": [18, 24]},
+        "total_china_to_hanoi": {"distance_km": 360, "time_hours": [47, 66]},
+    },
+}
+
+HONG_RIVER_BASIN = freeze(HONG_RIVER_BASIN)
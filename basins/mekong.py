@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Lưu vực sông Mekong (Cửu Long)
+"""
+from basins._frozen import freeze
+
+MEKONG_RIVER_BASIN = {
+    "overview": {
+        "total_length_km": 4909,  # Sông dài thứ 12 thế giới
+        "total_area_km2": 795000,
+        "vn_delta_area_km2": 39000,
+        "annual_rainfall_mm": 1600,
+        "population": 17500000,
+        "average_discharge_m3_s": 15000,
+    },
+
+    # Cascade đập Trung Quốc (Sông Lan Thương - Lancang)
+    "china_dams_cascade": {
+        "nuozhadu": {
+            "capacity_million_m3": 21700,
+            "power_mw": 5850,
+            "commissioned": 2014,
+            "height_m": 261.5,
+            "coordinates": (22.65, 100.43),
+        },
+        "xiaowan": {
+            "capacity_million_m3": 15000,
+            "power_mw": 4200,
+            "commissioned": 2010,
+            "height_m": 292,
+            "coordinates": (24.69, 100.08),
+        },
+        "manwan": {
+            "capacity_million_m3": 920,
+            "power_mw": 1500,
+            "commissioned": 1996,
+            "coordinates": (24.98, 100.23),
+        },
+        "dachaoshan": {
+            "capacity_million_m3": 940,
+            "power_mw": 1350,
+            "commissioned": 2003,
+            "coordinates": (24.55, 100.27),
+        },
+        "jinghong": {
+            "capacity_million_m3": 1240,
+            "power_mw": 1750,
+            "commissioned": 2009,
+            "coordinates": (21.97, 100.80),
+        },
+        "gongguoqiao": {
+            "capacity_million_m3": 570,
+            "power_mw": 750,
+            "commissioned": 2011,
+            "coordinates": (23.55, 100.68),
+        },
+        "total_cascade": {
+            "total_capacity_million_m3": 44000,  # Khổng lồ!
+            "total_power_mw": 22000,
+            "number_of_dams": 11,
+            "impact_on_downstream": "Kiểm soát ~70% dòng chảy mùa khô",
+        },
+    },
+
+    # Trạm quan trắc Mekong
+    "gauging_stations": {
+        "chiang_saen_thailand": {
+            "river": "Mekong",
+            "country": "Thailand",
+            "coordinates": (20.2667, 100.0833),
+            "distance_from_source_km": 1750,
+            "catchment_area_km2": 189000,
+            "data_source": "MRC (Mekong River Commission)",
+            "average_discharge_m3_s": 2300,
+        },
+        "vientiane_laos": {
+            "river": "Mekong",
+            "country": "Laos",
+            "coordinates": (17.9757, 102.6331),
+            "distance_from_source_km": 2250,
+            "catchment_area_km2": 299000,
+            "average_discharge_m3_s": 3900,
+        },
+        "pakse_laos": {
+            "river": "Mekong",
+            "country": "Laos",
+            "coordinates": (15.12, 105.78),
+            "distance_from_source_km": 3320,
+            "catchment_area_km2": 545000,
+            "average_discharge_m3_s": 8500,
+        },
+        "stung_treng_cambodia": {
+            "river": "Mekong",
+            "country": "Cambodia",
+            "coordinates": (13.5167, 106.0167),
+            "distance_from_source_km": 3620,
+            "catchment_area_km2": 635000,
+            "average_discharge_m3_s": 11000,
+        },
+        "kratie_cambodia": {
+            "river": "Mekong",
+            "country": "Cambodia",
+            "coordinates": (12.48, 106.02),
+            "distance_from_source_km": 3750,
+            "catchment_area_km2": 646000,
+            "average_discharge_m3_s": 12500,
+            "importance": "KEY_STATION",  # Trạm dự báo chính cho VN
+        },
+        "tan_chau_vietnam": {
+            "river": "Tiền Giang",
+            "country": "Vietnam",
+            "coordinates": (10.8, 105.2333),
+            "alert_level_1_m": 3.5,
+            "alert_level_2_m": 4.0,
+            "alert_level_3_m": 4.5,
+            "historical_max_m": 5.2,
+            "historical_max_year": 2000,
+            "average_discharge_m3_s": 11500,
+            "max_discharge_m3_s": 26400,
+        },
+        "chau_doc_vietnam": {
+            "river": "Hậu Giang",
+            "country": "Vietnam",
+            "coordinates": (10.7, 105.1167),
+            "alert_level_1_m": 3.0,
+            "alert_level_2_m": 3.5,
+            "alert_level_3_m": 4.0,
+            "historical_max_m": 4.8,
+            "historical_max_year": 2000,
+            "average_discharge_m3_s": 3200,
+            "max_discharge_m3_s": 8500,
+        },
+        "can_tho_vietnam": {
+            "river": "Hậu Giang",
+            "country": "Vietnam",
+            "coordinates": (10.0452, 105.7469),
+            "alert_level_1_m": 1.8,
+            "alert_level_2_m": 2.0,
+            "alert_level_3_m": 2.2,
+            "historical_max_m": 2.5,
+            "historical_max_year": 2000,
+            "average_discharge_m3_s": 8500,
+            "tidal_influence": True,
+        },
+    },
+
+    # Phân vùng lũ Đồng bằng sông Cửu Long
+    "flood_zones": {
+        "zone_a_upper_delta": {
+            "name": "Đầu nguồn đồng bằng",
+            "provinces": ["An Giang", "Đồng Tháp"],
+            "area_km2": 7500,
+            "population": 3800000,
+            "entry_points": ["Tân Châu", "Châu Đốc"],
+            "characteristics": [
+                "Nhận nước lũ đầu tiên",
+                "Vùng trữ lũ tự nhiên - Đồng Tháp Mười",
+                "Ruộng lúa nổi truyền thống",
+            ],
+            "lead_time_hours": {
+                "from_kratie": [72, 96],
+                "from_phnom_penh": [24, 48],
+            },
+            "flood_depth_return_periods": {
+                "annual_flood": 2.0,  # Lũ hàng năm
+                "2_year": 2.5,
+                "5_year": 3.5,
+                "10_year": 4.0,
+                "20_year": 4.5,
+                "2000_extreme": 5.0,  # Đại hồng thủy 2000
+            },
+            "dike_system": {
+                "high_dikes_km2": 1400,  # Đê bao cao - 3 vụ lúa
+                "semi_dikes_km2": 3200,  # Đê bao lửng - lúa nổi
+                "open_fields_km2": 2900,  # Không đê - ngập tự nhiên
+            },
+            "economic_value": {
+                "rice_production_tons_year": 4500000,
+                "aquaculture_tons_year": 380000,
+            },
+        },
+
+        "zone_b_central_delta": {
+            "name": "Trung tâm đồng bằng",
+            "provinces": ["Cần Thơ", "Vĩnh Long", "Tiền Giang", "Long An"],
+            "area_km2": 8500,
+            "population": 5500000,
+            "characteristics": [
+                "Giao thoa lũ và triều",
+                "Vựa lúa chính",
+                "Đô thị hóa cao",
+            ],
+            "lead_time_hours": {
+                "from_tan_chau": [48, 96],
+            },
+            "flood_depth_return_periods": {
+                "annual_flood": 1.0,
+                "2_year": 1.5,
+                "5_year": 2.0,
+                "10_year": 2.5,
+                "20_year": 3.0,
+            },
+            "tidal_range_m": [2.5, 3.8],  # Biên độ triều
+            "saltwater_intrusion_risk": "HIGH",
+            "critical_infrastructure": [
+                "TP Cần Thơ (1.2M người)",
+                "Cầu Cần Thơ, Mỹ Thuận, Rạch Miễu",
+                "Cảng Cần Thơ",
+                "KCN Trà Nóc",
+            ],
+        },
+
+        "zone_c_coastal": {
+            "name": "Vùng ven biển",
+            "provinces": ["Sóc Trăng", "Bạc Liêu", "Cà Mau", "Kiên Giang"],
+            "area_km2": 12000,
+            "population": 4200000,
+            "elevation_avg_m": 0.8,  # Cực thấp!
+            "characteristics": [
+                "Xâm nhập mặn nghiêm trọng",
+                "Nuôi tôm",
+                "Sụt lún đất",
+                "Nước biển dâng",
+            ],
+            "subsidence_rate_mm_year": 25,  # Sụt lún 2.5cm/năm
+            "sea_level_rise_mm_year": 3.3,
+            "saltwater_intrusion_km_inland": {
+                "normal_year": 40,
+                "dry_year": 70,
+                "extreme_drought_2016": 90,
+            },
+            "flood_risk": "Combined: flood + tide + sea level rise",
+            "aquaculture_area_km2": 4200,
+            "mangrove_area_km2": 350,
+        },
+
+        "zone_d_northeast": {
+            "name": "Đông Bắc (Long An, Tây Ninh)",
+            "provinces": ["Long An", "Tây Ninh", "Bình Dương phần Tây"],
+            "area_km2": 6500,
+            "population": 2800000,
+            "characteristics": [
+                "Vùng chuyển tiếp TP.HCM",
+                "Khu công nghiệp phát triển",
+                "Thoát lũ sang sông Vàm Cỏ",
+            ],
+            "flood_depth_return_periods": {
+                "annual_flood": 1.5,
+                "5_year": 2.5,
+                "20_year": 3.5,
+            },
+        },
+    },
+
+    # Thời gian truyền lũ Mekong
+    "flood_routing_time": {
+        "chiang_saen_to_vientiane": {"distance_km": 600, "time_hours": [72, 96]},
+        "vientiane_to_pakse": {"distance_km": 650, "time_hours": [84, 108]},
+        "pakse_to_stung_treng": {"distance_km": 300, "time_hours": [36, 48]},
+        "stung_treng_to_phnom_penh": {"distance_km": 220, "time_hours": [30, 40]},
+        "phnom_penh_to_tan_chau": {"distance_km": 130, "time_hours": [24, 36]},
+        "total_china_to_vietnam": {"distance_km": 2000, "time_hours": [252, 342]},  # ~10-14 ngày
+    },
+}
+
+MEKONG_RIVER_BASIN = freeze(MEKONG_RIVER_BASIN)
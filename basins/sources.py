@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Nguồn dữ liệu và API
+"""
+from basins._frozen import freeze
+
+DATA_SOURCES = {
+    "vietnam_national": {
+        "nchmf": {
+            "name": "National Center for Hydro-Meteorological Forecasting",
+            "website": "http://www.nchmf.gov.vn",
+            "api_available": False,
+            "data_types": ["Rainfall", "Water level", "Forecast"],
+            "update_frequency": "6 hours",
+            "coverage": "Nationwide",
+        },
+        "imh": {
+            "name": "Institute of Meteorology and Hydrology",
+            "website": "http://www.imh.ac.vn",
+            "api_available": False,
+            "data_types": ["Historical data", "Research"],
+        },
+        "monre": {
+            "name": "Ministry of Natural Resources and Environment",
+            "website": "http://www.monre.gov.vn",
+            "api_available": False,
+            "data_types": ["Water resources", "Environmental data"],
+        },
+    },
+
+    "international": {
+        "open_meteo": {
+            "name": "Open-Meteo",
+            "api_url": "https://api.open-meteo.com/v1/forecast",
+            "api_available": True,
+            "free": True,
+            "data_types": ["Rainfall forecast", "Temperature", "Wind"],
+            "forecast_days": 16,
+            "spatial_resolution_km": 11,
+            "update_frequency": "1 hour",
+            "recommended": True,
+        },
+        "mrc": {
+            "name": "Mekong River Commission",
+            "website": "https://www.mrcmekong.org",
+            "api_url": "https://portal.mrcmekong.org/api",
+            "api_available": True,
+            "free": True,
+            "data_types": ["Mekong water level", "Discharge", "Forecast"],
+            "update_frequency": "Daily",
+            "coverage": "Mekong Basin only",
+            "recommended": True,
+        },
+        "gfs_noaa": {
+            "name": "NOAA Global Forecast System",
+            "api_url": "https://nomads.ncep.noaa.gov/pub/data/nccf/com/gfs/prod/",
+            "api_available": True,
+            "free": True,
+            "data_types": ["Global weather forecast"],
+            "forecast_days": 16,
+            "spatial_resolution_km": 25,
+            "update_frequency": "6 hours",
+        },
+        "nasa_gpm": {
+            "name": "NASA GPM (Global Precipitation Measurement)",
+            "api_url": "https://gpm.nasa.gov/data/imerg",
+            "api_available": True,
+            "data_types": ["Satellite rainfall estimates"],
+            "spatial_resolution_km": 10,
+            "temporal_resolution": "30 minutes",
+            "delay_hours": 4,  # Near real-time
+        },
+    },
+}
+
+DATA_SOURCES = freeze(DATA_SOURCES)
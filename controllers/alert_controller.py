@@ -7,11 +7,20 @@ to prevent blocking the FastAPI event loop.
 """
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional
+from decimal import Decimal
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import Any, Optional
 
 from services.alert_service import AlertService
 
+# orjson (optional) - serializes the large alert payloads several times faster
+# than FastAPI's jsonable_encoder + json.dumps path
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 router = APIRouter(prefix="/api", tags=["Alerts"])
 
 # Thread pool for running sync operations without blocking event loop
@@ -21,6 +30,23 @@ _executor = ThreadPoolExecutor(max_workers=4)
 alert_service = AlertService()
 
 
+def _orjson_default(obj: Any) -> Any:
+    """Types orjson doesn't handle natively (DB-cached payloads may carry Decimal)"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _json_response(result: Any) -> Any:
+    """Serialize with orjson when installed; otherwise let FastAPI encode the dict"""
+    if not ORJSON_AVAILABLE:
+        return result
+    return Response(
+        content=orjson.dumps(result, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS),
+        media_type="application/json",
+    )
+
+
 @router.get("/alerts")
 async def get_alerts(
     severity: Optional[str] = Query(None, description="Lọc theo mức độ: critical, high, medium, low"),
@@ -49,7 +75,7 @@ async def get_alerts(
                 if severity:
                     cached_result["alerts"] = [a for a in cached_result["alerts"] if a.get("severity") == severity]
                     cached_result["total"] = len(cached_result["alerts"])
-                return cached_result
+                return _json_response(cached_result)
             else:
                 return {"status": "processing", "job_id": job_id}
         else:
@@ -60,7 +86,7 @@ async def get_alerts(
                 None,  # alert_date
                 severity
             )
-            return result
+            return _json_response(result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -77,7 +103,7 @@ async def get_realtime_alerts():
         # Run in thread pool to avoid blocking event loop
         loop = asyncio.get_event_loop()
         result = await loop.run_in_executor(_executor, alert_service.get_realtime_alerts)
-        return result
+        return _json_response(result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -97,7 +123,7 @@ async def get_alerts_by_region(region: str):
         # Run in thread pool to avoid blocking event loop
         loop = asyncio.get_event_loop()
         result = await loop.run_in_executor(_executor, alert_service.get_alerts_by_region, region)
-        return result
+        return _json_response(result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -114,7 +140,7 @@ async def get_combined_alerts():
         # Run in thread pool to avoid blocking event loop
         loop = asyncio.get_event_loop()
         result = await loop.run_in_executor(_executor, alert_service.get_combined_alerts)
-        return result
+        return _json_response(result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -3,10 +3,9 @@
 Rainfall Analysis Controller - API routes for rainfall analysis by location
 """
 from fastapi import APIRouter, HTTPException, Query
-from typing import Optional, List
-import requests
+from typing import Optional, List, Tuple
 
-from weather_api import OPEN_METEO_FORECAST, VIETNAM_LOCATIONS
+from weather_api import FORECAST_CACHE_TTL, OPEN_METEO_FORECAST, VIETNAM_LOCATIONS, _fetch_bulk, _get_session
 
 router = APIRouter(prefix="/api/rainfall", tags=["Rainfall Analysis"])
 
@@ -107,7 +106,7 @@ def search_location(query: str, limit: int = 10) -> list:
         headers = {
             "User-Agent": "VietnamFloodForecast/1.0"
         }
-        resp = requests.get(NOMINATIM_SEARCH_URL, params=params, headers=headers, timeout=10)
+        resp = _get_session().get(NOMINATIM_SEARCH_URL, params=params, headers=headers, timeout=10)
         resp.raise_for_status()
         results = resp.json()
 
@@ -152,7 +151,7 @@ def get_administrative_divisions(province_code: str) -> dict:
         headers = {
             "User-Agent": "VietnamFloodForecast/1.0"
         }
-        resp = requests.get(NOMINATIM_SEARCH_URL, params=params, headers=headers, timeout=15)
+        resp = _get_session().get(NOMINATIM_SEARCH_URL, params=params, headers=headers, timeout=15)
         resp.raise_for_status()
         results = resp.json()
 
@@ -194,7 +193,7 @@ def reverse_geocode(lat: float, lon: float) -> dict:
         headers = {
             "User-Agent": "VietnamFloodForecast/1.0"
         }
-        resp = requests.get(NOMINATIM_REVERSE_URL, params=params, headers=headers, timeout=10)
+        resp = _get_session().get(NOMINATIM_REVERSE_URL, params=params, headers=headers, timeout=10)
         resp.raise_for_status()
         data = resp.json()
 
@@ -225,22 +224,28 @@ def fetch_rainfall_data(lat: float, lon: float, days: int = 7) -> dict:
     Fetch comprehensive weather forecast data from Open-Meteo
     Including: rainfall, temperature, humidity, wind, UV index
     """
+    return fetch_rainfall_data_bulk([(lat, lon)], days)[0]
+
+
+def fetch_rainfall_data_bulk(coords: List[Tuple[float, float]], days: int = 7) -> List[dict]:
+    """
+    Same data as fetch_rainfall_data for several (lat, lon) points in one request,
+    through weather_api's cached bulk fetcher. If the shared request fails, each
+    point is retried on its own so one bad point does not blank the others.
+    Returns {} for every point that could not be fetched.
+    """
     params = {
-        "latitude": lat,
-        "longitude": lon,
         "hourly": "precipitation,rain,showers,precipitation_probability,temperature_2m,relative_humidity_2m,wind_speed_10m,wind_direction_10m",
         "daily": "precipitation_sum,rain_sum,showers_sum,precipitation_hours,precipitation_probability_max,temperature_2m_max,temperature_2m_min,apparent_temperature_max,apparent_temperature_min,wind_speed_10m_max,wind_gusts_10m_max,wind_direction_10m_dominant,uv_index_max,sunrise,sunset",
         "forecast_days": days,
         "timezone": "Asia/Ho_Chi_Minh",
     }
 
-    try:
-        resp = requests.get(OPEN_METEO_FORECAST, params=params, timeout=30)
-        resp.raise_for_status()
-        return resp.json()
-    except Exception as e:
-        print(f"Error fetching rainfall data: {e}")
-        return {}
+    data = _fetch_bulk(OPEN_METEO_FORECAST, params, coords, FORECAST_CACHE_TTL, "rainfall data")
+    if len(coords) > 1 and not any(data):
+        data = [_fetch_bulk(OPEN_METEO_FORECAST, params, [point], FORECAST_CACHE_TTL, "rainfall data")[0]
+                for point in coords]
+    return data
 
 
 def analyze_rainfall(data: dict) -> dict:
@@ -782,12 +787,13 @@ async def compare_rainfall_multiple_locations(
 
     results = []
 
-    for loc_code in location_list:
-        if loc_code not in VIETNAM_LOCATIONS:
-            continue
+    # One multi-location request for all valid codes instead of one per location
+    valid_codes = [code for code in location_list if code in VIETNAM_LOCATIONS]
+    coords = [(VIETNAM_LOCATIONS[code]["lat"], VIETNAM_LOCATIONS[code]["lon"]) for code in valid_codes]
+    all_rainfall_data = fetch_rainfall_data_bulk(coords, days) if coords else []
 
+    for loc_code, rainfall_data in zip(valid_codes, all_rainfall_data):
         loc = VIETNAM_LOCATIONS[loc_code]
-        rainfall_data = fetch_rainfall_data(loc["lat"], loc["lon"], days)
 
         if rainfall_data:
             analysis = analyze_rainfall(rainfall_data)
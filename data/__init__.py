@@ -8,6 +8,7 @@ from .constants import (
     MAJOR_STATIONS,
     BASIN_NAMES,
     BASIN_ID_MAP,
+    normalize_basin,
 )
 
 __all__ = [
@@ -16,4 +17,5 @@ __all__ = [
     "MAJOR_STATIONS",
     "BASIN_NAMES",
     "BASIN_ID_MAP",
+    "normalize_basin",
 ]
@@ -2,6 +2,7 @@
 """
 Vietnam geographic and infrastructure constants
 """
+from functools import lru_cache
 
 # Map basin codes to display names
 BASIN_NAMES = {
@@ -13,6 +14,13 @@ BASIN_NAMES = {
 
 BASIN_ID_MAP = {"HONG": 1, "MEKONG": 2, "DONGNAI": 3, "CENTRAL": 4}
 
+
+@lru_cache(maxsize=64)
+def normalize_basin(basin: str) -> str:
+    """Upper-case a basin code from a request path (cached - few distinct codes)"""
+    return basin.upper()
+
+
 # Major monitoring stations for each basin
 MAJOR_STATIONS = {
     "HONG": [
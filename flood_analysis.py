@@ -5,9 +5,12 @@ Bao gồm các phương pháp thủy văn và thống kê cho dự báo lũ
 """
 
 import numpy as np
+from collections import ChainMap
 from typing import Dict, List, Tuple
 from datetime import datetime, timedelta
 
+from basins import HYDROLOGICAL_FORMULAS
+
 
 def calculate_basin_rainfall_thiessen(points_data: Dict, basin_weights: Dict) -> Tuple[float, Dict]:
     """
@@ -215,15 +218,9 @@ def estimate_discharge_from_rainfall(
         - runoff_coefficient: Hệ số dòng chảy
         - method: Phương pháp tính
     """
-    # SCS Curve Number method
-    S = (25400.0 / curve_number) - 254.0  # mm
-    Ia = 0.2 * S  # Initial abstraction
-
     # Calculate runoff
-    if basin_rainfall <= Ia:
-        runoff = 0.0
-    else:
-        runoff = ((basin_rainfall - Ia) ** 2) / (basin_rainfall - Ia + S)
+    S = scs_cn_retention(curve_number)
+    runoff = scs_cn_runoff(basin_rainfall, curve_number)
 
     # Runoff coefficient
     runoff_coeff = runoff / basin_rainfall if basin_rainfall > 0 else 0
@@ -245,7 +242,7 @@ def estimate_discharge_from_rainfall(
         "runoff": round(runoff, 2),
         "runoff_coefficient": round(runoff_coeff, 3),
         "potential_retention_s": round(S, 2),
-        "initial_abstraction_ia": round(Ia, 2),
+        "initial_abstraction_ia": round(0.2 * S, 2),
         "method": "SCS-CN",
         "curve_number": curve_number
     }
@@ -599,7 +596,7 @@ def calculate_travel_time(
         raise ValueError("Manning's n phải trong khoảng [0.01, 0.20]")
 
     # Công thức Manning: V = (1/n) * R^(2/3) * S^(1/2)
-    velocity = (1 / manning_n) * (hydraulic_radius ** (2/3)) * (slope ** 0.5)
+    velocity = manning_velocity(manning_n, hydraulic_radius, slope)
 
     # Thời gian truyền
     distance_m = distance * 1000  # km to m
@@ -675,6 +672,111 @@ def calculate_flood_wave_celerity(discharge: float, width: float, depth: float)
     }
 
 
+# ==================================================================================
+# PHẦN 3: HÀM TÍNH NHANH (VECTOR HÓA)
+# ==================================================================================
+# Các hàm dưới đây chỉ tính giá trị số, không dựng dict kết quả.
+# Nhận số hoặc mảng NumPy (broadcast) - một lần gọi tính cho cả chuỗi/lưới.
+
+def _as_result(value):
+    """0-d array -> float, mảng giữ nguyên"""
+    return float(value) if np.ndim(value) == 0 else value
+
+
+# Bảng hệ số của từng công thức trong HYDROLOGICAL_FORMULAS
+_COEFFICIENT_TABLES = {
+    "scs_cn_method": "cn_values",
+    "manning_equation": "manning_n_values",
+    "rational_method": "runoff_coefficients",
+    "muskingum_routing": "typical_X_values",
+}
+
+# Hệ số hiệu chỉnh lúc chạy - ưu tiên hơn giá trị mặc định, không cần import lại
+_COEFFICIENT_OVERRIDES: Dict[str, Dict[str, float]] = {
+    formula: {} for formula in _COEFFICIENT_TABLES
+}
+
+
+def formula_coefficients(formula: str) -> ChainMap:
+    """Hệ số hiện hành của công thức: giá trị hiệu chỉnh, rồi đến mặc định"""
+    defaults = HYDROLOGICAL_FORMULAS[formula][_COEFFICIENT_TABLES[formula]]
+    return ChainMap(_COEFFICIENT_OVERRIDES[formula], defaults)
+
+
+def set_formula_coefficients(formula: str, **values: float) -> None:
+    """
+    Hiệu chỉnh hệ số lúc chạy, vd.
+    set_formula_coefficients("manning_equation", flood_plain=0.07)
+    """
+    _COEFFICIENT_OVERRIDES[formula].update(values)
+
+
+def reset_formula_coefficients(formula: str = None) -> None:
+    """Bỏ hiệu chỉnh, quay về giá trị mặc định (một hoặc tất cả công thức)"""
+    for name in ([formula] if formula else _COEFFICIENT_OVERRIDES):
+        _COEFFICIENT_OVERRIDES[name].clear()
+
+
+def _coefficient(formula: str, value):
+    """Tên loại bề mặt (str) -> hệ số hiện hành; số/mảng giữ nguyên"""
+    if isinstance(value, str):
+        return formula_coefficients(formula)[value]
+    return value
+
+
+def manning_velocity(manning_n, hydraulic_radius, slope):
+    """
+    Vận tốc Manning: V = (1/n) * R^(2/3) * S^(1/2)  (m/s)
+    manning_n có thể là tên loại lòng sông, vd. "natural_clean"
+    """
+    n = np.asarray(_coefficient("manning_equation", manning_n), dtype=np.float64)
+    R = np.asarray(hydraulic_radius, dtype=np.float64)
+    S = np.asarray(slope, dtype=np.float64)
+    return _as_result(np.power(R, 2.0 / 3.0) * np.sqrt(S) / n)
+
+
+def scs_cn_retention(curve_number):
+    """
+    Khả năng trữ tối đa SCS-CN: S = 25400/CN - 254  (mm); Ia = 0.2S
+    curve_number có thể là tên loại đất, vd. "forest_good"
+    """
+    CN = np.asarray(_coefficient("scs_cn_method", curve_number), dtype=np.float64)
+    return _as_result(25400.0 / CN - 254.0)
+
+
+def scs_cn_runoff(rainfall, curve_number):
+    """
+    Dòng chảy mặt SCS-CN: Q = (P - Ia)² / (P - Ia + S)  (mm)
+    với S = 25400/CN - 254, Ia = 0.2S; Q = 0 khi P <= Ia
+    curve_number có thể là tên loại đất, vd. "forest_good"
+    """
+    P = np.asarray(rainfall, dtype=np.float64)
+    S = np.asarray(scs_cn_retention(curve_number))
+    excess = P - 0.2 * S
+    positive = excess > 0
+    runoff = np.where(positive, excess ** 2 / np.where(positive, excess + S, 1.0), 0.0)
+    return _as_result(runoff)
+
+
+def rational_peak_discharge(runoff_coefficient, intensity_mm_h, area_km2):
+    """
+    Phương pháp Hữu tỷ: Q = 0.278 × C × i × A  (m³/s)
+    runoff_coefficient có thể là tên loại bề mặt, vd. "asphalt"
+    """
+    C = np.asarray(_coefficient("rational_method", runoff_coefficient), dtype=np.float64)
+    i = np.asarray(intensity_mm_h, dtype=np.float64)
+    A = np.asarray(area_km2, dtype=np.float64)
+    return _as_result(0.278 * C * i * A)
+
+
+# Hàm tính tương ứng với các mục trong vietnam_hydro_config.HYDROLOGICAL_FORMULAS
+HYDROLOGICAL_FORMULA_FUNCTIONS = {
+    "manning_equation": manning_velocity,
+    "scs_cn_method": scs_cn_runoff,
+    "rational_method": rational_peak_discharge,
+}
+
+
 # ==================================================================================
 # WRAPPER FUNCTIONS - Tương thích với các tên gọi khác
 # ==================================================================================
@@ -726,18 +828,9 @@ def estimate_discharge_scs(
     Returns:
         Dict chứa peak_discharge và các thông số
     """
-    # SCS Curve Number method
-    # S = (25400/CN) - 254 (mm)
-    S = (25400 / curve_number) - 254
-
-    # Initial abstraction
-    Ia = 0.2 * S
-
     # Runoff depth (mm)
-    if rainfall > Ia:
-        runoff = ((rainfall - Ia) ** 2) / (rainfall - Ia + S)
-    else:
-        runoff = 0
+    S = scs_cn_retention(curve_number)
+    runoff = scs_cn_runoff(rainfall, curve_number)
 
     # Runoff coefficient
     runoff_coef = runoff / rainfall if rainfall > 0 else 0
@@ -752,7 +845,7 @@ def estimate_discharge_scs(
         "runoff": runoff,
         "runoff_coefficient": runoff_coef,
         "potential_retention_s": S,
-        "initial_abstraction_ia": Ia,
+        "initial_abstraction_ia": 0.2 * S,
         "method": "SCS-CN",
         "curve_number": curve_number
     }
@@ -3,6 +3,7 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from typing import Dict, List, Optional
 from datetime import datetime
+from bisect import bisect_left, bisect_right
 import sys
 import os
 from openai import OpenAI
@@ -18,7 +19,7 @@ from p import (
     BASIN_WEIGHTS,
     FLOOD_THRESHOLDS,
     fetch_weather_data,
-    calculate_basin_rainfall,
+    calculate_basin_rainfall_series,
     analyze_basin_forecast
 )
 
@@ -32,6 +33,7 @@ from weather_api import (
     get_all_vietnam_weather,
     analyze_weather_for_alerts,
     get_weather_description,
+    describe_weather_codes,
     WEATHER_CODES
 )
 
@@ -135,14 +137,7 @@ def get_cached_or_fetch():
     all_analysis = {}
 
     for basin, weights in BASIN_WEIGHTS.items():
-        basin_rainfall = []
-        for idx in range(len(dates_ref)):
-            day_points = {
-                st: {"precipitation_sum": station_data.get(st, [0] * len(dates_ref))[idx]}
-                for st in weights.keys()
-            }
-            basin_rain = calculate_basin_rainfall(day_points, weights)
-            basin_rainfall.append(basin_rain)
+        basin_rainfall = calculate_basin_rainfall_series(station_data, weights, len(dates_ref))
 
         thresholds = FLOOD_THRESHOLDS.get(basin, FLOOD_THRESHOLDS["CENTRAL"])
         analysis = analyze_basin_forecast(basin, basin_rainfall, dates_ref, thresholds)
@@ -2187,6 +2182,16 @@ async def get_flood_zones():
     }
 
 
+# Bảng ngưỡng mức độ cảnh báo lưu vực: bisect_left cho điều kiện ">" ngưỡng,
+# bisect_right cho ">=" ngưỡng
+_BASIN_FLOOD_RAIN_CUTS = (70, 100)
+_BASIN_FLOOD_SEVERITY = ("medium", "high", "critical")
+_BASIN_RAIN_CUTS = (50, 70)
+_BASIN_RAIN_SEVERITY = ("low", "medium", "high")
+_REGION_HEAT_CUTS = (38, 40)
+_REGION_HEAT_SEVERITY = ("medium", "high", "critical")
+
+
 def generate_weather_alerts(forecast_data: dict) -> list:
     """Tạo cảnh báo thời tiết từ dữ liệu dự báo"""
     import random
@@ -2225,7 +2230,7 @@ def generate_weather_alerts(forecast_data: dict) -> list:
 
             # 1. CẢNH BÁO LŨ LỤT
             if daily_rain > 50 or accumulated > 100:
-                severity = "critical" if daily_rain > 100 or accumulated > 200 else "high" if daily_rain > 70 else "medium"
+                severity = "critical" if accumulated > 200 else _BASIN_FLOOD_SEVERITY[bisect_left(_BASIN_FLOOD_RAIN_CUTS, daily_rain)]
                 affected_provinces = random.sample(info["provinces"], min(3, len(info["provinces"])))
 
                 alerts.append({
@@ -2252,7 +2257,7 @@ def generate_weather_alerts(forecast_data: dict) -> list:
 
             # 2. CẢNH BÁO MƯA LỚN
             if daily_rain > 30:
-                severity = "high" if daily_rain > 70 else "medium" if daily_rain > 50 else "low"
+                severity = _BASIN_RAIN_SEVERITY[bisect_left(_BASIN_RAIN_CUTS, daily_rain)]
                 alerts.append({
                     "id": f"rain_{basin_code}_{date}",
                     "type": "heavy_rain",
@@ -2290,7 +2295,7 @@ def generate_weather_alerts(forecast_data: dict) -> list:
                     "type": "heat_wave",
                     "category": "Nắng nóng",
                     "title": f"Cảnh báo nắng nóng gay gắt - {region['region']}",
-                    "severity": "critical" if region["temp"] >= 40 else "high" if region["temp"] >= 38 else "medium",
+                    "severity": _REGION_HEAT_SEVERITY[bisect_right(_REGION_HEAT_CUTS, region["temp"])],
                     "date": datetime.now().strftime("%Y-%m-%d"),
                     "region": region["region"],
                     "provinces": region["provinces"],
@@ -2731,11 +2736,13 @@ async def get_location_forecast(location: str, days: int = 7):
     # Format dữ liệu dễ đọc
     daily = forecast.get("daily", {})
     formatted_days = []
+    # Dịch cả cột mã thời tiết một lần thay vì tra từng ngày
+    weather_descriptions = describe_weather_codes(daily.get("weather_code", [0]))
 
     for i, date in enumerate(daily.get("time", [])):
         formatted_days.append({
             "date": date,
-            "weather": get_weather_description(daily.get("weather_code", [0])[i]),
+            "weather": weather_descriptions[i],
             "weather_code": daily.get("weather_code", [0])[i],
             "temp_max": daily.get("temperature_2m_max", [None])[i],
             "temp_min": daily.get("temperature_2m_min", [None])[i],
@@ -48,6 +48,7 @@ from p import (
     FLOOD_THRESHOLDS,
     fetch_weather_data,
     calculate_basin_rainfall,
+    calculate_basin_rainfall_series,
     analyze_basin_forecast
 )
 
@@ -363,14 +364,7 @@ async def get_all_forecasts(db: Session = Depends(get_db), force_refresh: bool =
         all_analysis = {}
 
         for basin, weights in BASIN_WEIGHTS.items():
-            basin_rainfall = []
-            for idx in range(len(dates_ref)):
-                day_points = {
-                    st: {"precipitation_sum": station_data.get(st, [0] * len(dates_ref))[idx]}
-                    for st in weights.keys()
-                }
-                basin_rain = calculate_basin_rainfall(day_points, weights)
-                basin_rainfall.append(basin_rain)
+            basin_rainfall = calculate_basin_rainfall_series(station_data, weights, len(dates_ref))
 
             thresholds = FLOOD_THRESHOLDS.get(basin, FLOOD_THRESHOLDS["CENTRAL"])
             analysis = analyze_basin_forecast(basin, basin_rainfall, dates_ref, thresholds)
@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
-import requests
+import numpy as np
 import json
 from datetime import datetime
 from typing import Dict, List, Tuple
 
+from weather_api import _get_session, decode_json
+
 # Điểm quan trắc chính - Mở rộng toàn quốc 63 tỉnh thành
 MONITORING_POINTS = {
     # === VÙNG ĐỒNG BẰNG SÔNG HỒNG (17 tỉnh) ===
@@ -222,13 +224,14 @@ PARAMS = {
 
 def fetch_weather_data(lat: float, lon: float) -> Dict:
     """Lấy dữ liệu thời tiết từ Open-Meteo API"""
-    resp = requests.get(
+    # Session dùng chung của weather_api (keep-alive + retry 429/5xx)
+    resp = _get_session().get(
         BASE_URL,
         params={**PARAMS, "latitude": lat, "longitude": lon},
         timeout=20
     )
     resp.raise_for_status()
-    return resp.json()
+    return decode_json(resp)
 
 
 def calculate_basin_rainfall(points_data: Dict, basin_weights: Dict) -> float:
@@ -258,6 +261,40 @@ def calculate_basin_rainfall(points_data: Dict, basin_weights: Dict) -> float:
     return total_weighted / total_area if total_area > 0 else 0.0
 
 
+def calculate_basin_rainfall_series(station_data: Dict[str, List], basin_weights: Dict,
+                                    n_days: int) -> List[float]:
+    """
+    Lượng mưa lưu vực (Thiessen) cho cả chuỗi n_days ngày một lần - cùng kết quả
+    như gọi calculate_basin_rainfall từng ngày, nhưng bằng phép nhân ma trận NumPy
+
+    Args:
+        station_data: Dict trạm -> danh sách precipitation_sum theo ngày
+        basin_weights: Dict chứa trọng số diện tích của các trạm
+        n_days: Số ngày cần tính
+
+    Returns:
+        Danh sách lượng mưa trung bình lưu vực (mm) theo ngày
+    """
+    stations = [st for st, weight in basin_weights.items() if weight > 0]
+    if not stations:
+        return [0.0] * n_days
+
+    # Trạm không lấy được dữ liệu tính mưa 0 (như trước); ô None/thiếu bị bỏ qua
+    rows = []
+    for st in stations:
+        values = station_data.get(st, [0] * n_days)[:n_days]
+        rows.append(values + [None] * (n_days - len(values)))
+    rain = np.array(rows, dtype=np.float64)  # None -> NaN
+    valid = ~np.isnan(rain)
+    weights = np.array([basin_weights[st] for st in stations], dtype=np.float64)
+
+    total_weighted = weights @ np.where(valid, rain, 0.0)
+    total_area = weights @ valid
+    return np.divide(
+        total_weighted, total_area, out=np.zeros(n_days), where=total_area > 0
+    ).tolist()
+
+
 def assess_flood_risk(daily_rain: float, accumulated_3d: float, thresholds: Dict) -> Tuple[str, str]:
     """
     Đánh giá mức độ nguy cơ lũ
@@ -395,14 +432,7 @@ def main():
 
     for basin, weights in BASIN_WEIGHTS.items():
         # Tính lượng mưa lưu vực theo ngày
-        basin_rainfall = []
-        for idx in range(len(dates_ref)):
-            day_points = {
-                st: {"precipitation_sum": station_data.get(st, [0] * len(dates_ref))[idx]}
-                for st in weights.keys()
-            }
-            basin_rain = calculate_basin_rainfall(day_points, weights)
-            basin_rainfall.append(basin_rain)
+        basin_rainfall = calculate_basin_rainfall_series(station_data, weights, len(dates_ref))
 
         # Phân tích và đánh giá nguy cơ
         thresholds = FLOOD_THRESHOLDS.get(basin, FLOOD_THRESHOLDS["Central"])
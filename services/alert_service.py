@@ -21,12 +21,30 @@ from repositories.alert_repository import AlertRepository
 from repositories.combined_alerts_cache_repository import CombinedAlertsCacheRepository
 from weather_api import (
     get_all_vietnam_weather,
-    analyze_weather_for_alerts
+    analyze_weather_for_alerts,
+    clear_response_cache
 )
 from services.request_manager import acquire_heavy_task, release_heavy_task
 from services.evn_reservoir_service import EVNReservoirService
 
 
+# Reservoir discharge recommendations, indexed [has_spillway][severity == "critical"].
+# Shared immutable tuples instead of a fresh list per alert.
+_DISCHARGE_RECOMMENDATIONS = tuple(
+    tuple(
+        (
+            "Theo dõi thông báo từ Ban chỉ huy PCTT địa phương",
+            "Người dân vùng hạ du cần cảnh giác" if has_spillway else "Theo dõi diễn biến mực nước",
+            "Không đánh bắt cá, vớt củi trên sông",
+            "Sẵn sàng sơ tán nếu có thông báo" if critical else "Di chuyển tài sản, vật nuôi lên cao",
+            "Tránh xa bờ sông, suối khi có xả lũ"
+        )
+        for critical in (False, True)
+    )
+    for has_spillway in (False, True)
+)
+
+
 class AlertService:
     """Service for alert operations with async support"""
 
@@ -67,7 +85,8 @@ class AlertService:
             locations=key_locations,
             include_flood=True,
             include_air_quality=False,
-            include_marine=False
+            include_marine=False,
+            summary_only=True  # Phân tích cảnh báo chỉ cần dữ liệu daily
         )
 
         alerts = analyze_weather_for_alerts(weather_data)
@@ -152,13 +171,7 @@ class AlertService:
                         "danger_level": danger_level,
                         "alert_reason": r.get("alert_reason"),
                     },
-                    "recommendations": [
-                        "Theo dõi thông báo từ Ban chỉ huy PCTT địa phương",
-                        "Người dân vùng hạ du cần cảnh giác" if has_spillway else "Theo dõi diễn biến mực nước",
-                        "Không đánh bắt cá, vớt củi trên sông",
-                        "Sẵn sàng sơ tán nếu có thông báo" if severity == "critical" else "Di chuyển tài sản, vật nuôi lên cao",
-                        "Tránh xa bờ sông, suối khi có xả lũ"
-                    ],
+                    "recommendations": _DISCHARGE_RECOMMENDATIONS[has_spillway][severity == "critical"],
                     "source": "EVN - Hệ thống thủy điện"
                 })
 
@@ -324,6 +337,8 @@ class AlertService:
         self._weather_cache = None
         self._alerts_cache = None
         self._cache_time = None
+        # Drop cached Open-Meteo payloads too, so the refresh actually re-fetches
+        clear_response_cache()
         # Also invalidate DB cache
         self.alerts_cache_repo.invalidate_all()
         print("✓ Invalidated all alerts cache (memory + DB)")
@@ -2,7 +2,9 @@
 """
 Dam Service - Business logic for dam and dam alerts
 """
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
+from itertools import chain
 from typing import Dict, List, Any, Optional
 import sys
 import os
@@ -13,7 +15,13 @@ from repositories.dam_repository import DamRepository
 from repositories.evn_reservoir_repository import EVNReservoirRepository
 from repositories.combined_alerts_cache_repository import CombinedAlertsCacheRepository
 from data.constants import VIETNAM_DAMS, VIETNAM_RIVERS
-from weather_api import fetch_forecast_full, fetch_flood_forecast
+from weather_api import (
+    BULK_MAX_LOCATIONS,
+    MAX_CONCURRENT_FETCHES,
+    fetch_forecast_bulk,
+    fetch_flood_bulk,
+    clear_response_cache,
+)
 
 
 class DamService:
@@ -51,19 +59,32 @@ class DamService:
             "dams": VIETNAM_DAMS[basin_upper]
         }
 
-    def _get_dam_real_weather_data(self, dam: dict) -> dict:
-        """Get real weather data from Open-Meteo for dam location"""
-        lat = dam["coordinates"]["lat"]
-        lon = dam["coordinates"]["lon"]
+    def _get_dams_real_weather_data(self, dams: List[dict]) -> List[dict]:
+        """
+        Get real weather data from Open-Meteo for many dam locations at once.
 
-        forecast = fetch_forecast_full(lat, lon, days=7)
-        flood = fetch_flood_forecast(lat, lon)
+        Coordinates go out in multi-location lots, with the forecast and flood
+        lots fetched concurrently, instead of two blocking requests per dam.
+        Results are in the same order as `dams`.
+        """
+        coords = [(dam["coordinates"]["lat"], dam["coordinates"]["lon"]) for dam in dams]
+        lots = [coords[i:i + BULK_MAX_LOCATIONS] for i in range(0, len(coords), BULK_MAX_LOCATIONS)]
 
-        return {
-            "forecast": forecast,
-            "flood": flood,
-            "source": "Open-Meteo API + GloFAS (Real Data)"
-        }
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_FETCHES) as executor:
+            # Dam scan only reads daily precipitation - skip the hourly block
+            forecast_jobs = [executor.submit(fetch_forecast_bulk, lot, 7, False) for lot in lots]
+            flood_jobs = [executor.submit(fetch_flood_bulk, lot) for lot in lots]
+            forecasts = chain.from_iterable(job.result() for job in forecast_jobs)
+            floods = chain.from_iterable(job.result() for job in flood_jobs)
+
+            return [
+                {
+                    "forecast": forecast,
+                    "flood": flood,
+                    "source": "Open-Meteo API + GloFAS (Real Data)"
+                }
+                for forecast, flood in zip(forecasts, floods)
+            ]
 
     def _get_discharge_recommendations(self, level: str, dam: dict, discharge: float) -> list:
         """Generate recommendations based on discharge level"""
@@ -96,12 +117,16 @@ class DamService:
         """Generate dam alerts from real Open-Meteo + GloFAS data"""
         alerts = []
 
+        # Fetch every dam's data up front (batched + concurrent), then scan
+        all_dams = [dam for dams in VIETNAM_DAMS.values() for dam in dams]
+        real_data_iter = iter(self._get_dams_real_weather_data(all_dams))
+
         for basin_name, dams in VIETNAM_DAMS.items():
             rivers = VIETNAM_RIVERS.get(basin_name, [])
 
             for dam in dams:
+                real_data = next(real_data_iter)
                 try:
-                    real_data = self._get_dam_real_weather_data(dam)
                     forecast = real_data.get("forecast", {})
                     flood = real_data.get("flood", {})
 
@@ -298,6 +323,7 @@ class DamService:
 
     def invalidate_cache(self):
         """Force cache refresh on next request"""
+        clear_response_cache()
         self.alerts_cache_repo.invalidate_key("dam")
         print("✓ Invalidated dam alerts cache (DB)")
 
@@ -19,7 +19,7 @@ from p import (
     BASIN_WEIGHTS,
     FLOOD_THRESHOLDS,
     fetch_weather_data,
-    calculate_basin_rainfall,
+    calculate_basin_rainfall_series,
     analyze_basin_forecast
 )
 from repositories.forecast_cache_repository import ForecastCacheRepository
@@ -84,14 +84,7 @@ class ForecastService:
         # Analyze each basin
         all_analysis = {}
         for basin, weights in BASIN_WEIGHTS.items():
-            basin_rainfall = []
-            for idx in range(len(dates_ref)):
-                day_points = {
-                    st: {"precipitation_sum": station_data.get(st, [0] * len(dates_ref))[idx]}
-                    for st in weights.keys()
-                }
-                basin_rain = calculate_basin_rainfall(day_points, weights)
-                basin_rainfall.append(basin_rain)
+            basin_rainfall = calculate_basin_rainfall_series(station_data, weights, len(dates_ref))
 
             thresholds = FLOOD_THRESHOLDS.get(basin, FLOOD_THRESHOLDS["CENTRAL"])
             analysis = analyze_basin_forecast(basin, basin_rainfall, dates_ref, thresholds)
@@ -2,12 +2,18 @@
 """
 Location Service - Business logic for rivers, flood zones, locations
 """
+from operator import itemgetter
 from typing import Dict, List, Optional
 
-from data import VIETNAM_RIVERS
+from data import VIETNAM_RIVERS, normalize_basin
 from weather_api import VIETNAM_LOCATIONS
 
 
+# Flood zone sort order (most severe first); unknown risks sort last
+RISK_ORDER = {"Rất cao": 0, "Cao": 1, "Trung bình": 2, "Thấp": 3}
+_first = itemgetter(0)
+
+
 class LocationService:
     """Service for location-related data (rivers, flood zones, provinces)"""
 
@@ -28,7 +34,7 @@ class LocationService:
 
     def get_rivers_by_basin(self, basin: str) -> Optional[Dict]:
         """Get rivers for a specific basin"""
-        basin_upper = basin.upper()
+        basin_upper = normalize_basin(basin)
         if basin_upper not in VIETNAM_RIVERS:
             return None
 
@@ -40,7 +46,7 @@ class LocationService:
 
     def get_all_flood_zones(self) -> Dict:
         """Get all potential flood zones"""
-        all_zones = []
+        ranked = []
         for basin, rivers in VIETNAM_RIVERS.items():
             for river in rivers:
                 for zone in river.get("flood_prone_areas", []):
@@ -52,11 +58,11 @@ class LocationService:
                         "risk": zone["risk"],
                         "alert_levels": river.get("alert_levels", {})
                     }
-                    all_zones.append(zone_info)
+                    ranked.append((RISK_ORDER.get(zone["risk"], 4), zone_info))
 
-        # Sort by risk level
-        risk_order = {"Rất cao": 0, "Cao": 1, "Trung bình": 2, "Thấp": 3}
-        all_zones.sort(key=lambda x: risk_order.get(x["risk"], 4))
+        # Sort by risk level (rank computed once per zone, C-level key)
+        ranked.sort(key=_first)
+        all_zones = [zone_info for _, zone_info in ranked]
 
         return {
             "total": len(all_zones),
@@ -71,11 +77,11 @@ class LocationService:
 
     def get_flood_zones_by_basin(self, basin: str) -> Optional[Dict]:
         """Get flood zones for a specific basin"""
-        basin_upper = basin.upper()
+        basin_upper = normalize_basin(basin)
         if basin_upper not in VIETNAM_RIVERS:
             return None
 
-        zones = []
+        ranked = []
         for river in VIETNAM_RIVERS[basin_upper]:
             for zone in river.get("flood_prone_areas", []):
                 zone_info = {
@@ -86,10 +92,10 @@ class LocationService:
                     "risk": zone["risk"],
                     "alert_levels": river.get("alert_levels", {})
                 }
-                zones.append(zone_info)
+                ranked.append((RISK_ORDER.get(zone["risk"], 4), zone_info))
 
-        risk_order = {"Rất cao": 0, "Cao": 1, "Trung bình": 2, "Thấp": 3}
-        zones.sort(key=lambda x: risk_order.get(x["risk"], 4))
+        ranked.sort(key=_first)
+        zones = [zone_info for _, zone_info in ranked]
 
         return {
             "basin": basin_upper,
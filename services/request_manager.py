@@ -7,8 +7,9 @@ Features:
 2. Queue info: Track what's running and waiting
 3. Simple locking mechanism for heavy external API calls
 """
+import itertools
 import threading
-import time
+from collections import OrderedDict
 from typing import Optional
 from datetime import datetime
 
@@ -139,9 +140,11 @@ class RequestManager:
         self._initialized = True
         self._semaphore = threading.Semaphore(1)  # Only 1 heavy task at a time
         self._requests: Dict[str, dict] = {}  # request_id -> request info
+        # Finished requests in completion order, so cleanup can stop at the first young one
+        self._completed_order: "OrderedDict[str, datetime]" = OrderedDict()
         self._current_request: Optional[str] = None
         self._request_lock = threading.Lock()
-        self._request_counter = 0
+        self._request_counter = itertools.count(1)  # next() is atomic, no lock needed
 
         # Category locks - for cancelling same-category requests
         self._category_current: Dict[str, str] = {}  # category -> current request_id
@@ -169,9 +172,7 @@ class RequestManager:
         Returns:
             request_id: Unique identifier for this request
         """
-        with self._request_lock:
-            self._request_counter += 1
-            request_id = f"req_{self._request_counter}_{int(time.time())}"
+        request_id = f"req_{next(self._request_counter)}"
 
         request_info = {
             "id": request_id,
@@ -230,6 +231,7 @@ class RequestManager:
         # Check if already cancelled
         if request["cancelled"].is_set():
             request["status"] = RequestStatus.CANCELLED
+            self._mark_completed(request_id, request)
             print(f"[RequestManager] {request_id} cancelled before start")
             return
 
@@ -240,6 +242,7 @@ class RequestManager:
         if not acquired:
             request["status"] = RequestStatus.FAILED
             request["error"] = "Timeout waiting for semaphore"
+            self._mark_completed(request_id, request)
             print(f"[RequestManager] {request_id} timeout waiting for semaphore")
             return
 
@@ -247,6 +250,7 @@ class RequestManager:
         if request["cancelled"].is_set():
             self._semaphore.release()
             request["status"] = RequestStatus.CANCELLED
+            self._mark_completed(request_id, request)
             print(f"[RequestManager] {request_id} cancelled while waiting")
             return
 
@@ -275,11 +279,18 @@ class RequestManager:
             print(f"[RequestManager] {request_id} FAILED: {e}")
 
         finally:
-            request["completed_at"] = datetime.now()
+            self._mark_completed(request_id, request)
             self._current_request = None
             self._semaphore.release()
             print(f"[RequestManager] {request_id} released semaphore")
 
+    def _mark_completed(self, request_id: str, request: dict):
+        """Stamp completed_at and append the request to the completion order"""
+        completed_at = datetime.now()
+        request["completed_at"] = completed_at
+        with self._request_lock:
+            self._completed_order[request_id] = completed_at
+
     def _cancel_request(self, request_id: str):
         """Mark a request as cancelled"""
         request = self._requests.get(request_id)
@@ -355,20 +366,20 @@ class RequestManager:
     def cleanup_old_requests(self, max_age_seconds: int = 3600):
         """Remove old completed/cancelled/failed requests"""
         now = datetime.now()
-        to_remove = []
+        removed = 0
 
-        for request_id, request in self._requests.items():
-            if request["status"] in [RequestStatus.COMPLETED, RequestStatus.CANCELLED, RequestStatus.FAILED]:
-                if request["completed_at"]:
-                    age = (now - request["completed_at"]).total_seconds()
-                    if age > max_age_seconds:
-                        to_remove.append(request_id)
-
-        for request_id in to_remove:
-            del self._requests[request_id]
-
-        if to_remove:
-            print(f"[RequestManager] Cleaned up {len(to_remove)} old requests")
+        with self._request_lock:
+            # Oldest completions come first - stop at the first one still within max age
+            while self._completed_order:
+                request_id, completed_at = next(iter(self._completed_order.items()))
+                if (now - completed_at).total_seconds() <= max_age_seconds:
+                    break
+                self._completed_order.popitem(last=False)
+                self._requests.pop(request_id, None)
+                removed += 1
+
+        if removed:
+            print(f"[RequestManager] Cleaned up {removed} old requests")
 
 
 # Singleton instance
@@ -4,7 +4,7 @@ Station Service - Business logic for monitoring stations
 """
 from typing import Dict, List, Optional
 
-from data import MAJOR_STATIONS, BASIN_NAMES, BASIN_ID_MAP
+from data import MAJOR_STATIONS, BASIN_NAMES, BASIN_ID_MAP, normalize_basin
 from services.forecast_service import ForecastService
 
 
@@ -55,14 +55,14 @@ class StationService:
 
     def get_stations_by_basin(self, basin: str) -> Dict:
         """Get stations for a specific basin"""
-        basin_upper = basin.upper()
+        basin_upper = normalize_basin(basin)
         if basin_upper not in MAJOR_STATIONS:
             return None
 
         all_data = self.forecast_service.get_all_forecasts()
         basins = all_data.get("basins", {})
 
-        basin_risk_levels = self._calculate_basin_risk_levels(basins)
+        basin_risk_levels = self._calculate_basin_risk_levels(basins, only=basin_upper)
         basin_risk = basin_risk_levels.get(basin_upper, "safe")
         basin_forecast = basins.get(basin_upper, {})
         current_rain = 0
@@ -92,11 +92,16 @@ class StationService:
             "generated_at": all_data.get("generated_at", "")
         }
 
-    def _calculate_basin_risk_levels(self, basins: Dict) -> Dict[str, str]:
-        """Calculate risk level for each basin based on forecast"""
+    def _calculate_basin_risk_levels(self, basins: Dict, only: Optional[str] = None) -> Dict[str, str]:
+        """Calculate risk level for each basin based on forecast (or just `only` if given)"""
         basin_risk_levels = {}
 
-        for basin_code, basin_data in basins.items():
+        if only is not None:
+            items = ((only, basins[only]),) if only in basins else ()
+        else:
+            items = basins.items()
+
+        for basin_code, basin_data in items:
             has_danger = False
             has_warning = False
             has_watch = False
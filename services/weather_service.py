@@ -2,12 +2,9 @@
 """
 Weather Service - Business logic for weather data
 """
+import time
 from datetime import datetime
 from typing import Dict, List, Any, Optional
-import sys
-import os
-
-sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from weather_api import (
     VIETNAM_LOCATIONS,
@@ -23,21 +20,42 @@ from weather_api import (
 from repositories.weather_repository import WeatherRepository
 
 
+# Fallback location list is static - build it once instead of per request
+_FALLBACK_LOCATIONS: List[Dict[str, Any]] = [
+    {
+        "code": code,
+        "name": data.get("name", code),
+        "latitude": data["lat"],
+        "longitude": data["lon"],
+        "region": data.get("region"),
+        "province": data.get("province")
+    }
+    for code, data in VIETNAM_LOCATIONS.items()
+]
+_FALLBACK_BY_REGION: Dict[str, List[Dict[str, Any]]] = {}
+for _loc in _FALLBACK_LOCATIONS:
+    _FALLBACK_BY_REGION.setdefault(_loc["region"], []).append(_loc)
+del _loc
+
+
 class WeatherService:
     """Service for weather operations"""
 
     def __init__(self):
         self.repo = WeatherRepository()
-        self._cache = {}
-        self._cache_time = {}
+        self._cache: Dict[str, tuple] = {}  # key -> (value, expires_at monotonic)
         self._cache_ttl = 86400  # 24 hours
 
-    def _is_cache_valid(self, key: str) -> bool:
-        """Check if cache entry is valid"""
-        if key not in self._cache or key not in self._cache_time:
-            return False
-        elapsed = (datetime.now() - self._cache_time[key]).total_seconds()
-        return elapsed < self._cache_ttl
+    def _get_cached(self, key: str) -> Optional[Any]:
+        """Return cached value if present and not expired, else None"""
+        entry = self._cache.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+        return None
+
+    def _set_cached(self, key: str, value: Any):
+        """Store value in cache with TTL"""
+        self._cache[key] = (value, time.monotonic() + self._cache_ttl)
 
     def get_realtime_weather(self) -> Dict[str, Any]:
         """
@@ -47,13 +65,13 @@ class WeatherService:
             Weather data for all regions
         """
         cache_key = "realtime_all"
-        if self._is_cache_valid(cache_key):
-            return self._cache[cache_key]
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
 
         result = get_all_vietnam_weather()
 
-        self._cache[cache_key] = result
-        self._cache_time[cache_key] = datetime.now()
+        self._set_cached(cache_key, result)
 
         return result
 
@@ -73,8 +91,9 @@ class WeatherService:
             Forecast data
         """
         cache_key = f"forecast_{location}_{days}"
-        if self._is_cache_valid(cache_key):
-            return self._cache[cache_key]
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
 
         # Find location coordinates
         loc_data = VIETNAM_LOCATIONS.get(location)
@@ -94,8 +113,7 @@ class WeatherService:
             "generated_at": datetime.now().isoformat()
         }
 
-        self._cache[cache_key] = result
-        self._cache_time[cache_key] = datetime.now()
+        self._set_cached(cache_key, result)
 
         return result
 
@@ -140,20 +158,10 @@ class WeatherService:
         if db_locations:
             return [dict(loc) for loc in db_locations]
 
-        # Fall back to VIETNAM_LOCATIONS
-        locations = []
-        for code, data in VIETNAM_LOCATIONS.items():
-            if region and data.get("region") != region:
-                continue
-            locations.append({
-                "code": code,
-                "name": data.get("name", code),
-                "latitude": data["lat"],
-                "longitude": data["lon"],
-                "region": data.get("region"),
-                "province": data.get("province")
-            })
-        return locations
+        # Fall back to precomputed VIETNAM_LOCATIONS list
+        if region:
+            return list(_FALLBACK_BY_REGION.get(region, ()))
+        return list(_FALLBACK_LOCATIONS)
 
     def analyze_for_alerts(self) -> List[Dict[str, Any]]:
         """
@@ -8,904 +8,807 @@ Dữ liệu từ các nguồn chính thống:
 - USGS, NASA Earth Data
 """
 
-from typing import Dict, List, Tuple
+import json
+import threading
+import time
+import numpy as np
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 
+# orjson (tùy chọn) - nhanh hơn json chuẩn khi tuần tự hóa
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+import basins
+from basins._frozen import freeze
+
+
 # ============================================================================
-# PHẦN 1: LƯU VỰC SÔNG HỒNG - THÁI BÌNH
+# PHẦN 1: NGƯỠNG CẢNH BÁO CHUẨN
 # ============================================================================
 
-HONG_RIVER_BASIN = {
-    "overview": {
-        "total_area_km2": 169000,  # Toàn bộ lưu vực (bao gồm TQ)
-        "vn_area_km2": 87800,
-        "annual_rainfall_mm": 1800,
-        "population": 22000000,
-        "main_tributaries": ["Sông Hồng", "Sông Đà", "Sông Lô", "Sông Thao"],
-    },
-
-    # Các đập thủy điện Việt Nam (Sông Đà)
-    "dams": {
-        "son_la": {
-            "river": "Đà",
-            "capacity_million_m3": 9260,
-            "normal_level_m": 215.0,
-            "flood_level_m": 217.8,
-            "dead_level_m": 175.0,
-            "max_discharge_m3_s": 35420,
-            "turbine_capacity_m3_s": 2400,
-            "power_mw": 2400,
-            "commissioned_year": 2012,
-            "coordinates": (21.3261, 103.9008),
-            "catchment_area_km2": 61300,
-        },
-        "hoa_binh": {
-            "river": "Đà",
-            "capacity_million_m3": 9450,
-            "normal_level_m": 117.0,
-            "flood_level_m": 120.0,
-            "dead_level_m": 80.0,
-            "max_discharge_m3_s": 22700,
-            "turbine_capacity_m3_s": 2400,
-            "power_mw": 1920,
-            "commissioned_year": 1994,
-            "coordinates": (20.8167, 105.3167),
-            "catchment_area_km2": 75500,
-        },
-        "lai_chau": {
-            "river": "Đà",
-            "capacity_million_m3": 1224,
-            "normal_level_m": 295.0,
-            "flood_level_m": 297.5,
-            "dead_level_m": 265.0,
-            "max_discharge_m3_s": 15300,
-            "turbine_capacity_m3_s": 1200,
-            "power_mw": 1200,
-            "commissioned_year": 2016,
-            "coordinates": (22.3864, 103.4701),
-            "catchment_area_km2": 20000,
-        },
-        "ban_chat": {
-            "river": "Đà",
-            "capacity_million_m3": 2142,
-            "normal_level_m": 475.0,
-            "flood_level_m": 477.3,
-            "dead_level_m": 445.0,
-            "max_discharge_m3_s": 9520,
-            "turbine_capacity_m3_s": 800,
-            "power_mw": 220,
-            "commissioned_year": 2009,
-            "coordinates": (21.8, 103.7),
-            "catchment_area_km2": 8500,
+FLOOD_THRESHOLDS_STANDARD = {
+    "HONG": {
+        "safe": {"daily_rainfall_mm": [0, 50], "accumulated_3d_mm": [0, 150]},
+        "watch": {"daily_rainfall_mm": [50, 100], "accumulated_3d_mm": [150, 250]},
+        "warning": {"daily_rainfall_mm": [100, 150], "accumulated_3d_mm": [250, 400]},
+        "danger": {"daily_rainfall_mm": [150, 999], "accumulated_3d_mm": [400, 999]},
+        "water_level_son_tay": {
+            "normal": 11.0,
+            "alert_1": 11.5,
+            "alert_2": 12.5,
+            "alert_3": 13.5,
+            "design_level": 14.22,
         },
     },
 
-    # Trạm khí tượng thủy văn chính
-    "gauging_stations": {
-        "lao_cai": {
-            "river": "Hồng (Thao)",
-            "coordinates": (22.4856, 103.9707),
-            "alert_level_1_m": 79.0,
-            "alert_level_2_m": 80.0,
-            "alert_level_3_m": 81.0,
-            "historical_max_m": 82.14,
-            "historical_max_year": 1971,
-            "zero_datum_m": 57.0,  # Mốc không
-            "catchment_area_km2": 52600,
-        },
-        "yen_bai": {
-            "river": "Hồng (Thao)",
-            "coordinates": (21.7168, 104.8987),
-            "alert_level_1_m": 29.0,
-            "alert_level_2_m": 30.0,
-            "alert_level_3_m": 31.0,
-            "historical_max_m": 35.0,
-            "historical_max_year": 1971,
-            "zero_datum_m": 13.0,
-            "catchment_area_km2": 61000,
-        },
-        "viet_tri": {
-            "river": "Hồng (Hợp lưu Lô, Đà, Thao)",
-            "coordinates": (21.31, 105.4019),
-            "alert_level_1_m": 15.0,
-            "alert_level_2_m": 16.5,
-            "alert_level_3_m": 17.5,
-            "historical_max_m": 20.79,
-            "historical_max_year": 1971,
-            "zero_datum_m": 2.0,
-            "catchment_area_km2": 87800,
-            "importance": "KEY_STATION",  # Trạm khóa - hợp lưu 3 sông
-        },
-        "son_tay": {
-            "river": "Hồng",
-            "coordinates": (21.1333, 105.5),
-            "alert_level_1_m": 11.5,
-            "alert_level_2_m": 12.5,
-            "alert_level_3_m": 13.5,
-            "historical_max_m": 14.13,
-            "historical_max_year": 1971,
-            "design_flood_level_m": 14.22,  # Mực nước thiết kế (lũ 500 năm)
-            "zero_datum_m": -1.0,
-            "importance": "CRITICAL",  # Quyết định vận hành đê Hà Nội
-        },
-        "hanoi_long_bien": {
-            "river": "Hồng",
-            "coordinates": (21.0285, 105.8542),
-            "alert_level_1_m": 9.5,
-            "alert_level_2_m": 10.5,
-            "alert_level_3_m": 11.5,
-            "historical_max_m": 14.13,
-            "historical_max_year": 1971,
-            "design_flood_level_m": 13.40,
-            "zero_datum_m": -1.77,
-            "importance": "CAPITAL",
+    "MEKONG": {
+        "safe": {"daily_rainfall_mm": [0, 40], "accumulated_3d_mm": [0, 120]},
+        "watch": {"daily_rainfall_mm": [40, 80], "accumulated_3d_mm": [120, 200]},
+        "warning": {"daily_rainfall_mm": [80, 120], "accumulated_3d_mm": [200, 350]},
+        "danger": {"daily_rainfall_mm": [120, 999], "accumulated_3d_mm": [350, 999]},
+        "water_level_tan_chau": {
+            "normal": 3.0,
+            "alert_1": 3.5,
+            "alert_2": 4.0,
+            "alert_3": 4.5,
         },
     },
 
-    # Phân vùng ngập lụt chi tiết
-    "flood_zones": {
-        "zone_1_upper_basin": {
-            "name": "Thượng nguồn (Lào Cai - Yên Bái)",
-            "provinces": ["Lào Cai", "Yên Bái", "Hà Giang phần Tây"],
-            "area_km2": 12500,
-            "population": 1800000,
-            "elevation_range_m": [100, 3143],  # Đến đỉnh Fansipan
-            "flood_types": ["Lũ quét", "Sạt lở đất", "Ngập thung lũng"],
-            "lead_time_hours": {
-                "from_china_border": [0, 12],
-                "flash_flood": [2, 6],
-            },
-            "flood_depth_return_periods": {
-                "2_year": 0.5,
-                "5_year": 1.0,
-                "10_year": 1.5,
-                "20_year": 2.0,
-                "50_year": 2.8,
-                "100_year": 3.5,
-            },
-            "critical_infrastructure": [
-                "QL 70 (Yên Bái - Lào Cai)",
-                "Đường sắt Hà Nội - Lào Cai",
-                "Sa Pa tourism area",
-                "Thủy điện Lai Châu, Bản Chát",
-            ],
+    "CENTRAL": {
+        "safe": {"daily_rainfall_mm": [0, 80], "accumulated_3d_mm": [0, 200]},
+        "watch": {"daily_rainfall_mm": [80, 120], "accumulated_3d_mm": [200, 300]},
+        "warning": {"daily_rainfall_mm": [120, 200], "accumulated_3d_mm": [300, 500]},
+        "danger": {"daily_rainfall_mm": [200, 999], "accumulated_3d_mm": [500, 999]},
+        "flash_flood_criteria": {
+            "rainfall_intensity_mm_h": 30,  # >30mm/h = nguy cơ lũ quét
+            "duration_hours": 3,
         },
+    },
+}
 
-        "zone_2_midstream": {
-            "name": "Trung lưu (Việt Trì - Vĩnh Phúc)",
-            "provinces": ["Phú Thọ", "Vĩnh Phúc", "Tuyên Quang"],
-            "area_km2": 15000,
-            "population": 2500000,
-            "elevation_range_m": [5, 200],
-            "flood_types": ["Lũ sông chính", "Ngập vùng trũng"],
-            "lead_time_hours": {
-                "from_china_border": [24, 48],
-                "from_yen_bai": [12, 18],
-            },
-            "flood_depth_return_periods": {
-                "2_year": 0.3,
-                "5_year": 0.8,
-                "10_year": 1.2,
-                "20_year": 1.5,
-                "50_year": 2.0,
-                "100_year": 2.5,
-            },
-            "critical_infrastructure": [
-                "TP Việt Trì",
-                "Khu công nghiệp Phú Thọ",
-                "Cầu Việt Trì",
-                "Cảng Việt Trì",
-            ],
-        },
+# Chỉ đọc: dict -> MappingProxyType, list -> tuple (dùng chung pool với basins)
+FLOOD_THRESHOLDS_STANDARD = freeze(FLOOD_THRESHOLDS_STANDARD)
 
-        "zone_3_hanoi": {
-            "name": "Hà Nội",
-            "area_km2": 3360,
-            "population_total": 8000000,
-            "population_at_flood_risk": 3500000,
-            "elevation_range_m": [2, 20],
-            "districts_high_risk": [
-                "Ba Vì", "Sơn Tây", "Phúc Thọ", "Đan Phượng",
-                "Hoài Đức", "Thanh Trì", "Gia Lâm", "Đông Anh",
-                "Long Biên", "Hoàng Mai", "Tây Hồ", "Hà Đông",
-            ],
-            "flood_types": ["Ngập lụt nội đô", "Vỡ đê", "Úng ngập"],
-            "lead_time_hours": {
-                "from_son_tay": [6, 12],
-                "from_viet_tri": [18, 24],
-                "from_china_border": [48, 72],
-            },
-            "flood_depth_return_periods": {
-                "2_year": 0.2,
-                "5_year": 0.5,
-                "10_year": 0.8,
-                "20_year": 1.0,
-                "50_year": 1.5,
-                "100_year": 2.0,
-                "dike_breach_scenario": 4.0,
-            },
-            "dike_system": {
-                "huu_hong_right_bank": {
-                    "length_km": 143,
-                    "grade": "SPECIAL",  # Cấp đặc biệt
-                    "design_flood_return_period": 500,
-                    "design_level_m": 14.22,
-                },
-                "ta_hong_left_bank": {
-                    "length_km": 128,
-                    "grade": "SPECIAL",
-                    "design_flood_return_period": 500,
-                    "design_level_m": 14.22,
-                },
-            },
-            "flood_diversion_areas": [
-                {"name": "Vân Cốc", "capacity_million_m3": 40},
-                {"name": "Tam Thanh", "capacity_million_m3": 35},
-                {"name": "Lương Phú", "capacity_million_m3": 30},
-            ],
-            "pumping_stations": [
-                {"name": "Yên Sở", "capacity_m3_s": 150},
-                {"name": "Yên Xá", "capacity_m3_s": 120},
-                {"name": "Thanh Liệt", "capacity_m3_s": 100},
-            ],
-        },
+# Bảng ngưỡng dạng cột, dựng từ dict ở trên (dict vẫn là nguồn chuẩn nên hai
+# bên không thể lệch nhau): [lưu vực, cấp, (daily_lo, daily_hi, accum_lo, accum_hi)]
+THRESHOLD_LEVELS = ("safe", "watch", "warning", "danger")
+THRESHOLD_BASIN_INDEX = {basin: i for i, basin in enumerate(FLOOD_THRESHOLDS_STANDARD)}
 
-        "zone_4_delta": {
-            "name": "Đồng bằng sông Hồng",
-            "provinces": [
-                "Hưng Yên", "Hà Nam", "Nam Định", "Thái Bình",
-                "Hải Dương", "Hải Phòng", "Ninh Bình", "Quảng Ninh phần Tây",
-            ],
-            "area_km2": 10500,
-            "population": 8500000,
-            "elevation_avg_m": 1.5,  # Rất thấp!
-            "elevation_range_m": [0, 10],
-            "flood_types": [
-                "Ngập diện rộng",
-                "Xâm nhập mặn",
-                "Thiệt hại nông nghiệp",
-                "Kết hợp lũ + triều",
-            ],
-            "lead_time_hours": {
-                "from_hanoi": [24, 48],
-                "from_china_border": [72, 120],
-            },
-            "agricultural_area_km2": 7500,
-            "rice_area_km2": 5000,
-            "aquaculture_area_km2": 1200,
-        },
-    },
 
-    # Thời gian truyền lũ
-    "flood_routing_time": {
-        "china_border_to_yen_bai": {"distance_km": 150, "time_hours": [18, 24]},
-        "yen_bai_to_viet_tri": {"distance_km": 120, "time_hours": [15, 20]},
-        "viet_tri_to_son_tay": {"distance_km": 50, "time_hours": [8, 12]},
-        "son_tay_to_hanoi": {"distance_km": 40, "time_hours": [6, 10]},
-        "hanoi_to_sea": {"distance_km": 120, "time_hours": [18, 24]},
-        "total_china_to_hanoi": {"distance_km": 360, "time_hours": [47, 66]},
-    },
+@lru_cache(maxsize=None)
+def _threshold_table() -> np.ndarray:
+    return np.array(
+        [
+            [
+                levels[level]["daily_rainfall_mm"] + levels[level]["accumulated_3d_mm"]
+                for level in THRESHOLD_LEVELS
+            ]
+            for levels in FLOOD_THRESHOLDS_STANDARD.values()
+        ],
+        dtype=np.float32,
+    )
+
+
+def classify_rainfall(basin: str, daily_mm: Any, accum3d_mm: Any = None) -> np.ndarray:
+    """
+    Cấp cảnh báo (0=safe .. 3=danger) cho cả mảng lượng mưa ngày (mm),
+    tùy chọn kết hợp mưa tích lũy 3 ngày (lấy cấp cao hơn).
+    Dùng np.searchsorted trên các cận dưới thay vì chuỗi if/elif từng mẫu.
+    """
+    table = _threshold_table()[THRESHOLD_BASIN_INDEX[basin]]
+    # Cận dưới của watch/warning/danger; side='right' để đúng ngưỡng là lên cấp
+    level = np.searchsorted(table[1:, 0], np.asarray(daily_mm, dtype=np.float32), side="right")
+    if accum3d_mm is not None:
+        accum = np.searchsorted(table[1:, 2], np.asarray(accum3d_mm, dtype=np.float32), side="right")
+        level = np.maximum(level, accum)
+    return level.astype(np.int8)
+
+
+def classify_levels(basin_idx: Any, daily_mm: Any, accum3d_mm: Any) -> np.ndarray:
+    """
+    Cấp cảnh báo (int8, 0-3) cho từng hàng của một lô trộn nhiều lưu vực.
+    basin_idx theo THRESHOLD_BASIN_INDEX; ngưỡng mỗi hàng lấy bằng fancy
+    indexing rồi cộng ba phép so sánh không rẽ nhánh.
+    """
+    cuts = _threshold_table()[np.asarray(basin_idx, dtype=np.intp), 1:]  # (N, 3, 4)
+    daily = np.asarray(daily_mm, dtype=np.float32)[:, None]
+    accum = np.asarray(accum3d_mm, dtype=np.float32)[:, None]
+    daily_level = (daily >= cuts[:, :, 0]).sum(axis=1, dtype=np.int8)
+    accum_level = (accum >= cuts[:, :, 2]).sum(axis=1, dtype=np.int8)
+    return np.maximum(daily_level, accum_level)
+
+
+# Cận dưới watch/warning/danger theo lưu vực, cho đường đi từng mẫu (số Python
+# thuần - gọi NumPy cho một giá trị đơn lẻ còn chậm hơn so sánh trực tiếp)
+_DAILY_CUTS = {
+    basin: tuple(levels[level]["daily_rainfall_mm"][0] for level in THRESHOLD_LEVELS[1:])
+    for basin, levels in FLOOD_THRESHOLDS_STANDARD.items()
+}
+_ACCUM_CUTS = {
+    basin: tuple(levels[level]["accumulated_3d_mm"][0] for level in THRESHOLD_LEVELS[1:])
+    for basin, levels in FLOOD_THRESHOLDS_STANDARD.items()
 }
 
 
-# ============================================================================
-# PHẦN 2: LƯU VỰC SÔNG MEKONG (CỬU LONG)
-# ============================================================================
+def rainfall_level(basin: str, daily_mm: float, accum3d_mm: Optional[float] = None) -> int:
+    """Cấp cảnh báo (0-3) cho một mẫu: cộng ba phép so sánh, không có chuỗi if/elif"""
+    c0, c1, c2 = _DAILY_CUTS[basin]
+    level = (daily_mm >= c0) + (daily_mm >= c1) + (daily_mm >= c2)
+    if accum3d_mm is not None:
+        a0, a1, a2 = _ACCUM_CUTS[basin]
+        level = max(level, (accum3d_mm >= a0) + (accum3d_mm >= a1) + (accum3d_mm >= a2))
+    return int(level)
 
-MEKONG_RIVER_BASIN = {
-    "overview": {
-        "total_length_km": 4909,  # Sông dài thứ 12 thế giới
-        "total_area_km2": 795000,
-        "vn_delta_area_km2": 39000,
-        "annual_rainfall_mm": 1600,
-        "population": 17500000,
-        "average_discharge_m3_s": 15000,
-    },
 
-    # Cascade đập Trung Quốc (Sông Lan Thương - Lancang)
-    "china_dams_cascade": {
-        "nuozhadu": {
-            "capacity_million_m3": 21700,
-            "power_mw": 5850,
-            "commissioned": 2014,
-            "height_m": 261.5,
-            "coordinates": (22.65, 100.43),
-        },
-        "xiaowan": {
-            "capacity_million_m3": 15000,
-            "power_mw": 4200,
-            "commissioned": 2010,
-            "height_m": 292,
-            "coordinates": (24.69, 100.08),
-        },
-        "manwan": {
-            "capacity_million_m3": 920,
-            "power_mw": 1500,
-            "commissioned": 1996,
-            "coordinates": (24.98, 100.23),
-        },
-        "dachaoshan": {
-            "capacity_million_m3": 940,
-            "power_mw": 1350,
-            "commissioned": 2003,
-            "coordinates": (24.55, 100.27),
-        },
-        "jinghong": {
-            "capacity_million_m3": 1240,
-            "power_mw": 1750,
-            "commissioned": 2009,
-            "coordinates": (21.97, 100.80),
-        },
-        "gongguoqiao": {
-            "capacity_million_m3": 570,
-            "power_mw": 750,
-            "commissioned": 2011,
-            "coordinates": (23.55, 100.68),
-        },
-        "total_cascade": {
-            "total_capacity_million_m3": 44000,  # Khổng lồ!
-            "total_power_mw": 22000,
-            "number_of_dams": 11,
-            "impact_on_downstream": "Kiểm soát ~70% dòng chảy mùa khô",
-        },
-    },
+_BASIN_BY_INDEX = tuple(THRESHOLD_BASIN_INDEX)
 
-    # Trạm quan trắc Mekong
-    "gauging_stations": {
-        "chiang_saen_thailand": {
-            "river": "Mekong",
-            "country": "Thailand",
-            "coordinates": (20.2667, 100.0833),
-            "distance_from_source_km": 1750,
-            "catchment_area_km2": 189000,
-            "data_source": "MRC (Mekong River Commission)",
-            "average_discharge_m3_s": 2300,
-        },
-        "vientiane_laos": {
-            "river": "Mekong",
-            "country": "Laos",
-            "coordinates": (17.9757, 102.6331),
-            "distance_from_source_km": 2250,
-            "catchment_area_km2": 299000,
-            "average_discharge_m3_s": 3900,
-        },
-        "pakse_laos": {
-            "river": "Mekong",
-            "country": "Laos",
-            "coordinates": (15.12, 105.78),
-            "distance_from_source_km": 3320,
-            "catchment_area_km2": 545000,
-            "average_discharge_m3_s": 8500,
-        },
-        "stung_treng_cambodia": {
-            "river": "Mekong",
-            "country": "Cambodia",
-            "coordinates": (13.5167, 106.0167),
-            "distance_from_source_km": 3620,
-            "catchment_area_km2": 635000,
-            "average_discharge_m3_s": 11000,
-        },
-        "kratie_cambodia": {
-            "river": "Mekong",
-            "country": "Cambodia",
-            "coordinates": (12.48, 106.02),
-            "distance_from_source_km": 3750,
-            "catchment_area_km2": 646000,
-            "average_discharge_m3_s": 12500,
-            "importance": "KEY_STATION",  # Trạm dự báo chính cho VN
-        },
-        "tan_chau_vietnam": {
-            "river": "Tiền Giang",
-            "country": "Vietnam",
-            "coordinates": (10.8, 105.2333),
-            "alert_level_1_m": 3.5,
-            "alert_level_2_m": 4.0,
-            "alert_level_3_m": 4.5,
-            "historical_max_m": 5.2,
-            "historical_max_year": 2000,
-            "average_discharge_m3_s": 11500,
-            "max_discharge_m3_s": 26400,
-        },
-        "chau_doc_vietnam": {
-            "river": "Hậu Giang",
-            "country": "Vietnam",
-            "coordinates": (10.7, 105.1167),
-            "alert_level_1_m": 3.0,
-            "alert_level_2_m": 3.5,
-            "alert_level_3_m": 4.0,
-            "historical_max_m": 4.8,
-            "historical_max_year": 2000,
-            "average_discharge_m3_s": 3200,
-            "max_discharge_m3_s": 8500,
-        },
-        "can_tho_vietnam": {
-            "river": "Hậu Giang",
-            "country": "Vietnam",
-            "coordinates": (10.0452, 105.7469),
-            "alert_level_1_m": 1.8,
-            "alert_level_2_m": 2.0,
-            "alert_level_3_m": 2.2,
-            "historical_max_m": 2.5,
-            "historical_max_year": 2000,
-            "average_discharge_m3_s": 8500,
-            "tidal_influence": True,
-        },
-    },
 
-    # Phân vùng lũ Đồng bằng sông Cửu Long
-    "flood_zones": {
-        "zone_a_upper_delta": {
-            "name": "Đầu nguồn đồng bằng",
-            "provinces": ["An Giang", "Đồng Tháp"],
-            "area_km2": 7500,
-            "population": 3800000,
-            "entry_points": ["Tân Châu", "Châu Đốc"],
-            "characteristics": [
-                "Nhận nước lũ đầu tiên",
-                "Vùng trữ lũ tự nhiên - Đồng Tháp Mười",
-                "Ruộng lúa nổi truyền thống",
-            ],
-            "lead_time_hours": {
-                "from_kratie": [72, 96],
-                "from_phnom_penh": [24, 48],
-            },
-            "flood_depth_return_periods": {
-                "annual_flood": 2.0,  # Lũ hàng năm
-                "2_year": 2.5,
-                "5_year": 3.5,
-                "10_year": 4.0,
-                "20_year": 4.5,
-                "2000_extreme": 5.0,  # Đại hồng thủy 2000
-            },
-            "dike_system": {
-                "high_dikes_km2": 1400,  # Đê bao cao - 3 vụ lúa
-                "semi_dikes_km2": 3200,  # Đê bao lửng - lúa nổi
-                "open_fields_km2": 2900,  # Không đê - ngập tự nhiên
-            },
-            "economic_value": {
-                "rice_production_tons_year": 4500000,
-                "aquaculture_tons_year": 380000,
-            },
-        },
+def classify_flood_level(basin: Any, daily_mm: float, accum3d_mm: float) -> int:
+    """
+    Điểm vào mặc định cho phân loại từng mẫu (luồng dữ liệu mưa liên tục).
+    basin là tên ("HONG") hoặc chỉ số theo THRESHOLD_BASIN_INDEX.
+    """
+    if not isinstance(basin, str):
+        basin = _BASIN_BY_INDEX[basin]
+    return rainfall_level(basin, daily_mm, accum3d_mm)
 
-        "zone_b_central_delta": {
-            "name": "Trung tâm đồng bằng",
-            "provinces": ["Cần Thơ", "Vĩnh Long", "Tiền Giang", "Long An"],
-            "area_km2": 8500,
-            "population": 5500000,
-            "characteristics": [
-                "Giao thoa lũ và triều",
-                "Vựa lúa chính",
-                "Đô thị hóa cao",
-            ],
-            "lead_time_hours": {
-                "from_tan_chau": [48, 96],
-            },
-            "flood_depth_return_periods": {
-                "annual_flood": 1.0,
-                "2_year": 1.5,
-                "5_year": 2.0,
-                "10_year": 2.5,
-                "20_year": 3.0,
-            },
-            "tidal_range_m": [2.5, 3.8],  # Biên độ triều
-            "saltwater_intrusion_risk": "HIGH",
-            "critical_infrastructure": [
-                "TP Cần Thơ (1.2M người)",
-                "Cầu Cần Thơ, Mỹ Thuận, Rạch Miễu",
-                "Cảng Cần Thơ",
-                "KCN Trà Nóc",
-            ],
-        },
 
-        "zone_c_coastal": {
-            "name": "Vùng ven biển",
-            "provinces": ["Sóc Trăng", "Bạc Liêu", "Cà Mau", "Kiên Giang"],
-            "area_km2": 12000,
-            "population": 4200000,
-            "elevation_avg_m": 0.8,  # Cực thấp!
-            "characteristics": [
-                "Xâm nhập mặn nghiêm trọng",
-                "Nuôi tôm",
-                "Sụt lún đất",
-                "Nước biển dâng",
-            ],
-            "subsidence_rate_mm_year": 25,  # Sụt lún 2.5cm/năm
-            "sea_level_rise_mm_year": 3.3,
-            "saltwater_intrusion_km_inland": {
-                "normal_year": 40,
-                "dry_year": 70,
-                "extreme_drought_2016": 90,
-            },
-            "flood_risk": "Combined: flood + tide + sea level rise",
-            "aquaculture_area_km2": 4200,
-            "mangrove_area_km2": 350,
-        },
+def classify_flood_batch(basin_idx: Any, daily_mm: Any, accum3d_mm: Any, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Như classify_levels nhưng ghi vào `out` (int8) có sẵn nếu được truyền vào"""
+    levels = classify_levels(basin_idx, daily_mm, accum3d_mm)
+    if out is None:
+        return levels
+    out[...] = levels
+    return out
 
-        "zone_d_northeast": {
-            "name": "Đông Bắc (Long An, Tây Ninh)",
-            "provinces": ["Long An", "Tây Ninh", "Bình Dương phần Tây"],
-            "area_km2": 6500,
-            "population": 2800000,
-            "characteristics": [
-                "Vùng chuyển tiếp TP.HCM",
-                "Khu công nghiệp phát triển",
-                "Thoát lũ sang sông Vàm Cỏ",
-            ],
-            "flood_depth_return_periods": {
-                "annual_flood": 1.5,
-                "5_year": 2.5,
-                "20_year": 3.5,
-            },
-        },
-    },
 
-    # Thời gian truyền lũ Mekong
-    "flood_routing_time": {
-        "chiang_saen_to_vientiane": {"distance_km": 600, "time_hours": [72, 96]},
-        "vientiane_to_pakse": {"distance_km": 650, "time_hours": [84, 108]},
-        "pakse_to_stung_treng": {"distance_km": 300, "time_hours": [36, 48]},
-        "stung_treng_to_phnom_penh": {"distance_km": 220, "time_hours": [30, 40]},
-        "phnom_penh_to_tan_chau": {"distance_km": 130, "time_hours": [24, 36]},
-        "total_china_to_vietnam": {"distance_km": 2000, "time_hours": [252, 342]},  # ~10-14 ngày
-    },
-}
+# ============================================================================
+# PHẦN 2: CHỈ MỤC KHÔNG GIAN TRẠM QUAN TRẮC
+# ============================================================================
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine_km(lat1: Any, lon1: Any, lat2: Any, lon2: Any) -> Any:
+    """
+    Khoảng cách đường tròn lớn (km), vector hóa bằng NumPy.
+    Nhận số hoặc mảng (broadcast), vd. một điểm với toàn bộ trạm
+    hoặc cả lưới mưa với một trạm, trong một lần gọi.
+    """
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = np.radians(np.subtract(lon2, lon1))
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def _iter_gauging_stations():
+    """Duyệt (basin, station_key, station) qua tất cả lưu vực"""
+    for key, station in basins.HONG_RIVER_BASIN["gauging_stations"].items():
+        yield "HONG", key, station
+    for key, station in basins.MEKONG_RIVER_BASIN["gauging_stations"].items():
+        yield "MEKONG", key, station
+    for river in basins.CENTRAL_VIETNAM_RIVERS.values():
+        for key, station in river["gauging_stations"].items():
+            yield "CENTRAL", key, station
+
+
+@lru_cache(maxsize=None)
+def _station_index() -> Tuple[Tuple[Tuple[float, float, str, str], ...], List[float]]:
+    """
+    Chỉ mục trạm sắp theo kinh độ: (lon, lat, basin, station_key) và mảng kinh độ.
+    Truy vấn bbox chỉ cần bisect trên kinh độ rồi lọc vĩ độ,
+    thay vì duyệt toàn bộ dict lồng nhau mỗi lần. Dựng ở lần gọi đầu tiên.
+    """
+    entries = [
+        (station["coordinates"][1], station["coordinates"][0], basin, key)
+        for basin, key, station in _iter_gauging_stations()
+    ]
+    entries.sort()
+    return tuple(entries), [entry[0] for entry in entries]
+
+
+def stations_in_bbox(
+    min_lat: float, min_lon: float, max_lat: float, max_lon: float
+) -> List[Tuple[str, str]]:
+    """Các trạm (basin, station_key) nằm trong khung [min, max]"""
+    index, lons = _station_index()
+    lo = bisect_left(lons, min_lon)
+    hi = bisect_right(lons, max_lon)
+    return [
+        (basin, key)
+        for _, lat, basin, key in index[lo:hi]
+        if min_lat <= lat <= max_lat
+    ]
+
+
+def nearest_station(lat: float, lon: float, k: int = 1) -> List[Tuple[str, str, float]]:
+    """k trạm gần nhất: danh sách (basin, station_key, distance_km)"""
+    table = _station_table()
+    dist = haversine_km(lat, lon, table["lat"], table["lon"])
+    order = np.argsort(dist, kind="stable")[:k]
+    return [
+        (str(table["basin"][i]), str(table["station"][i]), round(float(dist[i]), 2))
+        for i in order
+    ]
+
+
+def _iter_dams():
+    """Duyệt (basin, dam_key, dam) qua các đập có tọa độ"""
+    for key, dam in basins.HONG_RIVER_BASIN["dams"].items():
+        yield "HONG", key, dam
+    for key, dam in basins.MEKONG_RIVER_BASIN["china_dams_cascade"].items():
+        if "coordinates" in dam:  # bỏ qua mục tổng hợp "total_cascade"
+            yield "MEKONG", key, dam
+
+
+@lru_cache(maxsize=None)
+def _dam_index() -> Tuple[Tuple[Tuple[str, str], ...], np.ndarray]:
+    """Khóa (basin, dam_key) và mảng tọa độ (N, 2) của các đập"""
+    keys = tuple((basin, key) for basin, key, _ in _iter_dams())
+    coords = np.array([dam["coordinates"] for _, _, dam in _iter_dams()], dtype=np.float64)
+    return keys, coords
+
+
+def nearest_dam(lat: float, lon: float) -> Tuple[str, str, float]:
+    """
+    Đập gần nhất: (basin, dam_key, distance_km).
+    Lọc thô bằng khoảng cách Euclid trên (lat, lon) trong một phép NumPy,
+    chỉ tính haversine chính xác cho ứng viên được chọn.
+    """
+    keys, coords = _dam_index()
+    d2 = ((coords - (lat, lon)) ** 2).sum(axis=1)
+    i = int(d2.argmin())
+    basin, key = keys[i]
+    dam_lat, dam_lon = coords[i]
+    return basin, key, round(float(haversine_km(lat, lon, dam_lat, dam_lon)), 2)
+
+
+GRID_CELL_DEG = 0.05  # ~5 km, tương đương geohash độ chính xác 5
+
+
+def _grid_cell(lat: float, lon: float) -> Tuple[int, int]:
+    return int(lat // GRID_CELL_DEG), int(lon // GRID_CELL_DEG)
+
+
+@lru_cache(maxsize=None)
+def _grid_buckets() -> Dict[Tuple[int, int], Tuple[Tuple[str, str, str], ...]]:
+    """Ô lưới -> các (kind, basin, key) của trạm và đập nằm trong ô"""
+    buckets: Dict[Tuple[int, int], list] = {}
+    for basin, key, station in _iter_gauging_stations():
+        buckets.setdefault(_grid_cell(*station["coordinates"]), []).append(("station", basin, key))
+    for basin, key, dam in _iter_dams():
+        buckets.setdefault(_grid_cell(*dam["coordinates"]), []).append(("dam", basin, key))
+    return {cell: tuple(items) for cell, items in buckets.items()}
+
+
+def stations_near(lat: float, lon: float, ring: int = 1) -> List[Tuple[str, str, str]]:
+    """
+    Trạm/đập trong ô lưới chứa điểm và `ring` vòng ô lân cận.
+    Mỗi ô là một lần tra dict - đủ cho lọc thô theo vùng, không cần cây.
+    """
+    buckets = _grid_buckets()
+    row, col = _grid_cell(lat, lon)
+    found = []
+    for dr in range(-ring, ring + 1):
+        for dc in range(-ring, ring + 1):
+            found.extend(buckets.get((row + dr, col + dc), ()))
+    return found
+
+
+@dataclass(frozen=True, slots=True)
+class GaugingStation:
+    """Bản ghi trạm quan trắc gọn nhẹ (không có __dict__)"""
+    basin: str
+    key: str
+    river: str
+    lat: float
+    lon: float
+    alert_1: Optional[float] = None
+    alert_2: Optional[float] = None
+    alert_3: Optional[float] = None
+    hist_max: Optional[float] = None
+    hist_max_year: Optional[int] = None
+    zero_datum: Optional[float] = None
+    catchment_km2: Optional[int] = None
+    importance: Optional[str] = None
+
+
+@lru_cache(maxsize=None)
+def gauging_stations(basin: Optional[str] = None) -> Tuple[GaugingStation, ...]:
+    """Các trạm dạng GaugingStation, lọc theo basin nếu có"""
+    return tuple(
+        GaugingStation(
+            basin=station_basin,
+            key=key,
+            river=station["river"],
+            lat=station["coordinates"][0],
+            lon=station["coordinates"][1],
+            alert_1=station.get("alert_level_1_m"),
+            alert_2=station.get("alert_level_2_m"),
+            alert_3=station.get("alert_level_3_m"),
+            hist_max=station.get("historical_max_m"),
+            hist_max_year=station.get("historical_max_year"),
+            zero_datum=station.get("zero_datum_m"),
+            catchment_km2=station.get("catchment_area_km2"),
+            importance=station.get("importance"),
+        )
+        for station_basin, key, station in _iter_gauging_stations()
+        if basin is None or station_basin == basin
+    )
 
 
 # ============================================================================
-# PHẦN 3: CÁC SÔNG MIỀN TRUNG
+# PHẦN 3: BẢNG TRẠM DẠNG CỘT (SoA)
 # ============================================================================
 
-CENTRAL_VIETNAM_RIVERS = {
-    "vu_gia_thu_bon": {
-        "name": "Hệ thống Vũ Gia - Thu Bồn",
-        "provinces": ["Quảng Nam", "Đà Nẵng"],
-        "total_length_km": 205,
-        "basin_area_km2": 10350,
-        "population_at_risk": 1500000,
-        "characteristics": [
-            "Lũ lên cực nhanh (6-12 giờ)",
-            "Mưa lớn tập trung (có thể 500-800mm/24h)",
-            "Lũ quét miền núi nghiêm trọng",
-        ],
-        "flood_peak_time_hours": [6, 12],
-        "historical_floods": [
-            {"year": 1999, "peak_discharge_m3_s": 15000, "casualties": 572},
-            {"year": 2009, "peak_discharge_m3_s": 13500, "casualties": 163},
-            {"year": 2017, "peak_discharge_m3_s": 12000, "casualties": 123},
-            {"year": 2020, "peak_discharge_m3_s": 14500, "casualties": 136},
-        ],
-        "gauging_stations": {
-            "nong_son": {
-                "river": "Thu Bồn",
-                "coordinates": (15.65, 107.91),
-                "alert_level_1_m": 3.0,
-                "alert_level_2_m": 4.0,
-                "alert_level_3_m": 5.0,
-                "historical_max_m": 7.68,
-                "historical_max_year": 2009,
-            },
-            "thanh_my": {
-                "river": "Vũ Gia",
-                "coordinates": (15.87, 108.13),
-                "alert_level_1_m": 2.5,
-                "alert_level_2_m": 3.5,
-                "alert_level_3_m": 4.5,
-                "historical_max_m": 6.12,
-                "historical_max_year": 2009,
-            },
-        },
-    },
+LEVEL_CM_MISSING = np.iinfo(np.int16).max  # Ngưỡng không có -> không bao giờ vượt
+
+
+def _to_cm(meters: np.ndarray) -> np.ndarray:
+    """Mét (float, NaN = thiếu) -> centimet int16"""
+    cm = np.round(meters * 100)
+    return np.where(np.isnan(cm), LEVEL_CM_MISSING, cm).astype(np.int16)
+
+
+@lru_cache(maxsize=None)
+def _station_table() -> Dict[str, np.ndarray]:
+    """
+    Trải phẳng các trạm thành bảng cột NumPy (một mảng cho mỗi thuộc tính).
+    Trạm thiếu ngưỡng (vd. trạm Lào/Campuchia) mang giá trị NaN.
+    """
+    rows = list(_iter_gauging_stations())
+    nan = float("nan")
+
+    def column(field, dtype=np.float64):
+        return np.array([station.get(field, nan) for _, _, station in rows], dtype=dtype)
+
+    return {
+        "basin": np.array([basin for basin, _, _ in rows]),
+        "station": np.array([key for _, key, _ in rows]),
+        "river": np.array([station["river"] for _, _, station in rows]),
+        "lat": np.array([station["coordinates"][0] for _, _, station in rows]),
+        "lon": np.array([station["coordinates"][1] for _, _, station in rows]),
+        "alert_1": column("alert_level_1_m"),
+        "alert_2": column("alert_level_2_m"),
+        "alert_3": column("alert_level_3_m"),
+        "hist_max": column("historical_max_m"),
+        "zero_datum": column("zero_datum_m"),
+        "catchment_km2": column("catchment_area_km2"),
+        "hist_max_year": np.array(
+            [station.get("historical_max_year", 0) for _, _, station in rows], dtype=np.uint16
+        ),  # 0 = không có
+        # Mực nước lượng tử hóa: int16 centimet (±327 m là đủ cho sông VN)
+        "alert_1_cm": _to_cm(column("alert_level_1_m")),
+        "alert_2_cm": _to_cm(column("alert_level_2_m")),
+        "alert_3_cm": _to_cm(column("alert_level_3_m")),
+        "hist_max_cm": _to_cm(column("historical_max_m")),
+        "zero_datum_cm": _to_cm(column("zero_datum_m")),
+    }
+
+
+@lru_cache(maxsize=None)
+def _station_rows() -> Dict[str, int]:
+    """station_key -> chỉ số hàng trong bảng trạm"""
+    return {key: i for i, key in enumerate(_station_table()["station"].tolist())}
+
+
+def classify_station_levels(water_levels: Dict[str, float]) -> Dict[str, int]:
+    """
+    Cấp báo động (0-3) cho từng trạm theo mực nước đo được (m).
+    So sánh vector hóa trên toàn bảng thay vì duyệt từng dict trạm.
+    """
+    table, rows = _station_table(), _station_rows()
+    # Đổi mực nước đo sang cm một lần; trạm không có số đo (None/NaN) giữ giá trị
+    # int16 nhỏ nhất nên không vượt ngưỡng nào, số đo ngoài khoảng int16 bị kẹp lại
+    levels_cm = np.full(len(rows), np.iinfo(np.int16).min, dtype=np.int16)
+    for key, value in water_levels.items():
+        row = rows.get(key)
+        if row is not None and value is not None and np.isfinite(value):
+            levels_cm[row] = np.clip(round(value * 100), -32767, 32766)
+
+    alert = (
+        (levels_cm >= table["alert_1_cm"]).astype(np.int8)
+        + (levels_cm >= table["alert_2_cm"])
+        + (levels_cm >= table["alert_3_cm"])
+    )
+    return {key: int(alert[rows[key]]) for key in water_levels if key in rows}
+
+
+_BATCH_ROWS = 4096  # Số điểm mỗi khối khi ghép hàng loạt (giới hạn bộ nhớ tạm)
+
+
+def nearest_stations_batch(lats: Any, lons: Any, max_km: float = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Gán hàng loạt điểm (vd. ô lưới mưa) cho trạm gần nhất.
+    Tính theo khối điểm × toàn bộ trạm bằng haversine vector hóa.
+
+    Returns:
+        (rows, distances_km): chỉ số hàng trong STATION_TABLE cho từng điểm
+        (-1 nếu xa hơn max_km) và khoảng cách tương ứng
+    """
+    table = _station_table()
+    lats = np.asarray(lats, dtype=np.float64).ravel()
+    lons = np.asarray(lons, dtype=np.float64).ravel()
+    rows = np.empty(lats.shape[0], dtype=np.intp)
+    distances = np.empty(lats.shape[0], dtype=np.float64)
+
+    for start in range(0, lats.shape[0], _BATCH_ROWS):
+        stop = start + _BATCH_ROWS
+        dist = haversine_km(
+            lats[start:stop, None], lons[start:stop, None], table["lat"], table["lon"]
+        )
+        best = dist.argmin(axis=1)
+        rows[start:stop] = best
+        distances[start:stop] = dist[np.arange(best.shape[0]), best]
+
+    if max_km is not None:
+        rows[distances > max_km] = -1
+    return rows, distances
+
+
+STATION_RECORD_DTYPE = np.dtype([
+    ("basin", "U8"),
+    ("station", "U24"),
+    ("river", "U32"),
+    ("lat", "f8"),
+    ("lon", "f8"),
+    ("alert_1_cm", "i2"),
+    ("alert_2_cm", "i2"),
+    ("alert_3_cm", "i2"),
+    ("hist_max_cm", "i2"),
+    ("zero_datum_cm", "i2"),
+    ("catchment_km2", "f4"),
+    ("hist_max_year", "u2"),
+])
+
+
+def station_records() -> np.ndarray:
+    """Bảng trạm dạng mảng bản ghi cố định độ rộng (một khối nhớ liền)"""
+    table = _station_table()
+    records = np.empty(len(table["station"]), dtype=STATION_RECORD_DTYPE)
+    for field in STATION_RECORD_DTYPE.names:
+        records[field] = table[field]
+    return records
+
+
+def dump_station_blob(path: str) -> None:
+    """Ghi bảng trạm ra một file nhị phân phẳng (.npy)"""
+    np.save(path, station_records(), allow_pickle=False)
+
+
+def load_station_blob(path: str) -> np.ndarray:
+    """
+    Mở file đã ghi bằng dump_station_blob qua mmap chỉ đọc.
+    Nhiều worker mở cùng file dùng chung trang nhớ trong page cache.
+    """
+    return np.load(path, mmap_mode="r", allow_pickle=False)
+
+
+def historical_max_by_basin() -> Dict[str, Dict[str, Any]]:
+    """
+    Tổng hợp mực nước lịch sử theo lưu vực trên các cột của bảng trạm:
+    số trạm có dữ liệu, mực nước cao nhất, trạm và năm xảy ra.
+    """
+    table = _station_table()
+    hist_max = table["hist_max"]
+    summary = {}
+    for basin in np.unique(table["basin"]).tolist():
+        rows = np.flatnonzero((table["basin"] == basin) & ~np.isnan(hist_max))
+        if rows.size == 0:
+            continue
+        top = rows[hist_max[rows].argmax()]
+        summary[basin] = {
+            "stations_with_data": int(rows.size),
+            "historical_max_m": float(hist_max[top]),
+            "station": str(table["station"][top]),
+            "year": int(table["hist_max_year"][top]),
+        }
+    return summary
 
-    "song_huong": {
-        "name": "Sông Hương",
-        "provinces": ["Thừa Thiên Huế"],
-        "length_km": 104,
-        "basin_area_km2": 2830,
-        "population_at_risk": 800000,
-        "characteristics": [
-            "Lũ kép: sông + đầm phá (lagoon)",
-            "Đô thị di sản Huế",
-            "Mưa lớn tập trung",
-        ],
-        "flood_peak_time_hours": [8, 15],
-        "dams": [
-            {"name": "Tả Trạch", "capacity_million_m3": 31.9, "power_mw": 6.6},
-            {"name": "Hương Điền", "capacity_million_m3": 33.4, "power_mw": 12},
-            {"name": "Bình Điền", "capacity_million_m3": 221, "power_mw": 27},
-        ],
-        "gauging_stations": {
-            "kim_long": {
-                "river": "Hương",
-                "coordinates": (16.46, 107.58),
-                "alert_level_1_m": 2.0,
-                "alert_level_2_m": 2.5,
-                "alert_level_3_m": 3.0,
-                "historical_max_m": 4.28,
-                "historical_max_year": 1999,
-            },
-        },
-    },
+# ============================================================================
+# PHẦN 4: ĐỘ SÂU NGẬP THEO CHU KỲ LẶP LẠI
+# ============================================================================
 
-    "song_ca": {
-        "name": "Sông Cả",
-        "provinces": ["Nghệ An", "Hà Tĩnh"],
-        "length_km": 531,
-        "basin_area_km2": 27200,
-        "population_at_risk": 2200000,
-        "characteristics": [
-            "Lưu vực lớn nhất Miền Trung",
-            "Lũ kéo dài",
-            "Thiệt hại nông nghiệp lớn",
-        ],
-        "flood_peak_time_hours": [18, 36],
-        "gauging_stations": {
-            "dua": {
-                "river": "Cả",
-                "coordinates": (18.67, 105.44),
-                "alert_level_1_m": 10.0,
-                "alert_level_2_m": 11.0,
-                "alert_level_3_m": 12.0,
-                "historical_max_m": 15.27,
-                "historical_max_year": 2010,
-            },
-        },
-    },
+def _return_period_years(key: str) -> Any:
+    """'10_year' -> 10, 'annual_flood' -> 1; kịch bản đặc biệt -> None"""
+    if key == "annual_flood":
+        return 1
+    if key.endswith("_year") and key[:-5].isdigit():
+        return int(key[:-5])
+    return None  # vd. "2000_extreme", "dike_breach_scenario"
+
+
+@lru_cache(maxsize=None)
+def _return_period_maps() -> Dict[Tuple[str, str], Dict[int, float]]:
+    """(basin, zone_key) -> {năm: độ sâu} với khóa số nguyên, sắp theo năm"""
+    maps = {}
+    for basin, basin_data in (("HONG", basins.HONG_RIVER_BASIN), ("MEKONG", basins.MEKONG_RIVER_BASIN)):
+        for zone_key, zone in basin_data["flood_zones"].items():
+            periods = zone.get("flood_depth_return_periods")
+            if not periods:
+                continue
+            points = sorted(
+                (years, depth)
+                for years, depth in ((_return_period_years(k), v) for k, v in periods.items())
+                if years is not None
+            )
+            maps[(basin, zone_key)] = MappingProxyType(dict(points))
+    return maps
+
+
+@lru_cache(maxsize=None)
+def _return_period_table() -> Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]]:
+    """(basin, zone_key) -> (years, depths) dạng float32, sắp theo năm"""
+    return {
+        zone: (
+            np.fromiter(depths.keys(), dtype=np.float32),
+            np.fromiter(depths.values(), dtype=np.float32),
+        )
+        for zone, depths in _return_period_maps().items()
+    }
+
+
+def return_period_depths(basin: str, zone_key: str) -> Any:
+    """
+    Độ sâu ngập theo chu kỳ lặp với khóa số nguyên, vd. depths[100]
+    thay vì depths["100_year"]. None nếu vùng không có dữ liệu.
+    """
+    return _return_period_maps().get((basin, zone_key))
+
+
+def depth_for_return_period(basin: str, zone_key: str, return_period: Any) -> Any:
+    """
+    Độ sâu ngập (m) nội suy tuyến tính theo chu kỳ lặp (năm).
+    Nhận số hoặc mảng chu kỳ; ngoài khoảng dữ liệu thì lấy giá trị biên.
+    Trả về None nếu vùng không có bảng độ sâu.
+    """
+    entry = _return_period_table().get((basin, zone_key))
+    if entry is None:
+        return None
+    years, depths = entry
+    result = np.interp(return_period, years, depths)
+    return float(result) if np.ndim(result) == 0 else result
 
-    "song_tra_khuc": {
-        "name": "Sông Trà Khúc",
-        "provinces": ["Quảng Ngãi"],
-        "length_km": 135,
-        "basin_area_km2": 3240,
-        "population_at_risk": 600000,
-        "characteristics": [
-            "Lũ cực nhanh",
-            "Sạt lở nghiêm trọng",
-            "Thiệt hại cơ sở hạ tầng",
-        ],
-        "flood_peak_time_hours": [4, 8],
-        "gauging_stations": {
-            "tra_khuc": {
-                "river": "Trà Khúc",
-                "coordinates": (15.12, 108.78),
-                "alert_level_1_m": 2.5,
-                "alert_level_2_m": 3.5,
-                "alert_level_3_m": 4.5,
-                "historical_max_m": 6.8,
-                "historical_max_year": 2009,
-            },
-        },
-    },
-}
+
+# ============================================================================
+# PHẦN 5: BẢNG THỜI GIAN TRUYỀN LŨ
+# ============================================================================
+
+ROUTING_DTYPE = np.dtype([
+    ("basin", "U8"),
+    ("segment", "U32"),
+    ("from", "U24"),
+    ("to", "U24"),
+    ("km", "f4"),
+    ("t_lo", "f4"),
+    ("t_hi", "f4"),
+])
+
+
+@lru_cache(maxsize=None)
+def _routing_table() -> Tuple[np.ndarray, Dict[Tuple[str, str], int]]:
+    """
+    flood_routing_time của các lưu vực trải thành một mảng bản ghi liền khối
+    và chỉ mục (basin, segment) -> hàng. Các cột km/t_lo/t_hi dùng trực tiếp
+    được trong tính toán NumPy (vd. K cho Muskingum).
+    """
+    records = []
+    for basin, basin_data in (("HONG", basins.HONG_RIVER_BASIN), ("MEKONG", basins.MEKONG_RIVER_BASIN)):
+        for segment, info in basin_data["flood_routing_time"].items():
+            if segment.startswith("total_"):  # bỏ qua dòng tổng cả tuyến, vd. "total_china_to_hanoi"
+                continue
+            start, _, end = segment.partition("_to_")
+            t_lo, t_hi = info["time_hours"]
+            records.append((basin, segment, start, end, info["distance_km"], t_lo, t_hi))
+    table = np.array(records, dtype=ROUTING_DTYPE)
+    index = {(rec[0], rec[1]): i for i, rec in enumerate(records)}
+    return table, index
+
+
+def routing_segment(basin: str, segment: str) -> Any:
+    """Bản ghi truyền lũ của một đoạn (np.void), None nếu không có"""
+    table, index = _routing_table()
+    row = index.get((basin, segment))
+    return None if row is None else table[row]
 
 
 # ============================================================================
-# PHẦN 4: NGUỒN DỮ LIỆU VÀ API
+# PHẦN 6: TỈNH -> VÙNG NGẬP
 # ============================================================================
 
-DATA_SOURCES = {
-    "vietnam_national": {
-        "nchmf": {
-            "name": "National Center for Hydro-Meteorological Forecasting",
-            "website": "http://www.nchmf.gov.vn",
-            "api_available": False,
-            "data_types": ["Rainfall", "Water level", "Forecast"],
-            "update_frequency": "6 hours",
-            "coverage": "Nationwide",
-        },
-        "imh": {
-            "name": "Institute of Meteorology and Hydrology",
-            "website": "http://www.imh.ac.vn",
-            "api_available": False,
-            "data_types": ["Historical data", "Research"],
-        },
-        "monre": {
-            "name": "Ministry of Natural Resources and Environment",
-            "website": "http://www.monre.gov.vn",
-            "api_available": False,
-            "data_types": ["Water resources", "Environmental data"],
-        },
-    },
+@lru_cache(maxsize=None)
+def _province_zone_index() -> Dict[str, Tuple[Tuple[str, str], ...]]:
+    """Chỉ mục ngược: tên tỉnh -> các (basin, zone_key) có chứa tỉnh đó"""
+    index: Dict[str, list] = {}
+    for basin, basin_data in (("HONG", basins.HONG_RIVER_BASIN), ("MEKONG", basins.MEKONG_RIVER_BASIN)):
+        for zone_key, zone in basin_data["flood_zones"].items():
+            for province in zone.get("provinces", ()):
+                index.setdefault(province, []).append((basin, zone_key))
+    for river_key, river in basins.CENTRAL_VIETNAM_RIVERS.items():
+        for province in river.get("provinces", ()):
+            index.setdefault(province, []).append(("CENTRAL", river_key))
+    return {province: tuple(zones) for province, zones in index.items()}
 
-    "international": {
-        "open_meteo": {
-            "name": "Open-Meteo",
-            "api_url": "https://api.open-meteo.com/v1/forecast",
-            "api_available": True,
-            "free": True,
-            "data_types": ["Rainfall forecast", "Temperature", "Wind"],
-            "forecast_days": 16,
-            "spatial_resolution_km": 11,
-            "update_frequency": "1 hour",
-            "recommended": True,
-        },
-        "mrc": {
-            "name": "Mekong River Commission",
-            "website": "https://www.mrcmekong.org",
-            "api_url": "https://portal.mrcmekong.org/api",
-            "api_available": True,
-            "free": True,
-            "data_types": ["Mekong water level", "Discharge", "Forecast"],
-            "update_frequency": "Daily",
-            "coverage": "Mekong Basin only",
-            "recommended": True,
-        },
-        "gfs_noaa": {
-            "name": "NOAA Global Forecast System",
-            "api_url": "https://nomads.ncep.noaa.gov/pub/data/nccf/com/gfs/prod/",
-            "api_available": True,
-            "free": True,
-            "data_types": ["Global weather forecast"],
-            "forecast_days": 16,
-            "spatial_resolution_km": 25,
-            "update_frequency": "6 hours",
-        },
-        "nasa_gpm": {
-            "name": "NASA GPM (Global Precipitation Measurement)",
-            "api_url": "https://gpm.nasa.gov/data/imerg",
-            "api_available": True,
-            "data_types": ["Satellite rainfall estimates"],
-            "spatial_resolution_km": 10,
-            "temporal_resolution": "30 minutes",
-            "delay_hours": 4,  # Near real-time
-        },
-    },
-}
+
+def zones_for_province(province: str) -> Tuple[Tuple[str, str], ...]:
+    """Các vùng ngập (basin, zone_key) liên quan đến một tỉnh - một lần tra dict"""
+    return _province_zone_index().get(province, ())
 
 
 # ============================================================================
-# PHẦN 5: CÔNG THỨC TÍNH TOÁN CHUẨN
+# PHẦN 7: JSON DỰNG SẴN CHO API
 # ============================================================================
 
-HYDROLOGICAL_FORMULAS = {
-    "thiessen_polygon": {
-        "description": "Tính lượng mưa trung bình lưu vực theo Thiessen",
-        "formula": "P_basin = Σ(Pi × Ai) / Σ(Ai)",
-        "variables": {
-            "P_basin": "Lượng mưa trung bình lưu vực (mm)",
-            "Pi": "Lượng mưa tại trạm i (mm)",
-            "Ai": "Diện tích ảnh hưởng của trạm i (km²)",
-        },
-        "application": "Phù hợp cho lưu vực lớn, phân bố trạm không đều",
-    },
+_JSON_CONSTANTS = (
+    "HONG_RIVER_BASIN",
+    "MEKONG_RIVER_BASIN",
+    "CENTRAL_VIETNAM_RIVERS",
+    "DATA_SOURCES",
+    "HYDROLOGICAL_FORMULAS",
+    "FLOOD_THRESHOLDS_STANDARD",
+)
 
-    "scs_cn_method": {
-        "description": "Phương pháp SCS Curve Number",
-        "formula": "Q = ((P - Ia)²) / (P - Ia + S)",
-        "variables": {
-            "Q": "Lượng dòng chảy (mm)",
-            "P": "Lượng mưa (mm)",
-            "Ia": "Initial abstraction = 0.2S (mm)",
-            "S": "Potential maximum retention = (1000/CN) - 10 (mm)",
-            "CN": "Curve Number (40-100)",
-        },
-        "cn_values": {
-            "forest_good": 30,
-            "forest_fair": 55,
-            "pasture_good": 61,
-            "residential_low": 77,
-            "residential_medium": 85,
-            "residential_high": 92,
-            "paved_roads": 98,
-            "water_bodies": 100,
-        },
-        "application": "Ước tính dòng chảy từ mưa",
-    },
-
-    "manning_equation": {
-        "description": "Công thức Manning cho dòng chảy kênh hở",
-        "formula": "V = (1/n) × R^(2/3) × S^(1/2)",
-        "variables": {
-            "V": "Vận tốc dòng chảy (m/s)",
-            "n": "Hệ số nhám Manning",
-            "R": "Bán kính thủy lực (m)",
-            "S": "Độ dốc đáy sông",
-        },
-        "manning_n_values": {
-            "natural_clean": 0.030,
-            "natural_weeds": 0.035,
-            "natural_dense_weeds": 0.050,
-            "mountain_stream": 0.040,
-            "flood_plain": 0.060,
-            "concrete_channel": 0.013,
-        },
-        "application": "Tính vận tốc và lưu lượng dòng chảy",
-    },
 
-    "rational_method": {
-        "description": "Phương pháp Hữu tỷ (Rational Method)",
-        "formula": "Q = 0.278 × C × i × A",
-        "variables": {
-            "Q": "Lưu lượng đỉnh (m³/s)",
-            "C": "Hệ số dòng chảy (0-1)",
-            "i": "Cường độ mưa (mm/h)",
-            "A": "Diện tích lưu vực (km²)",
-        },
-        "runoff_coefficients": {
-            "forest": 0.15,
-            "pasture": 0.25,
-            "residential_low": 0.40,
-            "residential_medium": 0.60,
-            "residential_high": 0.75,
-            "industrial": 0.80,
-            "asphalt": 0.90,
-        },
-        "limitations": "Chỉ áp dụng cho lưu vực < 20 km²",
-    },
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
 
-    "muskingum_routing": {
-        "description": "Phương pháp Muskingum truyền lũ",
-        "formula": "O[t+1] = C0×I[t+1] + C1×I[t] + C2×O[t]",
-        "variables": {
-            "O": "Lưu lượng ra (m³/s)",
-            "I": "Lưu lượng vào (m³/s)",
-            "K": "Thời gian truyền (giờ)",
-            "X": "Hệ số trọng lượng (0-0.5)",
-            "dt": "Bước thời gian (giờ)",
-        },
-        "typical_X_values": {
-            "natural_stream": 0.25,
-            "reservoir": 0.0,
-        },
-        "application": "Dự báo lưu lượng hạ lưu từ thượng nguồn",
-    },
 
-    "gumbel_distribution": {
-        "description": "Phân phối Gumbel cho tần suất lũ",
-        "formula": "T = 1 / (1 - F(x))",
-        "variables": {
-            "T": "Chu kỳ lặp lại (năm)",
-            "F(x)": "Hàm phân phối tích lũy",
-            "x": "Lưu lượng/mực nước",
-        },
-        "application": "Tính tần suất xuất hiện lũ",
-    },
-}
+@lru_cache(maxsize=None)
+def constants_json(name: str) -> bytes:
+    """
+    Hằng số `name` đã tuần tự hóa sẵn thành JSON (UTF-8), chỉ làm một lần.
+    Endpoint trả thẳng bytes này: Response(content=..., media_type="application/json").
+    """
+    if name not in _JSON_CONSTANTS:
+        raise KeyError(name)
+    value = FLOOD_THRESHOLDS_STANDARD if name == "FLOOD_THRESHOLDS_STANDARD" else getattr(basins, name)
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, default=_json_default)
+    return json.dumps(value, default=_json_default, ensure_ascii=False).encode("utf-8")
 
 
 # ============================================================================
-# PHẦN 6: NGƯỠNG CẢNH BÁO CHUẨN
+# PHẦN 8: KẾT NỐI HTTP THEO NGUỒN DỮ LIỆU
 # ============================================================================
 
-FLOOD_THRESHOLDS_STANDARD = {
-    "HONG": {
-        "safe": {"daily_rainfall_mm": [0, 50], "accumulated_3d_mm": [0, 150]},
-        "watch": {"daily_rainfall_mm": [50, 100], "accumulated_3d_mm": [150, 250]},
-        "warning": {"daily_rainfall_mm": [100, 150], "accumulated_3d_mm": [250, 400]},
-        "danger": {"daily_rainfall_mm": [150, 999], "accumulated_3d_mm": [400, 999]},
-        "water_level_son_tay": {
-            "normal": 11.0,
-            "alert_1": 11.5,
-            "alert_2": 12.5,
-            "alert_3": 13.5,
-            "design_level": 14.22,
-        },
-    },
+SESSION_POOL_SIZE = 20
+_SESSIONS: Dict[str, Any] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def get_session(source: str) -> Any:
+    """
+    requests.Session dùng chung cho một nguồn trong DATA_SOURCES["international"]
+    (vd. "open_meteo", "gfs_noaa"). Giữ kết nối keep-alive nên các lần gọi sau
+    không phải bắt tay TCP/TLS lại.
+    """
+    session = _SESSIONS.get(source)
+    if session is not None:
+        return session
+    if source not in basins.DATA_SOURCES["international"]:
+        raise KeyError(f"Unknown data source: {source}")
+
+    # Import muộn: module hằng số không cần requests trừ khi thực sự gọi API
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(source)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=SESSION_POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            if source == "gfs_noaa":
+                # File GRIB2 đọc theo byte-range - không nén
+                session.headers["Accept-Encoding"] = "identity"
+            _SESSIONS[source] = session
+    return session
+
+
+_FREQUENCY_UNITS = {"minute": 60, "hour": 3600, "day": 86400}
+DEFAULT_SOURCE_TTL = 3600
+
+
+def _frequency_seconds(text: Optional[str]) -> int:
+    """'1 hour' -> 3600, '6 hours' -> 21600, 'Daily' -> 86400, '30 minutes' -> 1800"""
+    if not text:
+        return DEFAULT_SOURCE_TTL
+    text = text.lower()
+    if text == "daily":
+        return 86400
+    count, _, unit = text.partition(" ")
+    seconds = _FREQUENCY_UNITS.get(unit.rstrip("s"))
+    if not count.isdigit() or seconds is None:
+        return DEFAULT_SOURCE_TTL
+    return int(count) * seconds
+
+
+def source_ttl(source: str) -> int:
+    """TTL cache (giây) của một nguồn, lấy theo tần suất cập nhật khai báo"""
+    info = basins.DATA_SOURCES["international"][source]
+    return _frequency_seconds(info.get("update_frequency") or info.get("temporal_resolution"))
+
+
+SOURCE_CACHE_MAX_ENTRIES = 256
+
+# (source, path, params) -> (expires_at monotonic, etag, content)
+_SOURCE_CACHE: Dict[Tuple[str, str, tuple], Tuple[float, Optional[str], bytes]] = {}
+_SOURCE_CACHE_LOCK = threading.Lock()
+
+
+def fetch_source(source: str, path: str = "", params: Optional[Dict] = None) -> bytes:
+    """
+    GET tới api_url của nguồn, có cache TTL theo update_frequency và ETag.
+    - Còn hạn: trả từ cache, không gọi mạng
+    - Hết hạn nhưng có ETag: gửi If-None-Match, 304 thì gia hạn bản cũ
+    - Lỗi mạng mà còn bản cũ: trả bản cũ (stale) thay vì lỗi
+    """
+    key = (source, path, tuple(sorted((params or {}).items())))
+    with _SOURCE_CACHE_LOCK:
+        cached = _SOURCE_CACHE.get(key)
+    now = time.monotonic()
+    if cached is not None and cached[0] > now:
+        return cached[2]
+
+    url = basins.DATA_SOURCES["international"][source]["api_url"] + path
+    headers = {"If-None-Match": cached[1]} if cached is not None and cached[1] else {}
+    try:
+        resp = get_session(source).get(url, params=params, headers=headers, timeout=30)
+        if resp.status_code == 304 and cached is not None:
+            content, etag = cached[2], cached[1]
+        else:
+            resp.raise_for_status()
+            content, etag = resp.content, resp.headers.get("ETag")
+    except Exception as e:
+        if cached is None:
+            raise
+        print(f"[DataSources] {source} refresh failed, serving stale: {e}")
+        return cached[2]
+
+    expires_at = now + source_ttl(source)
+    with _SOURCE_CACHE_LOCK:
+        if key not in _SOURCE_CACHE and len(_SOURCE_CACHE) >= SOURCE_CACHE_MAX_ENTRIES:
+            # Bỏ mục hết hạn trước, nếu vẫn đầy thì bỏ mục cũ nhất
+            for stale in [k for k, entry in _SOURCE_CACHE.items() if entry[0] <= now]:
+                del _SOURCE_CACHE[stale]
+            if len(_SOURCE_CACHE) >= SOURCE_CACHE_MAX_ENTRIES:
+                del _SOURCE_CACHE[next(iter(_SOURCE_CACHE))]
+        _SOURCE_CACHE[key] = (expires_at, etag, content)
+    return content
+
+
+# Hằng số lưu vực (package basins) và các bảng dẫn xuất chỉ được nạp/dựng
+# khi có người truy cập (PEP 562), nên import module gần như không tốn gì.
+_LAZY_ATTRS = {
+    "HONG_RIVER_BASIN": lambda: basins.HONG_RIVER_BASIN,
+    "MEKONG_RIVER_BASIN": lambda: basins.MEKONG_RIVER_BASIN,
+    "CENTRAL_VIETNAM_RIVERS": lambda: basins.CENTRAL_VIETNAM_RIVERS,
+    "DATA_SOURCES": lambda: basins.DATA_SOURCES,
+    "HYDROLOGICAL_FORMULAS": lambda: basins.HYDROLOGICAL_FORMULAS,
+    "STATION_TABLE": _station_table,
+    "FLOOD_ROUTING_TABLE": lambda: _routing_table()[0],
+}
 
-    "MEKONG": {
-        "safe": {"daily_rainfall_mm": [0, 40], "accumulated_3d_mm": [0, 120]},
-        "watch": {"daily_rainfall_mm": [40, 80], "accumulated_3d_mm": [120, 200]},
-        "warning": {"daily_rainfall_mm": [80, 120], "accumulated_3d_mm": [200, 350]},
-        "danger": {"daily_rainfall_mm": [120, 999], "accumulated_3d_mm": [350, 999]},
-        "water_level_tan_chau": {
-            "normal": 3.0,
-            "alert_1": 3.5,
-            "alert_2": 4.0,
-            "alert_3": 4.5,
-        },
-    },
 
-    "CENTRAL": {
-        "safe": {"daily_rainfall_mm": [0, 80], "accumulated_3d_mm": [0, 200]},
-        "watch": {"daily_rainfall_mm": [80, 120], "accumulated_3d_mm": [200, 300]},
-        "warning": {"daily_rainfall_mm": [120, 200], "accumulated_3d_mm": [300, 500]},
-        "danger": {"daily_rainfall_mm": [200, 999], "accumulated_3d_mm": [500, 999]},
-        "flash_flood_criteria": {
-            "rainfall_intensity_mm_h": 30,  # >30mm/h = nguy cơ lũ quét
-            "duration_hours": 3,
-        },
-    },
-}
+def __getattr__(name: str) -> Any:
+    builder = _LAZY_ATTRS.get(name)
+    if builder is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = builder()
+    globals()[name] = value
+    return value
 
 
 # Export tất cả
@@ -916,4 +819,33 @@ __all__ = [
     'DATA_SOURCES',
     'HYDROLOGICAL_FORMULAS',
     'FLOOD_THRESHOLDS_STANDARD',
+    'THRESHOLD_LEVELS',
+    'THRESHOLD_BASIN_INDEX',
+    'classify_rainfall',
+    'classify_levels',
+    'rainfall_level',
+    'classify_flood_level',
+    'classify_flood_batch',
+    'haversine_km',
+    'stations_in_bbox',
+    'nearest_station',
+    'nearest_dam',
+    'GaugingStation',
+    'gauging_stations',
+    'stations_near',
+    'STATION_TABLE',
+    'classify_station_levels',
+    'nearest_stations_batch',
+    'station_records',
+    'dump_station_blob',
+    'load_station_blob',
+    'historical_max_by_basin',
+    'depth_for_return_period',
+    'return_period_depths',
+    'FLOOD_ROUTING_TABLE',
+    'routing_segment',
+    'zones_for_province',
+    'constants_json',
+    'get_session',
+    'fetch_source',
 ]
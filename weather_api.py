@@ -3,11 +3,37 @@
 Open-Meteo Weather API Integration
 Lấy tất cả dữ liệu thời tiết miễn phí từ Open-Meteo
 """
+import sys
+import threading
+import time
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from functools import lru_cache, partial
+from itertools import chain
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Optional, Tuple
 import json
 
+from vietnam_hydro_config import haversine_km
+
+# orjson (tùy chọn) - giải mã JSON nhanh hơn json chuẩn cho payload lớn
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def decode_json(resp: requests.Response):
+    """Giải mã thân phản hồi JSON - dùng orjson nếu có, ngược lại resp.json()"""
+    return orjson.loads(resp.content) if ORJSON_AVAILABLE else resp.json()
+
+
 # Open-Meteo API endpoints
 OPEN_METEO_FORECAST = "https://api.open-meteo.com/v1/forecast"
 OPEN_METEO_HISTORICAL = "https://archive-api.open-meteo.com/v1/archive"
@@ -15,6 +41,134 @@ OPEN_METEO_FLOOD = "https://flood-api.open-meteo.com/v1/flood"
 OPEN_METEO_AIR_QUALITY = "https://air-quality-api.open-meteo.com/v1/air-quality"
 OPEN_METEO_MARINE = "https://marine-api.open-meteo.com/v1/marine"
 
+# Số request Open-Meteo chạy song song tối đa (tránh bị 429)
+MAX_CONCURRENT_FETCHES = 16
+
+
+# Retry có backoff lũy thừa cho GET khi Open-Meteo quá tải/lỗi tạm thời,
+# tôn trọng header Retry-After của 429
+_RETRY = Retry(
+    total=4,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset(["GET"]),
+    respect_retry_after_header=True,
+)
+
+
+@lru_cache(maxsize=None)
+def _get_session() -> requests.Session:
+    """
+    Session dùng chung cho mọi request Open-Meteo: giữ kết nối keep-alive theo
+    host nên không phải bắt tay TCP/TLS lại cho từng tỉnh, kèm retry cho 429/5xx
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=max(MAX_CONCURRENT_FETCHES, 32),
+        max_retries=_RETRY,
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+# Cache phản hồi theo (url, params) với TTL riêng cho từng endpoint.
+# Dự báo Open-Meteo cập nhật theo giờ; dữ liệu lịch sử không đổi.
+FORECAST_CACHE_TTL = 3600
+FLOOD_CACHE_TTL = 3600
+AIR_QUALITY_CACHE_TTL = 3600
+MARINE_CACHE_TTL = 3 * 3600
+HISTORICAL_CACHE_TTL = float("inf")
+RESPONSE_CACHE_MAX_ENTRIES = 512
+
+# Làm tròn tọa độ gửi đi (2 chữ số ~ 1,1 km, mịn hơn lưới Open-Meteo) để các điểm
+# gần nhau dùng chung một mục cache
+COORD_DECIMALS = 2
+
+_response_cache: Dict[tuple, tuple] = {}  # key -> (expires_at, payload)
+_response_cache_lock = threading.Lock()
+_response_cache_stats = {"hits": 0, "misses": 0}  # đếm gần đúng, không khóa
+
+# Ngắt mạch theo endpoint: sau CIRCUIT_FAILURE_THRESHOLD lần lỗi liên tiếp (đã qua
+# retry của session) thì trả {} ngay trong CIRCUIT_COOLDOWN giây, để một endpoint
+# hỏng không chiếm luồng của các endpoint còn lại
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_COOLDOWN = 30
+_circuit_state: Dict[str, list] = {}  # url -> [số lần lỗi liên tiếp, mở mạch đến thời điểm]
+_circuit_lock = threading.Lock()
+
+
+def _is_endpoint_failure(exc: Exception) -> bool:
+    """
+    Lỗi do phía endpoint (mất kết nối, timeout, 5xx/429 kể cả khi đã hết lượt retry)
+    mới tính cho ngắt mạch; lỗi 4xx khác hay payload hỏng chỉ hỏng riêng request đó
+    """
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout, requests.exceptions.RetryError)):
+        return True
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return False
+
+
+def get_response_cache_stats() -> Dict[str, int]:
+    """Số lần trúng/trượt cache phản hồi và số mục hiện có"""
+    return {**_response_cache_stats, "entries": len(_response_cache)}
+
+
+def clear_response_cache() -> None:
+    """Xóa toàn bộ cache phản hồi - lần gọi sau buộc lấy dữ liệu mới từ Open-Meteo"""
+    with _response_cache_lock:
+        _response_cache.clear()
+
+
+def _fetch_json(url: str, params: Dict, ttl: float, label: str) -> Dict:
+    """
+    GET JSON qua session dùng chung, có cache TTL trong process.
+    Payload trong cache được dùng chung giữa các lần gọi - không sửa trực tiếp.
+    Lỗi mạng trả {} và không được cache.
+    """
+    key = (url, tuple(sorted(params.items())))
+    now = time.monotonic()
+    entry = _response_cache.get(key)
+    if entry is not None and entry[0] > now:
+        _response_cache_stats["hits"] += 1
+        return entry[1]
+    _response_cache_stats["misses"] += 1
+
+    state = _circuit_state.get(url)
+    if state is not None and state[1] > now:
+        print(f"Skipping {label}: endpoint failing, retry after {state[1] - now:.0f}s")
+        return {}
+
+    try:
+        resp = _get_session().get(url, params=params, timeout=30)
+        resp.raise_for_status()
+        payload = decode_json(resp)
+    except Exception as e:
+        print(f"Error fetching {label}: {e}")
+        if _is_endpoint_failure(e):
+            with _circuit_lock:
+                state = _circuit_state.setdefault(url, [0, 0.0])
+                state[0] += 1
+                if state[0] >= CIRCUIT_FAILURE_THRESHOLD:
+                    state[0] = 0
+                    state[1] = time.monotonic() + CIRCUIT_COOLDOWN
+        return {}
+    with _circuit_lock:
+        _circuit_state.pop(url, None)
+
+    with _response_cache_lock:
+        if len(_response_cache) >= RESPONSE_CACHE_MAX_ENTRIES:
+            # Bỏ mục hết hạn trước, nếu vẫn đầy thì bỏ mục cũ nhất
+            for stale in [k for k, (expires_at, _) in _response_cache.items() if expires_at <= now]:
+                del _response_cache[stale]
+            if len(_response_cache) >= RESPONSE_CACHE_MAX_ENTRIES:
+                del _response_cache[next(iter(_response_cache))]
+        _response_cache[key] = (now + ttl, payload)
+    return payload
+
+
 # Các điểm quan trắc chính của Việt Nam (63 tỉnh thành + điểm quan trọng)
 VIETNAM_LOCATIONS = {
     # === MIỀN BẮC ===
@@ -90,63 +244,200 @@ VIETNAM_LOCATIONS = {
 }
 
 
-def fetch_forecast_full(lat: float, lon: float, days: int = 7) -> Dict:
+# Chỉ đọc ở cấp ngoài; dict từng địa điểm giữ nguyên vì được nhúng thẳng vào
+# payload API ("info") và bộ mã hóa JSON của FastAPI chỉ nhận dict thật
+VIETNAM_LOCATIONS = MappingProxyType(VIETNAM_LOCATIONS)
+
+# Các tỉnh ven biển (có dữ liệu Marine API)
+COASTAL_PROVINCES = frozenset({
+    "quang_ninh", "hai_phong", "thai_binh", "nam_dinh", "ninh_binh",
+    "thanh_hoa", "nghe_an", "ha_tinh", "quang_binh", "quang_tri",
+    "thua_thien_hue", "da_nang", "quang_nam", "quang_ngai", "binh_dinh",
+    "phu_yen", "khanh_hoa", "ninh_thuan", "binh_thuan", "ba_ria_vung_tau",
+    "ho_chi_minh", "ben_tre", "tra_vinh", "soc_trang", "bac_lieu",
+    "ca_mau", "kien_giang"
+})
+
+# VIETNAM_LOCATIONS dạng cột (mỗi thuộc tính một mảng) cho các phép tính
+# vector hóa: khoảng cách, lọc khung, tìm điểm gần nhất
+_LOCATION_CODES = np.array(list(VIETNAM_LOCATIONS))
+_LOCATION_LATS = np.fromiter((v["lat"] for v in VIETNAM_LOCATIONS.values()), dtype=np.float64)
+_LOCATION_LONS = np.fromiter((v["lon"] for v in VIETNAM_LOCATIONS.values()), dtype=np.float64)
+_LOCATION_INDEX = {code: i for i, code in enumerate(VIETNAM_LOCATIONS)}
+_COASTAL_MASK = np.isin(_LOCATION_CODES, list(COASTAL_PROVINCES))
+
+
+def nearest_location(lat: float, lon: float) -> Tuple[str, float]:
+    """Địa điểm gần nhất trong VIETNAM_LOCATIONS: (mã, khoảng cách km)"""
+    dist = haversine_km(lat, lon, _LOCATION_LATS, _LOCATION_LONS)
+    i = int(np.argmin(dist))
+    return str(_LOCATION_CODES[i]), round(float(dist[i]), 2)
+
+
+def locations_in_bbox(min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> List[str]:
+    """Mã các địa điểm nằm trong khung [min, max]"""
+    mask = (
+        (_LOCATION_LATS >= min_lat) & (_LOCATION_LATS <= max_lat)
+        & (_LOCATION_LONS >= min_lon) & (_LOCATION_LONS <= max_lon)
+    )
+    return _LOCATION_CODES[mask].tolist()
+
+
+# Danh sách biến Open-Meteo, nối sẵn một lần thay vì ",".join mỗi lần gọi
+_FORECAST_HOURLY = ",".join([
+    "temperature_2m",
+    "relative_humidity_2m",
+    "apparent_temperature",
+    "precipitation_probability",
+    "precipitation",
+    "rain",
+    "showers",
+    "weather_code",
+    "cloud_cover",
+    "visibility",
+    "wind_speed_10m",
+    "wind_direction_10m",
+    "wind_gusts_10m",
+    "uv_index",
+    "is_day",
+])
+_FORECAST_DAILY = ",".join([
+    "weather_code",
+    "temperature_2m_max",
+    "temperature_2m_min",
+    "apparent_temperature_max",
+    "apparent_temperature_min",
+    "sunrise",
+    "sunset",
+    "daylight_duration",
+    "sunshine_duration",
+    "uv_index_max",
+    "precipitation_sum",
+    "rain_sum",
+    "showers_sum",
+    "precipitation_hours",
+    "precipitation_probability_max",
+    "wind_speed_10m_max",
+    "wind_gusts_10m_max",
+    "wind_direction_10m_dominant",
+    "et0_fao_evapotranspiration",
+])
+_AIR_QUALITY_HOURLY = ",".join([
+    "pm10",
+    "pm2_5",
+    "carbon_monoxide",
+    "nitrogen_dioxide",
+    "sulphur_dioxide",
+    "ozone",
+    "aerosol_optical_depth",
+    "dust",
+    "uv_index",
+    "uv_index_clear_sky",
+    "alder_pollen",
+    "birch_pollen",
+    "grass_pollen",
+    "mugwort_pollen",
+    "olive_pollen",
+    "ragweed_pollen",
+    "european_aqi",
+    "us_aqi",
+])
+_MARINE_HOURLY = ",".join([
+    "wave_height",
+    "wave_direction",
+    "wave_period",
+    "wind_wave_height",
+    "wind_wave_direction",
+    "swell_wave_height",
+    "swell_wave_direction",
+    "swell_wave_period",
+])
+_MARINE_DAILY = ",".join([
+    "wave_height_max",
+    "wave_direction_dominant",
+    "wave_period_max",
+    "wind_wave_height_max",
+    "swell_wave_height_max",
+])
+_HISTORICAL_DAILY = ",".join([
+    "weather_code",
+    "temperature_2m_max",
+    "temperature_2m_min",
+    "precipitation_sum",
+    "rain_sum",
+    "precipitation_hours",
+    "wind_speed_10m_max",
+])
+
+# Tham số cố định của từng endpoint - mỗi request chỉ chép mẫu rồi thêm tọa độ
+_FLOOD_PARAMS = {"daily": "river_discharge", "forecast_days": 7}
+_AIR_QUALITY_PARAMS = {"hourly": _AIR_QUALITY_HOURLY, "timezone": "Asia/Ho_Chi_Minh"}
+_MARINE_PARAMS = {"hourly": _MARINE_HOURLY, "daily": _MARINE_DAILY, "timezone": "Asia/Ho_Chi_Minh"}
+
+
+# Open-Meteo nhận nhiều tọa độ trong một request (latitude/longitude phân tách
+# bằng dấu phẩy) và trả về mảng kết quả theo đúng thứ tự; chia lô để URL không quá dài
+BULK_MAX_LOCATIONS = 50
+
+
+def _fetch_bulk(url: str, params: Dict, coords: List[Tuple[float, float]], ttl: float, label: str) -> List[Dict]:
+    """Một request cho cả lô tọa độ -> danh sách payload (mỗi tọa độ một dict, {} nếu lỗi)"""
+    bulk_params = dict(params)
+    bulk_params["latitude"] = ",".join(str(round(lat, COORD_DECIMALS)) for lat, _ in coords)
+    bulk_params["longitude"] = ",".join(str(round(lon, COORD_DECIMALS)) for _, lon in coords)
+    payload = _fetch_json(url, bulk_params, ttl, label)
+    if isinstance(payload, list) and len(payload) == len(coords):
+        return payload
+    if len(coords) == 1 and payload:  # một tọa độ -> API trả object thay vì mảng
+        return [payload]
+    return [{} for _ in coords]
+
+
+def fetch_forecast_bulk(coords: List[Tuple[float, float]], days: int = 7,
+                        include_hourly: bool = True) -> List[Dict]:
     """
-    Lấy dự báo thời tiết đầy đủ từ Open-Meteo
-    Bao gồm: nhiệt độ, mưa, gió, độ ẩm, UV, v.v.
+    Dự báo thời tiết cho một lô tọa độ (lat, lon) trong một request.
+    include_hourly=False chỉ lấy khối daily (đủ cho phân tích cảnh báo).
     """
     params = {
-        "latitude": lat,
-        "longitude": lon,
-        "hourly": ",".join([
-            "temperature_2m",
-            "relative_humidity_2m",
-            "apparent_temperature",
-            "precipitation_probability",
-            "precipitation",
-            "rain",
-            "showers",
-            "weather_code",
-            "cloud_cover",
-            "visibility",
-            "wind_speed_10m",
-            "wind_direction_10m",
-            "wind_gusts_10m",
-            "uv_index",
-            "is_day"
-        ]),
-        "daily": ",".join([
-            "weather_code",
-            "temperature_2m_max",
-            "temperature_2m_min",
-            "apparent_temperature_max",
-            "apparent_temperature_min",
-            "sunrise",
-            "sunset",
-            "daylight_duration",
-            "sunshine_duration",
-            "uv_index_max",
-            "precipitation_sum",
-            "rain_sum",
-            "showers_sum",
-            "precipitation_hours",
-            "precipitation_probability_max",
-            "wind_speed_10m_max",
-            "wind_gusts_10m_max",
-            "wind_direction_10m_dominant",
-            "et0_fao_evapotranspiration"
-        ]),
+        "daily": _FORECAST_DAILY,
         "forecast_days": days,
         "timezone": "Asia/Ho_Chi_Minh",
     }
+    if include_hourly:
+        params["hourly"] = _FORECAST_HOURLY
+    return _fetch_bulk(OPEN_METEO_FORECAST, params, coords, FORECAST_CACHE_TTL, "forecast")
+
+
+def fetch_flood_bulk(coords: List[Tuple[float, float]]) -> List[Dict]:
+    """Dự báo lưu lượng sông (GloFAS) cho một lô tọa độ"""
+    return _fetch_bulk(OPEN_METEO_FLOOD, _FLOOD_PARAMS, coords, FLOOD_CACHE_TTL, "flood data")
 
-    try:
-        resp = requests.get(OPEN_METEO_FORECAST, params=params, timeout=30)
-        resp.raise_for_status()
-        return resp.json()
-    except Exception as e:
-        print(f"Error fetching forecast: {e}")
-        return {}
+
+def fetch_air_quality_bulk(coords: List[Tuple[float, float]]) -> List[Dict]:
+    """Chất lượng không khí cho một lô tọa độ"""
+    return _fetch_bulk(OPEN_METEO_AIR_QUALITY, _AIR_QUALITY_PARAMS, coords, AIR_QUALITY_CACHE_TTL, "air quality")
+
+
+def fetch_marine_bulk(coords: List[Tuple[float, float]]) -> List[Dict]:
+    """Dự báo biển cho một lô tọa độ ven biển"""
+    return _fetch_bulk(OPEN_METEO_MARINE, _MARINE_PARAMS, coords, MARINE_CACHE_TTL, "marine data")
+
+
+def fetch_forecast_full(lat: float, lon: float, days: int = 7) -> Dict:
+    """
+    Lấy dự báo thời tiết đầy đủ từ Open-Meteo
+    Bao gồm: nhiệt độ, mưa, gió, độ ẩm, UV, v.v.
+    """
+    return fetch_forecast_bulk([(lat, lon)], days=days)[0]
+
+
+def fetch_forecast_daily_only(lat: float, lon: float, days: int = 7) -> Dict:
+    """
+    Như fetch_forecast_full nhưng chỉ lấy khối daily (không có hourly).
+    Dùng cho luồng phân tích cảnh báo vốn chỉ đọc daily - payload nhỏ hơn ~10 lần.
+    """
+    return fetch_forecast_bulk([(lat, lon)], days=days, include_hourly=False)[0]
 
 
 def fetch_flood_forecast(lat: float, lon: float) -> Dict:
@@ -154,59 +445,14 @@ def fetch_flood_forecast(lat: float, lon: float) -> Dict:
     Lấy dự báo nguy cơ lũ từ Open-Meteo Flood API
     API này cung cấp river discharge forecast dựa trên GloFAS
     """
-    params = {
-        "latitude": lat,
-        "longitude": lon,
-        "daily": "river_discharge",
-        "forecast_days": 7,
-    }
-
-    try:
-        resp = requests.get(OPEN_METEO_FLOOD, params=params, timeout=30)
-        resp.raise_for_status()
-        return resp.json()
-    except Exception as e:
-        print(f"Error fetching flood data: {e}")
-        return {}
+    return fetch_flood_bulk([(lat, lon)])[0]
 
 
 def fetch_air_quality(lat: float, lon: float) -> Dict:
     """
     Lấy chỉ số chất lượng không khí từ Open-Meteo Air Quality API
     """
-    params = {
-        "latitude": lat,
-        "longitude": lon,
-        "hourly": ",".join([
-            "pm10",
-            "pm2_5",
-            "carbon_monoxide",
-            "nitrogen_dioxide",
-            "sulphur_dioxide",
-            "ozone",
-            "aerosol_optical_depth",
-            "dust",
-            "uv_index",
-            "uv_index_clear_sky",
-            "alder_pollen",
-            "birch_pollen",
-            "grass_pollen",
-            "mugwort_pollen",
-            "olive_pollen",
-            "ragweed_pollen",
-            "european_aqi",
-            "us_aqi"
-        ]),
-        "timezone": "Asia/Ho_Chi_Minh",
-    }
-
-    try:
-        resp = requests.get(OPEN_METEO_AIR_QUALITY, params=params, timeout=30)
-        resp.raise_for_status()
-        return resp.json()
-    except Exception as e:
-        print(f"Error fetching air quality: {e}")
-        return {}
+    return fetch_air_quality_bulk([(lat, lon)])[0]
 
 
 def fetch_marine_forecast(lat: float, lon: float) -> Dict:
@@ -214,36 +460,7 @@ def fetch_marine_forecast(lat: float, lon: float) -> Dict:
     Lấy dự báo biển từ Open-Meteo Marine API
     Cho các vùng ven biển
     """
-    params = {
-        "latitude": lat,
-        "longitude": lon,
-        "hourly": ",".join([
-            "wave_height",
-            "wave_direction",
-            "wave_period",
-            "wind_wave_height",
-            "wind_wave_direction",
-            "swell_wave_height",
-            "swell_wave_direction",
-            "swell_wave_period"
-        ]),
-        "daily": ",".join([
-            "wave_height_max",
-            "wave_direction_dominant",
-            "wave_period_max",
-            "wind_wave_height_max",
-            "swell_wave_height_max"
-        ]),
-        "timezone": "Asia/Ho_Chi_Minh",
-    }
-
-    try:
-        resp = requests.get(OPEN_METEO_MARINE, params=params, timeout=30)
-        resp.raise_for_status()
-        return resp.json()
-    except Exception as e:
-        print(f"Error fetching marine data: {e}")
-        return {}
+    return fetch_marine_bulk([(lat, lon)])[0]
 
 
 def fetch_historical_weather(lat: float, lon: float, start_date: str, end_date: str) -> Dict:
@@ -252,33 +469,20 @@ def fetch_historical_weather(lat: float, lon: float, start_date: str, end_date:
     Có thể lấy dữ liệu từ 1940 đến hiện tại
     """
     params = {
-        "latitude": lat,
-        "longitude": lon,
+        "latitude": round(lat, COORD_DECIMALS),
+        "longitude": round(lon, COORD_DECIMALS),
         "start_date": start_date,
         "end_date": end_date,
-        "daily": ",".join([
-            "weather_code",
-            "temperature_2m_max",
-            "temperature_2m_min",
-            "precipitation_sum",
-            "rain_sum",
-            "precipitation_hours",
-            "wind_speed_10m_max"
-        ]),
+        "daily": _HISTORICAL_DAILY,
         "timezone": "Asia/Ho_Chi_Minh",
     }
 
-    try:
-        resp = requests.get(OPEN_METEO_HISTORICAL, params=params, timeout=30)
-        resp.raise_for_status()
-        return resp.json()
-    except Exception as e:
-        print(f"Error fetching historical data: {e}")
-        return {}
+    return _fetch_json(OPEN_METEO_HISTORICAL, params, HISTORICAL_CACHE_TTL, "historical data")
 
 
 def get_all_vietnam_weather(locations: List[str] = None, include_flood: bool = True,
-                            include_air_quality: bool = False, include_marine: bool = False) -> Dict:
+                            include_air_quality: bool = False, include_marine: bool = False,
+                            summary_only: bool = False) -> Dict:
     """
     Lấy dữ liệu thời tiết cho nhiều địa điểm ở Việt Nam
 
@@ -287,6 +491,7 @@ def get_all_vietnam_weather(locations: List[str] = None, include_flood: bool = T
         include_flood: Có lấy dữ liệu dự báo lũ không
         include_air_quality: Có lấy chỉ số chất lượng không khí không
         include_marine: Có lấy dữ liệu biển không (cho vùng ven biển)
+        summary_only: Chỉ lấy dự báo daily, bỏ hourly (đủ cho analyze_weather_for_alerts)
     """
     if locations is None:
         locations = list(VIETNAM_LOCATIONS.keys())
@@ -297,444 +502,639 @@ def get_all_vietnam_weather(locations: List[str] = None, include_flood: bool = T
         "locations": {}
     }
 
-    for loc_code in locations:
-        if loc_code not in VIETNAM_LOCATIONS:
-            continue
-
-        loc_info = VIETNAM_LOCATIONS[loc_code]
-        lat, lon = loc_info["lat"], loc_info["lon"]
-
-        print(f"Fetching weather for {loc_info['name']}...")
-
-        loc_data = {
-            "info": loc_info,
-            "forecast": fetch_forecast_full(lat, lon),
-        }
-
-        if include_flood:
-            loc_data["flood"] = fetch_flood_forecast(lat, lon)
-
-        if include_air_quality:
-            loc_data["air_quality"] = fetch_air_quality(lat, lon)
-
+    codes = [code for code in dict.fromkeys(locations) if code in _LOCATION_INDEX]
+    for loc_code in codes:
+        results["locations"][loc_code] = {"info": VIETNAM_LOCATIONS[loc_code]}
+    # Chỉ số vào các mảng cột - lô tọa độ lấy bằng cắt mảng thay vì tra dict từng tỉnh
+    indices = np.fromiter((_LOCATION_INDEX[c] for c in codes), dtype=np.intp, count=len(codes))
+
+    # Mỗi endpoint một request cho cả lô tọa độ (thay vì một request mỗi tỉnh)
+    endpoints = [("forecast", partial(fetch_forecast_bulk, include_hourly=not summary_only), indices)]
+    if include_flood:
+        endpoints.append(("flood", fetch_flood_bulk, indices))
+    if include_air_quality:
+        endpoints.append(("air_quality", fetch_air_quality_bulk, indices))
+    if include_marine:
         # Chỉ lấy dữ liệu biển cho vùng ven biển
-        coastal_provinces = [
-            "quang_ninh", "hai_phong", "thai_binh", "nam_dinh", "ninh_binh",
-            "thanh_hoa", "nghe_an", "ha_tinh", "quang_binh", "quang_tri",
-            "thua_thien_hue", "da_nang", "quang_nam", "quang_ngai", "binh_dinh",
-            "phu_yen", "khanh_hoa", "ninh_thuan", "binh_thuan", "ba_ria_vung_tau",
-            "ho_chi_minh", "ben_tre", "tra_vinh", "soc_trang", "bac_lieu",
-            "ca_mau", "kien_giang"
-        ]
-
-        if include_marine and loc_code in coastal_provinces:
-            loc_data["marine"] = fetch_marine_forecast(lat, lon)
-
-        results["locations"][loc_code] = loc_data
+        endpoints.append(("marine", fetch_marine_bulk, indices[_COASTAL_MASK[indices]]))
+
+    # Các lô chạy song song; I/O mạng chiếm gần hết thời gian
+    jobs = []
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_FETCHES) as executor:
+        for key, fetch, endpoint_indices in endpoints:
+            for start in range(0, len(endpoint_indices), BULK_MAX_LOCATIONS):
+                lot = endpoint_indices[start:start + BULK_MAX_LOCATIONS]
+                batch = _LOCATION_CODES[lot].tolist()
+                print(f"Fetching {key} for {len(batch)} locations...")
+                coords = list(zip(_LOCATION_LATS[lot].tolist(), _LOCATION_LONS[lot].tolist()))
+                jobs.append((key, batch, executor.submit(fetch, coords)))
+
+        # _fetch_json tự bắt lỗi và trả {} nên result() không ném ngoại lệ
+        for key, batch, future in jobs:
+            for loc_code, payload in zip(batch, future.result()):
+                results["locations"][loc_code][key] = payload
 
     return results
 
 
-def analyze_weather_for_alerts(weather_data: Dict) -> List[Dict]:
+# Các cột daily dùng trong analyze_weather_for_alerts: cột xét ngưỡng (luôn đọc)
+# và cột chi tiết (chỉ đọc khi địa điểm có ngày cần cảnh báo)
+_ALERT_THRESHOLD_KEYS = (
+    "precipitation_sum",
+    "temperature_2m_max",
+    "temperature_2m_min",
+    "uv_index_max",
+    "wind_gusts_10m_max",
+    "et0_fao_evapotranspiration",
+)
+_ALERT_DETAIL_KEYS = (
+    "wind_speed_10m_max",
+    "weather_code",
+    "precipitation_hours",
+    "precipitation_probability_max",
+    "apparent_temperature_max",
+    "apparent_temperature_min",
+    "sunshine_duration",
+    "wind_direction_10m_dominant",
+)
+
+
+# Mốc phân cấp (so với giá trị >= mốc): chỉ số -> _SEVERITY / cấp Beaufort
+_SEVERITY = ("low", "medium", "high", "critical")
+_RAIN_SEVERITY_CUTS = np.array([50, 70, 100], dtype=np.float64)      # mưa >= 30mm
+_WIND_SEVERITY_CUTS = np.array([80, 100], dtype=np.float64)          # gió giật >= 60 km/h
+_UV_SEVERITY_CUTS = np.array([9, 11], dtype=np.float64)              # UV >= 8
+_HEAT_TEMP_CUTS = np.array([37, 39], dtype=np.float64)                # nhiệt độ cao nhất >= 35°C
+_HEAT_APPARENT_CUTS = np.array([40, 42], dtype=np.float64)            # cảm nhận, nâng cấp nắng nóng
+_BEAUFORT_GUST_CUTS = np.array([62, 75, 89, 103, 118], dtype=np.float64)  # cấp 7 + chỉ số
+
+# Văn bản theo cùng chỉ số phân cấp ở trên (tra tuple thay vì chuỗi if/else)
+_RAIN_DESC_SUFFIX = (
+    "Mưa vừa đến lớn.",
+    "Mưa vừa đến lớn.",
+    "Mưa lớn, cần đề phòng ngập cục bộ.",
+    "Mưa rất lớn, nguy cơ ngập úng cao.",
+)
+_WIND_DANGER_LEVEL = ("Cần cảnh giác", "Nguy hiểm", "Rất nguy hiểm")
+_HEAT_DESC_SUFFIX = ("Chú ý bổ sung nước.", "Hạn chế hoạt động ngoài trời.", "Nguy hiểm cho sức khỏe, tránh ra ngoài.")
+_DEHYDRATION_RISK = ("Trung bình", "Cao", "Rất cao")
+
+# Nhãn cho giá trị đơn lẻ trong ngày: bisect_right trên mốc (>= mốc) thay chuỗi if/else
+_RAIN_INTENSITY_CUTS = (25, 50, 100)
+_RAIN_INTENSITY = ("Mưa nhỏ", "Mưa vừa", "Mưa to", "Mưa rất to")
+_UV_LEVEL_CUTS = (6, 8, 11)
+_UV_LEVEL = ("Trung bình", "Cao", "Rất cao", "Cực kỳ cao")
+_WIND_LEVEL_CUTS = (62, 75, 89)
+_WIND_LEVEL = ("Gió khá mạnh", "Gió mạnh", "Gió mạnh cấp 8-9", "Bão")
+_UV_ALERT_LEVEL = ("Rất cao", "Rất cao", "Cực kỳ cao")
+
+# Rét - mốc nhiệt độ thấp nhất (<= mốc, side="left") -> (mức độ, loại, cấp rét)
+_COLD_TEMP_CUTS = np.array([5, 10, 11, 13], dtype=np.float64)         # nhiệt độ thấp nhất <= 15°C
+_COLD_LEVELS = (
+    ("critical", "Rét hại", "Rét hại nghiêm trọng"),
+    ("high", "Rét hại", "Rét hại"),
+    ("high", "Rét đậm", "Rét đậm"),
+    ("medium", "Rét đậm", "Rét đậm"),
+    ("medium", "Rét", "Trời rét"),
+)
+
+# Mô tả rét - theo [nhiệt độ thấp nhất <= 10 °C]; {apparent} là câu cảm nhận hoặc rỗng
+_COLD_DESC_TEMPLATES = (
+    "Nhiệt độ thấp nhất dự báo {temp_min:.1f}°C vào ngày {date}. {apparent}Cần giữ ấm cơ thể.",
+    "Nhiệt độ thấp nhất dự báo {temp_min:.1f}°C vào ngày {date}. {apparent}Nguy hiểm cho sức khỏe.",
+)
+
+# Lũ - mốc lưu lượng sông (m³/s) -> (mức độ, mô tả); cấp 0 là dưới ngưỡng cảnh báo
+_FLOOD_DISCHARGE_CUTS = np.array([1000, 2000, 5000], dtype=np.float64)
+_FLOOD_LEVELS = (
+    None,
+    ("medium", "Mực nước có thể dâng cao."),
+    ("high", "Nguy cơ lũ cao, cần theo dõi."),
+    ("critical", "Nguy cơ lũ rất cao."),
+)
+
+
+# Khuyến nghị dựng sẵn một tuple cho mỗi loại/bậc cảnh báo - mọi cảnh báo cùng
+# bậc dùng chung thay vì tạo list mới (chỉ đọc; JSON hóa vẫn ra mảng như cũ)
+# Mưa - theo rain_severity: <50, 50-70, 70-100, >=100 mm
+_RAIN_RECOMMENDATIONS = tuple(
+    (
+        "Hạn chế ra ngoài khi có mưa to",
+        "Tránh xa các vùng trũng, dễ ngập",
+        "Kiểm tra hệ thống thoát nước",
+        "Chuẩn bị đèn pin, nến phòng mất điện" if tier >= 2 else "Mang theo áo mưa khi ra ngoài",
+        "Không lội qua vùng nước ngập" if tier >= 1 else "Cẩn thận đường trơn trượt",
+    )
+    for tier in range(4)
+)
+
+# Nắng nóng - [bậc nhiệt: <37, 37-39, >=39 °C][UV >= 8]
+_HEAT_RECOMMENDATIONS = tuple(
+    tuple(
+        (
+            "KHÔNG ra ngoài từ 10h-16h" if tier >= 2 else "Hạn chế ra ngoài từ 10h-16h",
+            "Uống 3-4 lít nước/ngày" if tier >= 1 else "Uống ít nhất 2 lít nước/ngày",
+            "Người già, trẻ em, người bệnh tim mạch cần ở trong nhà mát",
+            "Mặc quần áo thoáng mát, màu sáng",
+            "Sử dụng kem chống nắng SPF 50+" if uv_high else "Đội mũ, kính râm khi ra ngoài",
+            "Tránh lao động nặng ngoài trời" if tier >= 1 else "Nghỉ ngơi trong bóng râm",
+        )
+        for uv_high in (False, True)
+    )
+    for tier in range(3)
+)
+
+# Nắng nóng cục bộ - [UV >= 8]
+_HEAT_LOCAL_RECOMMENDATIONS = tuple(
+    (
+        "Hạn chế hoạt động ngoài trời từ 11h-15h",
+        "Uống đủ nước, tránh đồ uống có cồn",
+        "Đội mũ, mặc áo dài tay khi ra ngoài",
+        "Chú ý bảo vệ da khi UV cao" if uv_high else "Nghỉ ngơi nơi thoáng mát",
+    )
+    for uv_high in (False, True)
+)
+
+# Gió mạnh - theo wind_severity: gió giật <80, 80-100, >=100 km/h
+_WIND_RECOMMENDATIONS = tuple(
+    (
+        "Chằng chống nhà cửa, cắt tỉa cành cây",
+        "Không đứng dưới cây lớn hoặc biển quảng cáo",
+        "Tàu thuyền không ra khơi",
+        "Di chuyển đồ vật có thể bay" if tier >= 1 else "Đóng cửa sổ, cửa ra vào",
+        "Sơ tán khỏi nhà yếu" if tier >= 2 else "Ở trong nhà kiên cố",
+        "Tránh xa bờ biển và sông" if tier >= 1 else "Hạn chế ra ngoài",
+    )
+    for tier in range(3)
+)
+
+# Rét - [nhiệt độ thấp nhất <= 10 °C]
+_COLD_RECOMMENDATIONS = tuple(
+    (
+        "Mặc đủ ấm, nhiều lớp áo",
+        "Giữ ấm tay chân, đầu, cổ",
+        "Người già, trẻ em hạn chế ra ngoài",
+        "Không sưởi ấm bằng than trong phòng kín",
+        "Che chắn chuồng trại gia súc, gia cầm" if severe else "Uống nước ấm, ăn đủ chất",
+        "Kiểm tra sức khỏe người già, trẻ nhỏ thường xuyên" if severe else "Hạn chế tắm khuya",
+    )
+    for severe in (False, True)
+)
+
+# Nắng nóng - (mức độ, cấp nắng nóng, tiêu đề) theo heat_tier
+_HEAT_LEVELS = (
+    ("medium", "Nắng nóng", "Cảnh báo nắng nóng"),
+    ("high", "Nắng nóng gay gắt", "Nắng nóng gay gắt"),
+    ("critical", "Nắng nóng đặc biệt gay gắt", "Nắng nóng đặc biệt gay gắt"),
+)
+
+_UV_RECOMMENDATIONS = (
+    "Tránh ra ngoài từ 10h-15h",
+    "Sử dụng kem chống nắng SPF 50+",
+    "Đội mũ, mặc áo dài tay khi ra ngoài",
+    "Đeo kính râm bảo vệ mắt",
+    "Uống nhiều nước",
+)
+
+_DROUGHT_RECOMMENDATIONS = (
+    "Tiết kiệm nước sinh hoạt",
+    "Tưới cây vào sáng sớm hoặc chiều tối",
+    "Che phủ đất để giữ ẩm",
+    "Dự trữ nước cho gia súc, gia cầm",
+    "Theo dõi nguồn nước sinh hoạt",
+    "Phòng chống cháy rừng",
+)
+
+_FLOOD_RECOMMENDATIONS = (
+    "Theo dõi diễn biến mưa lũ qua đài phát thanh",
+    "Chuẩn bị sẵn sàng sơ tán nếu ở vùng trũng",
+    "Dự trữ lương thực, nước uống, đèn pin",
+)
+
+
+def _scan_alert_days(precip, temp_max, temp_min, gust, uv, et0) -> Tuple[np.ndarray, ...]:
     """
-    Phân tích dữ liệu thời tiết và tạo cảnh báo thực
-    Dựa trên dữ liệu thật từ Open-Meteo
+    Quét ngưỡng của cả chuỗi ngày một lần, trả về mặt nạ bool cho từng loại cảnh báo:
+    (mưa lớn, nắng nóng, nắng nóng cục bộ, gió mạnh, UV cao, rét, hạn hán).
+    Ô thiếu dữ liệu là NaN nên mọi phép so sánh đều False.
     """
+    return (
+        precip >= 30,
+        temp_max >= 35,
+        (temp_max >= 33) & (temp_max < 35),  # còn xét thêm cảm nhận/UV khi dựng cảnh báo
+        gust >= 60,
+        uv >= 8,
+        temp_min <= 15,
+        (precip < 5) & (temp_max >= 32) & (et0 >= 5),
+    )
+
+
+def _pad_daily(daily: Dict, key: str, n_days: int) -> List:
+    """Cột daily[key] cắt/đệm None cho đủ n_days phần tử"""
+    values = daily.get(key, [])[:n_days]
+    if len(values) < n_days:
+        values = values + [None] * (n_days - len(values))
+    return values
+
+
+def _analyze_location(loc_code: str, loc_data: Dict) -> List[Dict]:
+    """Cảnh báo cho một địa điểm (độc lập với các địa điểm khác)"""
     alerts = []
-    today = datetime.now().strftime("%Y-%m-%d")
-
-    for loc_code, loc_data in weather_data.get("locations", {}).items():
-        loc_info = loc_data.get("info", {})
-        forecast = loc_data.get("forecast", {})
-        flood = loc_data.get("flood", {})
-
-        if not forecast:
-            continue
 
-        daily = forecast.get("daily", {})
-
-        # Lấy dữ liệu ngày hôm nay và các ngày tới
-        dates = daily.get("time", [])
-        temps_max = daily.get("temperature_2m_max", [])
-        temps_min = daily.get("temperature_2m_min", [])
-        precipitation = daily.get("precipitation_sum", [])
-        rain = daily.get("rain_sum", [])
-        uv_max = daily.get("uv_index_max", [])
-        wind_max = daily.get("wind_speed_10m_max", [])
-        wind_gusts = daily.get("wind_gusts_10m_max", [])
-        weather_codes = daily.get("weather_code", [])
-
-        for i, date in enumerate(dates[:7]):  # 7 ngày tới
-            if i >= len(precipitation):
-                break
-
-            precip = precipitation[i] if precipitation[i] else 0
-            temp_max = temps_max[i] if i < len(temps_max) else None
-            temp_min = temps_min[i] if i < len(temps_min) else None
-            uv = uv_max[i] if i < len(uv_max) else None
-            wind = wind_max[i] if i < len(wind_max) else None
-            gust = wind_gusts[i] if i < len(wind_gusts) else None
-            weather_code = weather_codes[i] if i < len(weather_codes) else None
-
-            # === CẢNH BÁO MƯA LỚN ===
-            if precip >= 30:
-                severity = "critical" if precip >= 100 else "high" if precip >= 70 else "medium" if precip >= 50 else "low"
-                # Tính toán thêm các chỉ số
-                rain_intensity = "Mưa rất to" if precip >= 100 else "Mưa to" if precip >= 50 else "Mưa vừa" if precip >= 25 else "Mưa nhỏ"
-                flood_risk = round(min(100, (precip / 150) * 100), 0)  # % nguy cơ ngập
-                precip_hours = daily.get("precipitation_hours", [])[i] if i < len(daily.get("precipitation_hours", [])) else None
-                precip_prob = daily.get("precipitation_probability_max", [])[i] if i < len(daily.get("precipitation_probability_max", [])) else None
+    loc_info = loc_data.get("info", {})
+    loc_name = loc_info.get("name", loc_code)
+    # Một danh sách dùng chung cho mọi cảnh báo của địa điểm (list chứ không tuple:
+    # alert_repository ghi thẳng vào cột mảng qua psycopg2)
+    provinces = [loc_name]
+    forecast = loc_data.get("forecast", {})
+    flood = loc_data.get("flood", {})
+
+    if not forecast:
+        return []
+
+    daily = forecast.get("daily", {})
+
+    # Lấy dữ liệu ngày hôm nay và các ngày tới (tối đa 7 ngày, không quá số ngày có mưa)
+    # Intern ngày: cùng 7 chuỗi ngày lặp lại ở mọi địa điểm/cảnh báo -> dùng chung một bản
+    dates = [sys.intern(d) for d in daily.get("time", [])[:7]]
+    n_days = min(len(dates), len(daily.get("precipitation_sum", [])))
+    column = {key: _pad_daily(daily, key, n_days) for key in _ALERT_THRESHOLD_KEYS}
+    precipitation = [p if p else 0 for p in column["precipitation_sum"]]
+    temps_max = column["temperature_2m_max"]
+    temps_min = column["temperature_2m_min"]
+    uv_max = column["uv_index_max"]
+    wind_gusts = column["wind_gusts_10m_max"]
+
+    # Lọc vector hóa: mặt nạ từng loại cảnh báo, chỉ duyệt những ngày chạm ít nhất một ngưỡng
+    precip_arr = np.array(precipitation, dtype=np.float64)
+    temp_max_arr = np.array(temps_max, dtype=np.float64)
+    gust_arr = np.array(wind_gusts, dtype=np.float64)
+    uv_arr = np.array(uv_max, dtype=np.float64)
+    et0_arr = np.array(column["et0_fao_evapotranspiration"], dtype=np.float64)
+    temp_min_arr = np.array(temps_min, dtype=np.float64)
+    day_masks = _scan_alert_days(precip_arr, temp_max_arr, temp_min_arr, gust_arr, uv_arr, et0_arr)
+    candidate_days = np.flatnonzero(np.logical_or.reduce(day_masks))
+    if candidate_days.size:
+        rain_days, heat_days, heat_local_days, wind_days, uv_days, cold_days, drought_days = (
+            mask.tolist() for mask in day_masks
+        )
+        # Ngày không chạm ngưỡng nào (phần lớn thời gian) không cần các cột
+        # chi tiết lẫn phân cấp - chỉ dựng khi địa điểm có ít nhất một ngày cảnh báo
+        column.update((key, _pad_daily(daily, key, n_days)) for key in _ALERT_DETAIL_KEYS)
+        wind_max = column["wind_speed_10m_max"]
+        weather_codes = column["weather_code"]
+        # Phân cấp cả cột một lần (searchsorted trên các mốc) thay vì chuỗi if/else từng ngày
+        rain_severity = np.searchsorted(_RAIN_SEVERITY_CUTS, precip_arr, side="right").tolist()
+        wind_severity = np.searchsorted(_WIND_SEVERITY_CUTS, gust_arr, side="right").tolist()
+        beaufort = np.searchsorted(_BEAUFORT_GUST_CUTS, gust_arr, side="right").tolist()
+        uv_severity = np.searchsorted(_UV_SEVERITY_CUTS, uv_arr, side="right").tolist()
+        cold_tier = np.searchsorted(_COLD_TEMP_CUTS, temp_min_arr, side="left").tolist()
+        # Nắng nóng lấy cấp cao hơn giữa nhiệt độ và nhiệt độ cảm nhận; thiếu cảm nhận
+        # (NaN) coi như -inf để không nâng cấp (searchsorted xếp NaN cuối mảng)
+        apparent_arr = np.nan_to_num(
+            np.array(column["apparent_temperature_max"], dtype=np.float64), nan=-np.inf
+        )
+        heat_temp_tier = np.searchsorted(_HEAT_TEMP_CUTS, temp_max_arr, side="right")
+        heat_tier = np.maximum(
+            heat_temp_tier, np.searchsorted(_HEAT_APPARENT_CUTS, apparent_arr, side="right")
+        ).tolist()
+        heat_temp_tier = heat_temp_tier.tolist()
+
+    for i in candidate_days.tolist():
+        date = dates[i]
+        day_id = f"{loc_code}_{date}"  # hậu tố id chung cho mọi cảnh báo trong ngày
+        precip = precipitation[i]
+        temp_max = temps_max[i]
+        temp_min = temps_min[i]
+        uv = uv_max[i]
+        wind = wind_max[i]
+        gust = wind_gusts[i]
+        # Làm tròn một lần mỗi ngày, dùng chung cho mọi loại cảnh báo trong ngày
+        # (round() chứ không np.round: np.round lệch ở các giá trị .x5, vd 46.85 -> 46.8)
+        temp_max_r, temp_min_r, wind_r, gust_r, uv_r, precip_r = (
+            round(v, 1) if v is not None else None
+            for v in (temp_max, temp_min, wind, gust, uv, precip)
+        )
+        weather_code = weather_codes[i]
+        # Mã 0 (Trời quang) là mã hợp lệ - chỉ bỏ qua khi thiếu dữ liệu
+        weather_desc = get_weather_description(weather_code) if weather_code is not None else None
+
+        # === CẢNH BÁO MƯA LỚN ===
+        if rain_days[i]:
+            severity = _SEVERITY[rain_severity[i]]
+            # Tính toán thêm các chỉ số
+            rain_intensity = _RAIN_INTENSITY[bisect_right(_RAIN_INTENSITY_CUTS, precip)]
+            flood_risk = round(min(100, (precip / 150) * 100), 0)  # % nguy cơ ngập
+            precip_hours = column["precipitation_hours"][i]
+            precip_prob = column["precipitation_probability_max"][i]
+
+            alerts.append({
+                "id": "rain_" + day_id,
+                "type": "heavy_rain",
+                "category": "Mưa lớn",
+                "title": f"Cảnh báo mưa lớn - {loc_name}",
+                "severity": severity,
+                "date": date,
+                "region": loc_name,
+                "provinces": provinces,
+                "description": f"Dự báo lượng mưa {precip:.1f}mm trong ngày {date}. {_RAIN_DESC_SUFFIX[rain_severity[i]]}",
+                "data": {
+                    "rainfall_mm": precip_r,
+                    "rain_intensity": rain_intensity,
+                    "precipitation_hours": round(precip_hours, 1) if precip_hours else None,
+                    "precipitation_probability": round(precip_prob) if precip_prob else None,
+                    "flood_risk_percent": flood_risk,
+                    "weather_code": weather_code,
+                    "weather_description": weather_desc,
+                    "wind_speed_kmh": wind_r if wind else None,
+                    "wind_gust_kmh": gust_r if gust else None,
+                    "temp_max_c": temp_max_r if temp_max else None,
+                    "temp_min_c": temp_min_r if temp_min else None,
+                    "humidity_note": "Độ ẩm cao" if precip >= 50 else "Độ ẩm tăng",
+                },
+                "recommendations": _RAIN_RECOMMENDATIONS[rain_severity[i]],
+                "source": "Open-Meteo API"
+            })
+
+        # === CẢNH BÁO NẮNG NÓNG ===
+        # Theo QCVN: Nắng nóng >= 35°C, Nắng nóng gay gắt >= 37°C, Đặc biệt gay gắt >= 39°C
+        if heat_days[i]:
+            apparent_max = column["apparent_temperature_max"][i]
+            sunshine_hours = column["sunshine_duration"][i]
+            sunshine_hours = round(sunshine_hours / 3600, 1) if sunshine_hours else None
+
+            severity, heat_level, title_prefix = _HEAT_LEVELS[heat_tier[i]]
+            category = "Nắng nóng"
+            title = f"{title_prefix} - {loc_name}"
+
+            alerts.append({
+                "id": "heat_" + day_id,
+                "type": "heat_wave",
+                "category": category,
+                "title": title,
+                "severity": severity,
+                "date": date,
+                "region": loc_name,
+                "provinces": provinces,
+                "description": f"Nhiệt độ cao nhất {temp_max:.1f}°C" +
+                               (f", cảm giác thực tế {apparent_max:.1f}°C" if apparent_max else "") +
+                               f" vào ngày {date}. " +
+                               _HEAT_DESC_SUFFIX[heat_temp_tier[i]],
+                "data": {
+                    "max_temperature_c": temp_max_r,
+                    "min_temperature_c": temp_min_r if temp_min else None,
+                    "apparent_temperature_c": round(apparent_max, 1) if apparent_max else None,
+                    "heat_level": heat_level,
+                    "uv_index": uv_r if uv else None,
+                    "uv_level": _UV_LEVEL[bisect_right(_UV_LEVEL_CUTS, uv)] if uv else None,
+                    "sunshine_hours": sunshine_hours,
+                    "weather_code": weather_code,
+                    "weather_description": weather_desc,
+                    "wind_speed_kmh": wind_r if wind else None,
+                    "dehydration_risk": _DEHYDRATION_RISK[heat_temp_tier[i]],
+                },
+                "recommendations": _HEAT_RECOMMENDATIONS[heat_temp_tier[i]][bool(uv and uv >= 8)],
+                "source": "Open-Meteo API"
+            })
+
+        # === CẢNH BÁO NẮNG NÓNG CỤC BỘ ===
+        # Khi nhiệt độ 33-35°C nhưng apparent (cảm giác) >= 37°C hoặc UV rất cao
+        elif heat_local_days[i]:
+            apparent_max = column["apparent_temperature_max"][i]
+            sunshine_hours = column["sunshine_duration"][i]
+            sunshine_hours = round(sunshine_hours / 3600, 1) if sunshine_hours else None
+
+            # Chỉ cảnh báo nếu cảm giác nóng hơn hoặc UV cao
+            if (apparent_max and apparent_max >= 37) or (uv and uv >= 9):
+                severity = "medium" if (apparent_max and apparent_max >= 38) or (uv and uv >= 10) else "low"
 
                 alerts.append({
-                    "id": f"rain_{loc_code}_{date}",
-                    "type": "heavy_rain",
-                    "category": "Mưa lớn",
-                    "title": f"Cảnh báo mưa lớn - {loc_info.get('name', loc_code)}",
+                    "id": "heat_local_" + day_id,
+                    "type": "heat_local",
+                    "category": "Nắng nóng cục bộ",
+                    "title": f"Nắng nóng cục bộ - {loc_name}",
                     "severity": severity,
                     "date": date,
-                    "region": loc_info.get("name", loc_code),
-                    "provinces": [loc_info.get("name", loc_code)],
-                    "description": f"Dự báo lượng mưa {precip:.1f}mm trong ngày {date}. " +
-                                   ("Mưa rất lớn, nguy cơ ngập úng cao." if precip >= 100 else
-                                    "Mưa lớn, cần đề phòng ngập cục bộ." if precip >= 70 else
-                                    "Mưa vừa đến lớn."),
-                    "data": {
-                        "rainfall_mm": round(precip, 1),
-                        "rain_intensity": rain_intensity,
-                        "precipitation_hours": round(precip_hours, 1) if precip_hours else None,
-                        "precipitation_probability": round(precip_prob) if precip_prob else None,
-                        "flood_risk_percent": flood_risk,
-                        "weather_code": weather_code,
-                        "weather_description": get_weather_description(weather_code) if weather_code else None,
-                        "wind_speed_kmh": round(wind, 1) if wind else None,
-                        "wind_gust_kmh": round(gust, 1) if gust else None,
-                        "temp_max_c": round(temp_max, 1) if temp_max else None,
-                        "temp_min_c": round(temp_min, 1) if temp_min else None,
-                        "humidity_note": "Độ ẩm cao" if precip >= 50 else "Độ ẩm tăng",
-                    },
-                    "recommendations": [
-                        "Hạn chế ra ngoài khi có mưa to",
-                        "Tránh xa các vùng trũng, dễ ngập",
-                        "Kiểm tra hệ thống thoát nước",
-                        "Chuẩn bị đèn pin, nến phòng mất điện" if precip >= 70 else "Mang theo áo mưa khi ra ngoài",
-                        "Không lội qua vùng nước ngập" if precip >= 50 else "Cẩn thận đường trơn trượt",
-                    ],
-                    "source": "Open-Meteo API"
-                })
-
-            # === CẢNH BÁO NẮNG NÓNG ===
-            # Theo QCVN: Nắng nóng >= 35°C, Nắng nóng gay gắt >= 37°C, Đặc biệt gay gắt >= 39°C
-            if temp_max and temp_max >= 35:
-                apparent_max = daily.get("apparent_temperature_max", [])[i] if i < len(daily.get("apparent_temperature_max", [])) else None
-                sunshine_hours = daily.get("sunshine_duration", [])[i] if i < len(daily.get("sunshine_duration", [])) else None
-                sunshine_hours = round(sunshine_hours / 3600, 1) if sunshine_hours else None
-
-                # Xác định loại nắng nóng và mức độ
-                if temp_max >= 39 or (apparent_max and apparent_max >= 42):
-                    severity = "critical"
-                    category = "Nắng nóng"
-                    heat_level = "Nắng nóng đặc biệt gay gắt"
-                    title = f"Nắng nóng đặc biệt gay gắt - {loc_info.get('name', loc_code)}"
-                elif temp_max >= 37 or (apparent_max and apparent_max >= 40):
-                    severity = "high"
-                    category = "Nắng nóng"
-                    heat_level = "Nắng nóng gay gắt"
-                    title = f"Nắng nóng gay gắt - {loc_info.get('name', loc_code)}"
-                else:
-                    severity = "medium"
-                    category = "Nắng nóng"
-                    heat_level = "Nắng nóng"
-                    title = f"Cảnh báo nắng nóng - {loc_info.get('name', loc_code)}"
-
-                alerts.append({
-                    "id": f"heat_{loc_code}_{date}",
-                    "type": "heat_wave",
-                    "category": category,
-                    "title": title,
-                    "severity": severity,
-                    "date": date,
-                    "region": loc_info.get("name", loc_code),
-                    "provinces": [loc_info.get("name", loc_code)],
-                    "description": f"Nhiệt độ cao nhất {temp_max:.1f}°C" +
+                    "region": loc_name,
+                    "provinces": provinces,
+                    "description": f"Nhiệt độ {temp_max:.1f}°C" +
                                    (f", cảm giác thực tế {apparent_max:.1f}°C" if apparent_max else "") +
-                                   f" vào ngày {date}. " +
-                                   ("Nguy hiểm cho sức khỏe, tránh ra ngoài." if temp_max >= 39 else
-                                    "Hạn chế hoạt động ngoài trời." if temp_max >= 37 else "Chú ý bổ sung nước."),
+                                   (f", chỉ số UV {uv:.0f}" if uv else "") +
+                                   f" vào ngày {date}. Có thể nắng nóng cục bộ vào buổi trưa.",
                     "data": {
-                        "max_temperature_c": round(temp_max, 1),
-                        "min_temperature_c": round(temp_min, 1) if temp_min else None,
+                        "max_temperature_c": temp_max_r,
+                        "min_temperature_c": temp_min_r if temp_min else None,
                         "apparent_temperature_c": round(apparent_max, 1) if apparent_max else None,
-                        "heat_level": heat_level,
-                        "uv_index": round(uv, 1) if uv else None,
-                        "uv_level": "Cực kỳ cao" if uv and uv >= 11 else "Rất cao" if uv and uv >= 8 else "Cao" if uv and uv >= 6 else "Trung bình" if uv else None,
+                        "heat_level": "Nắng nóng cục bộ",
+                        "uv_index": uv_r if uv else None,
+                        # Nắng nóng cục bộ không tách mức "Cực kỳ cao"
+                        "uv_level": _UV_LEVEL[min(bisect_right(_UV_LEVEL_CUTS, uv), 2)] if uv else "Trung bình",
                         "sunshine_hours": sunshine_hours,
                         "weather_code": weather_code,
-                        "weather_description": get_weather_description(weather_code) if weather_code else None,
-                        "wind_speed_kmh": round(wind, 1) if wind else None,
-                        "dehydration_risk": "Rất cao" if temp_max >= 39 else "Cao" if temp_max >= 37 else "Trung bình",
+                        "weather_description": weather_desc,
+                        "wind_speed_kmh": wind_r if wind else None,
                     },
-                    "recommendations": [
-                        "KHÔNG ra ngoài từ 10h-16h" if temp_max >= 39 else "Hạn chế ra ngoài từ 10h-16h",
-                        "Uống 3-4 lít nước/ngày" if temp_max >= 37 else "Uống ít nhất 2 lít nước/ngày",
-                        "Người già, trẻ em, người bệnh tim mạch cần ở trong nhà mát",
-                        "Mặc quần áo thoáng mát, màu sáng",
-                        "Sử dụng kem chống nắng SPF 50+" if uv and uv >= 8 else "Đội mũ, kính râm khi ra ngoài",
-                        "Tránh lao động nặng ngoài trời" if temp_max >= 37 else "Nghỉ ngơi trong bóng râm"
-                    ],
+                    "recommendations": _HEAT_LOCAL_RECOMMENDATIONS[bool(uv and uv >= 8)],
                     "source": "Open-Meteo API"
                 })
 
-            # === CẢNH BÁO NẮNG NÓNG CỤC BỘ ===
-            # Khi nhiệt độ 33-35°C nhưng apparent (cảm giác) >= 37°C hoặc UV rất cao
-            elif temp_max and temp_max >= 33 and temp_max < 35:
-                apparent_max = daily.get("apparent_temperature_max", [])[i] if i < len(daily.get("apparent_temperature_max", [])) else None
-                sunshine_hours = daily.get("sunshine_duration", [])[i] if i < len(daily.get("sunshine_duration", [])) else None
-                sunshine_hours = round(sunshine_hours / 3600, 1) if sunshine_hours else None
-
-                # Chỉ cảnh báo nếu cảm giác nóng hơn hoặc UV cao
-                if (apparent_max and apparent_max >= 37) or (uv and uv >= 9):
-                    severity = "medium" if (apparent_max and apparent_max >= 38) or (uv and uv >= 10) else "low"
-
-                    alerts.append({
-                        "id": f"heat_local_{loc_code}_{date}",
-                        "type": "heat_local",
-                        "category": "Nắng nóng cục bộ",
-                        "title": f"Nắng nóng cục bộ - {loc_info.get('name', loc_code)}",
-                        "severity": severity,
-                        "date": date,
-                        "region": loc_info.get("name", loc_code),
-                        "provinces": [loc_info.get("name", loc_code)],
-                        "description": f"Nhiệt độ {temp_max:.1f}°C" +
-                                       (f", cảm giác thực tế {apparent_max:.1f}°C" if apparent_max else "") +
-                                       (f", chỉ số UV {uv:.0f}" if uv else "") +
-                                       f" vào ngày {date}. Có thể nắng nóng cục bộ vào buổi trưa.",
-                        "data": {
-                            "max_temperature_c": round(temp_max, 1),
-                            "min_temperature_c": round(temp_min, 1) if temp_min else None,
-                            "apparent_temperature_c": round(apparent_max, 1) if apparent_max else None,
-                            "heat_level": "Nắng nóng cục bộ",
-                            "uv_index": round(uv, 1) if uv else None,
-                            "uv_level": "Rất cao" if uv and uv >= 8 else "Cao" if uv and uv >= 6 else "Trung bình",
-                            "sunshine_hours": sunshine_hours,
-                            "weather_code": weather_code,
-                            "weather_description": get_weather_description(weather_code) if weather_code else None,
-                            "wind_speed_kmh": round(wind, 1) if wind else None,
-                        },
-                        "recommendations": [
-                            "Hạn chế hoạt động ngoài trời từ 11h-15h",
-                            "Uống đủ nước, tránh đồ uống có cồn",
-                            "Đội mũ, mặc áo dài tay khi ra ngoài",
-                            "Chú ý bảo vệ da khi UV cao" if uv and uv >= 8 else "Nghỉ ngơi nơi thoáng mát"
-                        ],
-                        "source": "Open-Meteo API"
-                    })
-
-            # === CẢNH BÁO GIÓ MẠNH ===
-            if gust and gust >= 60:  # Gió giật >= 60 km/h
-                severity = "critical" if gust >= 100 else "high" if gust >= 80 else "medium"
-                # Xác định cấp gió Beaufort
-                beaufort_scale = 12 if gust >= 118 else 11 if gust >= 103 else 10 if gust >= 89 else 9 if gust >= 75 else 8 if gust >= 62 else 7
-                wind_level = "Bão" if gust >= 89 else "Gió mạnh cấp 8-9" if gust >= 75 else "Gió mạnh" if gust >= 62 else "Gió khá mạnh"
-                wind_direction = daily.get("wind_direction_10m_dominant", [])[i] if i < len(daily.get("wind_direction_10m_dominant", [])) else None
-                wind_dir_text = _get_wind_direction_text(wind_direction) if wind_direction else None
-
-                alerts.append({
-                    "id": f"wind_{loc_code}_{date}",
-                    "type": "strong_wind",
-                    "category": "Gió mạnh",
-                    "title": f"Cảnh báo gió mạnh - {loc_info.get('name', loc_code)}",
-                    "severity": severity,
-                    "date": date,
-                    "region": loc_info.get("name", loc_code),
-                    "provinces": [loc_info.get("name", loc_code)],
-                    "description": f"Gió giật mạnh lên đến {gust:.0f} km/h vào ngày {date}. " +
-                                   (f"Hướng gió chủ đạo: {wind_dir_text}. " if wind_dir_text else "") +
-                                   f"Tương đương gió cấp {beaufort_scale} theo thang Beaufort.",
-                    "data": {
-                        "wind_gust_kmh": round(gust, 1),
-                        "wind_speed_kmh": round(wind, 1) if wind else None,
-                        "wind_level": wind_level,
-                        "beaufort_scale": beaufort_scale,
-                        "wind_direction_deg": round(wind_direction) if wind_direction else None,
-                        "wind_direction_text": wind_dir_text,
-                        "weather_code": weather_code,
-                        "weather_description": get_weather_description(weather_code) if weather_code else None,
-                        "rainfall_mm": round(precip, 1) if precip else None,
-                        "danger_level": "Rất nguy hiểm" if gust >= 100 else "Nguy hiểm" if gust >= 80 else "Cần cảnh giác",
-                    },
-                    "recommendations": [
-                        "Chằng chống nhà cửa, cắt tỉa cành cây",
-                        "Không đứng dưới cây lớn hoặc biển quảng cáo",
-                        "Tàu thuyền không ra khơi",
-                        "Di chuyển đồ vật có thể bay" if gust >= 80 else "Đóng cửa sổ, cửa ra vào",
-                        "Sơ tán khỏi nhà yếu" if gust >= 100 else "Ở trong nhà kiên cố",
-                        "Tránh xa bờ biển và sông" if gust >= 80 else "Hạn chế ra ngoài"
-                    ],
-                    "source": "Open-Meteo API"
-                })
+        # === CẢNH BÁO GIÓ MẠNH ===
+        if wind_days[i]:  # Gió giật >= 60 km/h
+            severity = _SEVERITY[1 + wind_severity[i]]
+            # Xác định cấp gió Beaufort
+            beaufort_scale = 7 + beaufort[i]
+            wind_level = _WIND_LEVEL[bisect_right(_WIND_LEVEL_CUTS, gust)]
+            wind_direction = column["wind_direction_10m_dominant"][i]
+            wind_dir_text = _get_wind_direction_text(wind_direction) if wind_direction else None
+
+            alerts.append({
+                "id": "wind_" + day_id,
+                "type": "strong_wind",
+                "category": "Gió mạnh",
+                "title": f"Cảnh báo gió mạnh - {loc_name}",
+                "severity": severity,
+                "date": date,
+                "region": loc_name,
+                "provinces": provinces,
+                "description": f"Gió giật mạnh lên đến {gust:.0f} km/h vào ngày {date}. " +
+                               (f"Hướng gió chủ đạo: {wind_dir_text}. " if wind_dir_text else "") +
+                               f"Tương đương gió cấp {beaufort_scale} theo thang Beaufort.",
+                "data": {
+                    "wind_gust_kmh": gust_r,
+                    "wind_speed_kmh": wind_r if wind else None,
+                    "wind_level": wind_level,
+                    "beaufort_scale": beaufort_scale,
+                    "wind_direction_deg": round(wind_direction) if wind_direction else None,
+                    "wind_direction_text": wind_dir_text,
+                    "weather_code": weather_code,
+                    "weather_description": weather_desc,
+                    "rainfall_mm": precip_r if precip else None,
+                    "danger_level": _WIND_DANGER_LEVEL[wind_severity[i]],
+                },
+                "recommendations": _WIND_RECOMMENDATIONS[wind_severity[i]],
+                "source": "Open-Meteo API"
+            })
+
+        # === CẢNH BÁO UV CAO ===
+        if uv_days[i]:
+            severity = _SEVERITY[1 + uv_severity[i]]
+            alerts.append({
+                "id": "uv_" + day_id,
+                "type": "high_uv",
+                "category": "Tia UV cao",
+                "title": f"Cảnh báo tia UV - {loc_name}",
+                "severity": severity,
+                "date": date,
+                "region": loc_name,
+                "provinces": provinces,
+                "description": f"Chỉ số UV đạt mức {uv:.0f} (rất cao) vào ngày {date}.",
+                "data": {
+                    "uv_index": uv_r,
+                    "uv_level": _UV_ALERT_LEVEL[uv_severity[i]],
+                    "max_temperature_c": temp_max_r if temp_max else None,
+                    "sunshine_hours": round(column["sunshine_duration"][i] / 3600, 1) if column["sunshine_duration"][i] else None,
+                    "weather_code": weather_code,
+                    "weather_description": weather_desc,
+                },
+                "recommendations": _UV_RECOMMENDATIONS,
+                "source": "Open-Meteo API"
+            })
+
+        # === CẢNH BÁO RÉT ĐẬM / RÉT HẠI ===
+        if cold_days[i]:
+            # Rét hại: <= 10°C, Rét đậm: 10-13°C, Rét: 13-15°C
+            severity, category, cold_level = _COLD_LEVELS[cold_tier[i]]
+
+            apparent_min = column["apparent_temperature_min"][i]
+
+            alerts.append({
+                "id": "cold_" + day_id,
+                "type": "cold_wave",
+                "category": category,
+                "title": f"Cảnh báo {category.lower()} - {loc_name}",
+                "severity": severity,
+                "date": date,
+                "region": loc_name,
+                "provinces": provinces,
+                "description": _COLD_DESC_TEMPLATES[temp_min <= 10].format(
+                    temp_min=temp_min,
+                    date=date,
+                    apparent=f"Nhiệt độ cảm nhận thực tế có thể xuống đến {apparent_min:.1f}°C. " if apparent_min else "",
+                ),
+                "data": {
+                    "min_temperature_c": temp_min_r,
+                    "max_temperature_c": temp_max_r if temp_max else None,
+                    "apparent_min_temperature_c": round(apparent_min, 1) if apparent_min else None,
+                    "cold_level": cold_level,
+                    "wind_speed_kmh": wind_r if wind else None,
+                    "weather_code": weather_code,
+                    "weather_description": weather_desc,
+                    "rainfall_mm": precip_r if precip else None,
+                },
+                "recommendations": _COLD_RECOMMENDATIONS[temp_min <= 10],
+                "source": "Open-Meteo API"
+            })
+
+        # === CẢNH BÁO HẠN HÁN ===
+        # Kiểm tra nếu không có mưa nhiều ngày và nhiệt độ cao
+        # Hạn hán khi: không mưa (precip < 5mm) + nhiệt độ cao (>30°C) + bốc hơi cao (et0 > 5mm/ngày)
+        if drought_days[i]:
+            et0 = column["et0_fao_evapotranspiration"][i]
+            severity = "high" if et0 >= 7 or temp_max >= 37 else "medium"
+            drought_level = "Khô hạn nghiêm trọng" if et0 >= 7 else "Khô hạn"
+
+            alerts.append({
+                "id": "drought_" + day_id,
+                "type": "drought",
+                "category": "Hạn hán",
+                "title": f"Cảnh báo hạn hán - {loc_name}",
+                "severity": severity,
+                "date": date,
+                "region": loc_name,
+                "provinces": provinces,
+                "description": f"Thời tiết khô nóng vào ngày {date}. Nhiệt độ {temp_max:.1f}°C, " +
+                               f"lượng bốc hơi {et0:.1f}mm/ngày, không có mưa. Nguy cơ thiếu nước.",
+                "data": {
+                    "max_temperature_c": temp_max_r,
+                    "evapotranspiration_mm": round(et0, 1),
+                    "rainfall_mm": precip_r,
+                    "drought_level": drought_level,
+                    "humidity_status": "Rất khô" if et0 >= 7 else "Khô",
+                    "weather_code": weather_code,
+                    "weather_description": weather_desc,
+                    "uv_index": uv_r if uv else None,
+                },
+                "recommendations": _DROUGHT_RECOMMENDATIONS,
+                "source": "Open-Meteo API"
+            })
+
+    # === CẢNH BÁO LŨ (từ Flood API) ===
+    if flood:
+        flood_daily = flood.get("daily", {})
+        flood_dates = [sys.intern(d) for d in flood_daily.get("time", [])]
+        river_discharge = _pad_daily(flood_daily, "river_discharge", len(flood_dates))
+        # Phần lớn các ngày sông dưới ngưỡng - chỉ duyệt những ngày lưu lượng >= 1000 m³/s
+        # (None thành NaN nên tự bị loại khỏi mặt nạ)
+        discharge_arr = np.array(river_discharge, dtype=np.float64)
+        flood_days = np.flatnonzero(discharge_arr >= _FLOOD_DISCHARGE_CUTS[0])
+        if flood_days.size:
+            flood_tier = np.searchsorted(_FLOOD_DISCHARGE_CUTS, discharge_arr, side="right").tolist()
+
+        for i in flood_days.tolist():
+            date = flood_dates[i]
+            discharge = river_discharge[i]
+
+            # Ngưỡng cảnh báo (m³/s) - cần điều chỉnh theo từng sông
+            severity, flood_note = _FLOOD_LEVELS[flood_tier[i]]
+
+            alerts.append({
+                "id": f"flood_{loc_code}_{date}",
+                "type": "flood",
+                "category": "Lũ lụt",
+                "title": f"Cảnh báo nguy cơ lũ - {loc_name}",
+                "severity": severity,
+                "date": date,
+                "region": loc_name,
+                "provinces": provinces,
+                "description": f"Lưu lượng sông dự báo {discharge:.0f} m³/s vào ngày {date}. {flood_note}",
+                "data": {
+                    "river_discharge_m3s": round(discharge, 0),
+                },
+                "recommendations": _FLOOD_RECOMMENDATIONS,
+                "source": "Open-Meteo Flood API (GloFAS)"
+            })
 
-            # === CẢNH BÁO UV CAO ===
-            if uv and uv >= 8:
-                severity = "critical" if uv >= 11 else "high" if uv >= 9 else "medium"
-                alerts.append({
-                    "id": f"uv_{loc_code}_{date}",
-                    "type": "high_uv",
-                    "category": "Tia UV cao",
-                    "title": f"Cảnh báo tia UV - {loc_info.get('name', loc_code)}",
-                    "severity": severity,
-                    "date": date,
-                    "region": loc_info.get("name", loc_code),
-                    "provinces": [loc_info.get("name", loc_code)],
-                    "description": f"Chỉ số UV đạt mức {uv:.0f} (rất cao) vào ngày {date}.",
-                    "data": {
-                        "uv_index": round(uv, 1),
-                        "uv_level": "Cực kỳ cao" if uv >= 11 else "Rất cao" if uv >= 8 else "Cao",
-                        "max_temperature_c": round(temp_max, 1) if temp_max else None,
-                        "sunshine_hours": round(daily.get("sunshine_duration", [])[i] / 3600, 1) if i < len(daily.get("sunshine_duration", [])) and daily.get("sunshine_duration", [])[i] else None,
-                        "weather_code": weather_code,
-                        "weather_description": get_weather_description(weather_code) if weather_code else None,
-                    },
-                    "recommendations": [
-                        "Tránh ra ngoài từ 10h-15h",
-                        "Sử dụng kem chống nắng SPF 50+",
-                        "Đội mũ, mặc áo dài tay khi ra ngoài",
-                        "Đeo kính râm bảo vệ mắt",
-                        "Uống nhiều nước"
-                    ],
-                    "source": "Open-Meteo API"
-                })
 
-            # === CẢNH BÁO RÉT ĐẬM / RÉT HẠI ===
-            if temp_min is not None and temp_min <= 15:
-                # Rét hại: <= 10°C, Rét đậm: 10-13°C, Rét: 13-15°C
-                if temp_min <= 10:
-                    severity = "critical" if temp_min <= 5 else "high"
-                    category = "Rét hại"
-                    cold_level = "Rét hại nghiêm trọng" if temp_min <= 5 else "Rét hại"
-                elif temp_min <= 13:
-                    severity = "high" if temp_min <= 11 else "medium"
-                    category = "Rét đậm"
-                    cold_level = "Rét đậm"
-                else:
-                    severity = "medium"
-                    category = "Rét"
-                    cold_level = "Trời rét"
-
-                apparent_min = daily.get("apparent_temperature_min", [])[i] if i < len(daily.get("apparent_temperature_min", [])) else None
+    return alerts
 
-                alerts.append({
-                    "id": f"cold_{loc_code}_{date}",
-                    "type": "cold_wave",
-                    "category": category,
-                    "title": f"Cảnh báo {category.lower()} - {loc_info.get('name', loc_code)}",
-                    "severity": severity,
-                    "date": date,
-                    "region": loc_info.get("name", loc_code),
-                    "provinces": [loc_info.get("name", loc_code)],
-                    "description": f"Nhiệt độ thấp nhất dự báo {temp_min:.1f}°C vào ngày {date}. " +
-                                   (f"Nhiệt độ cảm nhận thực tế có thể xuống đến {apparent_min:.1f}°C. " if apparent_min else "") +
-                                   ("Nguy hiểm cho sức khỏe." if temp_min <= 10 else "Cần giữ ấm cơ thể."),
-                    "data": {
-                        "min_temperature_c": round(temp_min, 1),
-                        "max_temperature_c": round(temp_max, 1) if temp_max else None,
-                        "apparent_min_temperature_c": round(apparent_min, 1) if apparent_min else None,
-                        "cold_level": cold_level,
-                        "wind_speed_kmh": round(wind, 1) if wind else None,
-                        "weather_code": weather_code,
-                        "weather_description": get_weather_description(weather_code) if weather_code else None,
-                        "rainfall_mm": round(precip, 1) if precip else None,
-                    },
-                    "recommendations": [
-                        "Mặc đủ ấm, nhiều lớp áo",
-                        "Giữ ấm tay chân, đầu, cổ",
-                        "Người già, trẻ em hạn chế ra ngoài",
-                        "Không sưởi ấm bằng than trong phòng kín",
-                        "Che chắn chuồng trại gia súc, gia cầm" if temp_min <= 10 else "Uống nước ấm, ăn đủ chất",
-                        "Kiểm tra sức khỏe người già, trẻ nhỏ thường xuyên" if temp_min <= 10 else "Hạn chế tắm khuya"
-                    ],
-                    "source": "Open-Meteo API"
-                })
 
-            # === CẢNH BÁO HẠN HÁN ===
-            # Kiểm tra nếu không có mưa nhiều ngày và nhiệt độ cao
-            et0 = daily.get("et0_fao_evapotranspiration", [])[i] if i < len(daily.get("et0_fao_evapotranspiration", [])) else None
-            # Hạn hán khi: không mưa (precip < 5mm) + nhiệt độ cao (>30°C) + bốc hơi cao (et0 > 5mm/ngày)
-            if precip < 5 and temp_max and temp_max >= 32 and et0 and et0 >= 5:
-                severity = "high" if et0 >= 7 or temp_max >= 37 else "medium"
-                drought_level = "Khô hạn nghiêm trọng" if et0 >= 7 else "Khô hạn"
+def iter_weather_alerts(weather_data: Dict) -> Iterator[Dict]:
+    """
+    Sinh cảnh báo lần lượt theo từng địa điểm (lazy) - người dùng chỉ cần duyệt/ghi
+    một lần (vd. NDJSON, ghi DB theo lô) không phải giữ cả danh sách trong bộ nhớ
+    """
+    for loc_code, loc_data in weather_data.get("locations", {}).items():
+        yield from _analyze_location(loc_code, loc_data)
 
-                alerts.append({
-                    "id": f"drought_{loc_code}_{date}",
-                    "type": "drought",
-                    "category": "Hạn hán",
-                    "title": f"Cảnh báo hạn hán - {loc_info.get('name', loc_code)}",
-                    "severity": severity,
-                    "date": date,
-                    "region": loc_info.get("name", loc_code),
-                    "provinces": [loc_info.get("name", loc_code)],
-                    "description": f"Thời tiết khô nóng vào ngày {date}. Nhiệt độ {temp_max:.1f}°C, " +
-                                   f"lượng bốc hơi {et0:.1f}mm/ngày, không có mưa. Nguy cơ thiếu nước.",
-                    "data": {
-                        "max_temperature_c": round(temp_max, 1),
-                        "evapotranspiration_mm": round(et0, 1),
-                        "rainfall_mm": round(precip, 1),
-                        "drought_level": drought_level,
-                        "humidity_status": "Rất khô" if et0 >= 7 else "Khô",
-                        "weather_code": weather_code,
-                        "weather_description": get_weather_description(weather_code) if weather_code else None,
-                        "uv_index": round(uv, 1) if uv else None,
-                    },
-                    "recommendations": [
-                        "Tiết kiệm nước sinh hoạt",
-                        "Tưới cây vào sáng sớm hoặc chiều tối",
-                        "Che phủ đất để giữ ẩm",
-                        "Dự trữ nước cho gia súc, gia cầm",
-                        "Theo dõi nguồn nước sinh hoạt",
-                        "Phòng chống cháy rừng"
-                    ],
-                    "source": "Open-Meteo API"
-                })
 
-        # === CẢNH BÁO LŨ (từ Flood API) ===
-        if flood:
-            flood_daily = flood.get("daily", {})
-            flood_dates = flood_daily.get("time", [])
-            river_discharge = flood_daily.get("river_discharge", [])
-
-            for i, date in enumerate(flood_dates):
-                if i >= len(river_discharge) or river_discharge[i] is None:
-                    continue
-
-                discharge = river_discharge[i]
-
-                # Ngưỡng cảnh báo (m³/s) - cần điều chỉnh theo từng sông
-                if discharge >= 1000:  # Ngưỡng cảnh báo lũ
-                    severity = "critical" if discharge >= 5000 else "high" if discharge >= 2000 else "medium"
-                    alerts.append({
-                        "id": f"flood_{loc_code}_{date}",
-                        "type": "flood",
-                        "category": "Lũ lụt",
-                        "title": f"Cảnh báo nguy cơ lũ - {loc_info.get('name', loc_code)}",
-                        "severity": severity,
-                        "date": date,
-                        "region": loc_info.get("name", loc_code),
-                        "provinces": [loc_info.get("name", loc_code)],
-                        "description": f"Lưu lượng sông dự báo {discharge:.0f} m³/s vào ngày {date}. " +
-                                       ("Nguy cơ lũ rất cao." if discharge >= 5000 else
-                                        "Nguy cơ lũ cao, cần theo dõi." if discharge >= 2000 else
-                                        "Mực nước có thể dâng cao."),
-                        "data": {
-                            "river_discharge_m3s": round(discharge, 0),
-                        },
-                        "recommendations": [
-                            "Theo dõi diễn biến mưa lũ qua đài phát thanh",
-                            "Chuẩn bị sẵn sàng sơ tán nếu ở vùng trũng",
-                            "Dự trữ lương thực, nước uống, đèn pin"
-                        ],
-                        "source": "Open-Meteo Flood API (GloFAS)"
-                    })
+def analyze_weather_for_alerts(weather_data: Dict, processes: int = 0) -> List[Dict]:
+    """
+    Phân tích dữ liệu thời tiết và tạo cảnh báo thực
+    Dựa trên dữ liệu thật từ Open-Meteo
 
-    return alerts
+    Args:
+        weather_data: Kết quả của get_all_vietnam_weather
+        processes: > 1 để chia các địa điểm cho nhiều tiến trình (chỉ đáng khi
+                   phân tích rất nhiều địa điểm - mỗi tiến trình tốn chi phí khởi tạo/pickle)
+    """
+    locations = weather_data.get("locations", {})
+    if processes > 1 and len(locations) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            per_location = list(executor.map(
+                _analyze_location, list(locations), list(locations.values()), chunksize=8
+            ))
+        return list(chain.from_iterable(per_location))
+    return list(iter_weather_alerts(weather_data))
 
 
 # Weather code mapping (WMO)
@@ -770,23 +1170,40 @@ WEATHER_CODES = {
 }
 
 
+# Bảng tra dày theo mã WMO (0-99) + một ô "Không xác định" cuối cho mã thiếu/ngoài khoảng
+WEATHER_DESC_TABLE = tuple(WEATHER_CODES.get(code, "Không xác định") for code in range(100))
+_WEATHER_DESC_ARRAY = np.array(WEATHER_DESC_TABLE + ("Không xác định",), dtype=object)
+
+
 def get_weather_description(code: int) -> str:
     """Chuyển weather code thành mô tả tiếng Việt"""
+    if type(code) is int and 0 <= code < 100:
+        return WEATHER_DESC_TABLE[code]
     return WEATHER_CODES.get(code, "Không xác định")
 
 
+def describe_weather_codes(codes: List[Optional[int]]) -> List[str]:
+    """Dịch cả cột weather_code một lần (fancy indexing trên bảng tra)"""
+    codes_arr = np.array(codes, dtype=np.float64)
+    valid = (codes_arr >= 0) & (codes_arr < 100)
+    index = np.where(valid, codes_arr, 100).astype(np.intp)
+    return _WEATHER_DESC_ARRAY[index].tolist()
+
+
+# 16 hướng la bàn, mỗi hướng 22,5°
+_WIND_DIRECTIONS = (
+    "Bắc", "Bắc Đông Bắc", "Đông Bắc", "Đông Đông Bắc",
+    "Đông", "Đông Đông Nam", "Đông Nam", "Nam Đông Nam",
+    "Nam", "Nam Tây Nam", "Tây Nam", "Tây Tây Nam",
+    "Tây", "Tây Tây Bắc", "Tây Bắc", "Bắc Tây Bắc",
+)
+
+
 def _get_wind_direction_text(degrees: float) -> str:
     """Chuyển độ hướng gió thành văn bản tiếng Việt"""
     if degrees is None:
         return None
-    directions = [
-        "Bắc", "Bắc Đông Bắc", "Đông Bắc", "Đông Đông Bắc",
-        "Đông", "Đông Đông Nam", "Đông Nam", "Nam Đông Nam",
-        "Nam", "Nam Tây Nam", "Tây Nam", "Tây Tây Nam",
-        "Tây", "Tây Tây Bắc", "Tây Bắc", "Bắc Tây Bắc"
-    ]
-    index = round(degrees / 22.5) % 16
-    return directions[index]
+    return _WIND_DIRECTIONS[round(degrees / 22.5) % 16]
 
 
 if __name__ == "__main__":
@@ -799,18 +1216,20 @@ if __name__ == "__main__":
     if forecast:
         print(f"\n=== Dự báo thời tiết Hà Nội ===")
         daily = forecast.get("daily", {})
-        for i, date in enumerate(daily.get("time", [])[:7]):
-            temp_max = daily.get("temperature_2m_max", [None])[i]
-            temp_min = daily.get("temperature_2m_min", [None])[i]
-            rain = daily.get("precipitation_sum", [0])[i]
-            code = daily.get("weather_code", [0])[i]
-            print(f"{date}: {temp_min:.1f}-{temp_max:.1f}°C | Mưa: {rain:.1f}mm | {get_weather_description(code)}")
+        # Lấy các cột một lần ngoài vòng lặp thay vì daily.get(...) cho từng ngày
+        for date, temp_max, temp_min, rain, description in zip(
+            daily.get("time", [])[:7],
+            daily.get("temperature_2m_max", []),
+            daily.get("temperature_2m_min", []),
+            daily.get("precipitation_sum", []),
+            describe_weather_codes(daily.get("weather_code", [])),
+        ):
+            print(f"{date}: {temp_min:.1f}-{temp_max:.1f}°C | Mưa: {rain:.1f}mm | {description}")
 
     # Test flood API
     flood = fetch_flood_forecast(hanoi["lat"], hanoi["lon"])
     if flood:
         print(f"\n=== Dự báo lũ Hà Nội ===")
         flood_daily = flood.get("daily", {})
-        for i, date in enumerate(flood_daily.get("time", [])[:7]):
-            discharge = flood_daily.get("river_discharge", [None])[i]
+        for date, discharge in zip(flood_daily.get("time", [])[:7], flood_daily.get("river_discharge", [])):
             print(f"{date}: Lưu lượng sông: {discharge:.0f} m³/s" if discharge else f"{date}: Không có dữ liệu")